@@ -0,0 +1,102 @@
+"""Concurrent checkout load test: proves no oversell and reports checkouts/sec.
+
+Creates one product with --stock units and --buyers users who each hold one
+unit in their cart, then checks them all out at once. Run it against a scratch
+database (DATABASE_URL), ideally MySQL; SQLite serializes writers.
+
+Usage: python benchmarks/checkout_load.py [--buyers 200] [--stock 50] [--threads 32]
+"""
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from fastapi import HTTPException
+from database import SessionLocal, init_db
+from models import User, Jeweler, Product, Cart, CartItem, Order, OrderItem
+from schemas.order import OrderCreate
+from schemas.user import Principal
+from routers.orders import checkout
+
+
+def prepare(buyers: int, stock: int, run_tag: str):
+    db = SessionLocal()
+    try:
+        jeweler = Jeweler(name=f"Load Test {run_tag}")
+        db.add(jeweler)
+        db.flush()
+        product = Product(jeweler_id=jeweler.id, name=f"Last Ring {run_tag}", price=100.0, stock_quantity=stock)
+        db.add(product)
+        users = [
+            User(username=f"buyer_{run_tag}_{i}", email=f"buyer_{run_tag}_{i}@example.com", password="x")
+            for i in range(buyers)
+        ]
+        db.add_all(users)
+        db.flush()
+        carts = [Cart(user_id=user.id) for user in users]
+        db.add_all(carts)
+        db.flush()
+        db.add_all(CartItem(cart_id=cart.id, product_id=product.id, quantity=1) for cart in carts)
+        db.commit()
+        return product.id, [Principal(id=user.id, username=user.username) for user in users]
+    finally:
+        db.close()
+
+
+def buy(principal: Principal) -> bool:
+    db = SessionLocal()
+    try:
+        checkout(OrderCreate(shipping_address="Load test"), principal, db)
+        return True
+    except HTTPException:
+        return False
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--buyers", type=int, default=200)
+    parser.add_argument("--stock", type=int, default=50)
+    parser.add_argument("--threads", type=int, default=32)
+    args = parser.parse_args()
+
+    init_db()
+    run_tag = uuid.uuid4().hex[:8]
+    product_id, principals = prepare(args.buyers, args.stock, run_tag)
+
+    with ThreadPoolExecutor(max_workers=args.threads) as executor:
+        started = time.perf_counter()
+        results = list(executor.map(buy, principals))
+        elapsed = time.perf_counter() - started
+
+    db = SessionLocal()
+    try:
+        remaining = db.query(Product.stock_quantity).filter(Product.id == product_id).scalar()
+        sold = (
+            db.query(OrderItem)
+            .join(Order, OrderItem.order_id == Order.id)
+            .filter(OrderItem.product_id == product_id)
+            .count()
+        )
+    finally:
+        db.close()
+
+    succeeded = sum(results)
+    print(f"buyers={args.buyers} stock={args.stock} threads={args.threads}")
+    print(f"succeeded={succeeded} rejected={args.buyers - succeeded} sold={sold} remaining={remaining}")
+    print(f"elapsed={elapsed:.2f}s checkouts/sec={args.buyers / elapsed:.1f}")
+
+    expected = min(args.buyers, args.stock)
+    if succeeded != expected or sold != expected or remaining != args.stock - expected:
+        print("FAIL: stock and orders disagree (oversell or lost sale)")
+        sys.exit(1)
+    print("OK: no oversell")
+
+
+if __name__ == "__main__":
+    main()
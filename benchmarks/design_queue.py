@@ -0,0 +1,63 @@
+"""Offline load test of the design-generation queue with the fake model backend.
+
+Submits --jobs jobs at --rate jobs/sec into a JobQueue drained by --concurrency
+workers calling FakeDesignModel. It reports throughput, peak queue depth,
+rejections and wait/run times. No database, network or API key is needed.
+
+Usage: python benchmarks/design_queue.py [--jobs 200] [--rate 20] [--concurrency 4]
+           [--queue-size 100] [--latency 2.0]
+"""
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import asyncio
+import time
+from utils.design_models import FakeDesignModel
+from utils.jobs import JobQueue, QueueFullError
+
+
+async def run(args):
+    model = FakeDesignModel(latency=args.latency, jitter=args.latency / 4, size=64)
+    queue = JobQueue("design-generation", concurrency=args.concurrency, max_size=args.queue_size)
+    await queue.start()
+
+    peak_depth = 0
+    started = time.perf_counter()
+    for job_id in range(args.jobs):
+        try:
+            queue.submit(job_id, lambda n=job_id: model.generate(f"prompt {n % 10}"))
+        except QueueFullError:
+            pass
+        peak_depth = max(peak_depth, queue.depth())
+        await asyncio.sleep(1 / args.rate)
+
+    while queue.depth() or queue.running:
+        peak_depth = max(peak_depth, queue.depth())
+        await asyncio.sleep(0.05)
+    elapsed = time.perf_counter() - started
+    await queue.stop()
+
+    stats = queue.stats()
+    print(f"jobs={args.jobs} rate={args.rate}/s concurrency={args.concurrency} "
+          f"queue_size={args.queue_size} model_latency={args.latency}s")
+    print(f"completed={stats['completed']} failed={stats['failed']} rejected={stats['rejected']} "
+          f"peak_depth={peak_depth}")
+    print(f"throughput={stats['completed'] / elapsed:.2f} jobs/s "
+          f"wait_avg={stats['wait_time_avg']:.2f}s run_avg={stats['run_time_avg']:.2f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=200)
+    parser.add_argument("--rate", type=float, default=20)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--queue-size", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=2.0)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Latency under concurrency for a running server: p50/p95/p99 per endpoint.
+
+Start the app (e.g. ``uvicorn main:app --workers 1``), then run this once against
+a build that serves the endpoint from a sync ``def`` handler and once against the
+async handler to compare tail latency. Requires ``httpx``.
+
+Usage: python benchmarks/latency.py [--base-url http://localhost:8000]
+           [--path /api/products/] [--clients 500] [--requests 5000] [--token JWT]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def run(base_url: str, path: str, clients: int, total: int, token: str):
+    headers = {"Authorization": f"Bearer {token}"} if token else {}
+    latencies = []
+    errors = 0
+    remaining = total
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+
+    async with httpx.AsyncClient(base_url=base_url, headers=headers, limits=limits, timeout=60) as client:
+
+        async def worker():
+            nonlocal remaining, errors
+            while remaining > 0:
+                remaining -= 1
+                started = time.perf_counter()
+                try:
+                    response = await client.get(path)
+                    if response.status_code >= 400:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(clients)))
+        elapsed = time.perf_counter() - started
+
+    ms = [latency * 1000 for latency in latencies]
+    print(f"{path} clients={clients} requests={len(ms)} errors={errors}")
+    print(f"throughput={len(ms) / elapsed:.1f} req/s mean={statistics.mean(ms):.1f}ms")
+    print(f"p50={percentile(ms, 50):.1f}ms p95={percentile(ms, 95):.1f}ms p99={percentile(ms, 99):.1f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--path", action="append", dest="paths")
+    parser.add_argument("--clients", type=int, default=500)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--token", default="")
+    args = parser.parse_args()
+
+    for path in args.paths or ["/api/products/"]:
+        asyncio.run(run(args.base_url, path, args.clients, args.requests, args.token))
+
+
+if __name__ == "__main__":
+    main()
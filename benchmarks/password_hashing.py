@@ -0,0 +1,47 @@
+"""Password verification throughput (logins/sec) for increasing hash worker counts.
+
+Usage: python benchmarks/password_hashing.py [--logins 200] [--iterations 100000]
+"""
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+from config import settings
+from utils.security import get_password_hash, verify_password
+
+
+def measure(workers: int, logins: int, stored_hash: str) -> float:
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        started = time.perf_counter()
+        results = list(executor.map(lambda _: verify_password("password123", stored_hash), range(logins)))
+        elapsed = time.perf_counter() - started
+    assert all(results)
+    return logins / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--iterations", type=int, default=settings.PASSWORD_HASH_ITERATIONS)
+    args = parser.parse_args()
+
+    settings.PASSWORD_HASH_ITERATIONS = args.iterations
+    stored_hash = get_password_hash("password123")
+    cores = os.cpu_count() or 1
+
+    print(f"PBKDF2-SHA256 iterations={args.iterations} logins={args.logins} cores={cores}")
+    print(f"{'workers':>8} {'logins/sec':>12} {'speedup':>8}")
+    worker_counts = sorted({cores} | {2 ** i for i in range(cores.bit_length()) if 2 ** i <= cores})
+    baseline = None
+    for workers in worker_counts:
+        rate = measure(workers, args.logins, stored_hash)
+        baseline = baseline or rate
+        print(f"{workers:>8} {rate:>12.1f} {rate / baseline:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""Throughput of POST /api/admin/products/import against one-at-a-time creates.
+
+Imports --rows generated products (two categories each) as CSV and as NDJSON
+into the database at DATABASE_URL, once creating them and once updating them,
+then times --single individual POST /api/admin/products calls for comparison.
+Requests run in-process, so the numbers exclude network transfer. Use a scratch
+database: the benchmark jeweler's products are deleted before each run.
+
+Usage: python benchmarks/product_import.py [--rows 100000] [--batch-size 1000] [--single 500]
+"""
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import json
+import time
+from sqlalchemy import delete, select
+from database import SessionLocal, init_db
+from config import settings
+from models import Category, Jeweler, Product, product_categories
+
+SKU_PREFIX = "BENCH-"
+
+
+def prepare():
+    db = SessionLocal()
+    try:
+        jeweler = db.query(Jeweler).filter(Jeweler.name == "Import Benchmark").first()
+        if jeweler is None:
+            jeweler = Jeweler(name="Import Benchmark")
+            db.add(jeweler)
+        categories = []
+        for name in ("Import Rings", "Import Gold"):
+            category = db.query(Category).filter(Category.name == name).first() or Category(name=name)
+            db.add(category)
+            categories.append(category)
+        db.flush()
+        product_ids = select(Product.id).where(Product.jeweler_id == jeweler.id)
+        db.execute(delete(product_categories).where(product_categories.c.product_id.in_(product_ids)))
+        db.execute(delete(Product).where(Product.jeweler_id == jeweler.id))
+        db.commit()
+        return jeweler.id, [category.id for category in categories]
+    finally:
+        db.close()
+
+
+def records(rows: int, jeweler_id: int, category_ids: list, price_offset: float):
+    for i in range(rows):
+        yield {
+            "jeweler_id": jeweler_id,
+            "sku": f"{SKU_PREFIX}{i}",
+            "name": f"Imported Ring {i}",
+            "material": ("Gold", "Silver", "Platinum")[i % 3],
+            "karat": ("18k", "21k", "925")[i % 3],
+            "weight": 3.5,
+            "price": 100 + i % 5000 + price_offset,
+            "stock_quantity": i % 20,
+            "description": "Hand-finished ring with a brushed band and polished edges.",
+            "category_ids": category_ids,
+        }
+
+
+def as_csv(items) -> bytes:
+    columns = ["jeweler_id", "sku", "name", "material", "karat", "weight", "price", "stock_quantity", "description", "category_ids"]
+    lines = [",".join(columns)]
+    for item in items:
+        item = {**item, "category_ids": "|".join(str(category_id) for category_id in item["category_ids"])}
+        lines.append(",".join(str(item[column]) for column in columns))
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def as_ndjson(items) -> bytes:
+    return "".join(json.dumps(item) + "\n" for item in items).encode("utf-8")
+
+
+def timed_import(client, body: bytes, import_format: str):
+    started = time.perf_counter()
+    response = client.post("/api/admin/products/import", params={"format": import_format}, content=body)
+    elapsed = time.perf_counter() - started
+    response.raise_for_status()
+    return elapsed, response.json()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--batch-size", type=int, default=settings.PRODUCT_IMPORT_BATCH_SIZE)
+    parser.add_argument("--single", type=int, default=500)
+    args = parser.parse_args()
+    settings.PRODUCT_IMPORT_BATCH_SIZE = args.batch_size
+
+    os.makedirs("static", exist_ok=True)
+    init_db()
+
+    from fastapi.testclient import TestClient
+    import main as app_module
+
+    with TestClient(app_module.app) as client:
+        for import_format, encode in (("csv", as_csv), ("ndjson", as_ndjson)):
+            jeweler_id, category_ids = prepare()
+            for label, offset in (("create", 0), ("update", 0.5)):
+                body = encode(records(args.rows, jeweler_id, category_ids, offset))
+                elapsed, report = timed_import(client, body, import_format)
+                assert report["failed"] == 0, report["errors"][:5]
+                print(
+                    f"{import_format:<7} {label:<7} {args.rows:>8,} rows {len(body) / 1e6:7.1f} MB "
+                    f"{elapsed:7.2f} s {args.rows / elapsed:>9,.0f} rows/s"
+                )
+
+        jeweler_id, category_ids = prepare()
+        started = time.perf_counter()
+        for item in records(args.single, jeweler_id, category_ids, 0):
+            client.post("/api/admin/products", json=item).raise_for_status()
+        elapsed = time.perf_counter() - started
+        print(f"single  create  {args.single:>8,} rows {'':>10} {elapsed:7.2f} s {args.single / elapsed:>9,.0f} rows/s")
+        prepare()
+
+
+if __name__ == "__main__":
+    main()
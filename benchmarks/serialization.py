@@ -0,0 +1,145 @@
+"""Bytes on the wire and serialization time for the large list endpoints.
+
+Seeds --products products (plus --orders orders and design requests) into the
+database at DATABASE_URL if it holds fewer, then requests /api/products/,
+/api/admin/orders and /api/admin/design-requests in-process with FastAPI's
+default serializer and with FAST_JSON_RESPONSES, for each content coding.
+Use a scratch database.
+
+Usage: python benchmarks/serialization.py [--products 10000] [--orders 2000] [--repeat 50]
+"""
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import json
+import time
+from typing import List
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from sqlalchemy import func, insert
+from database import SessionLocal, init_db
+from config import settings
+from models import User, Jeweler, Product, Order, OrderItem, DesignRequest
+from schemas.product import ProductResponse
+from utils.compression import brotli
+from utils.responses import FastJSONResponse
+
+
+def seed(products: int, orders: int):
+    db = SessionLocal()
+    try:
+        existing = db.query(func.count(Product.id)).scalar()
+        if existing >= products:
+            return
+        jeweler = db.query(Jeweler).first() or Jeweler(name="Benchmark Jeweler")
+        user = db.query(User).first() or User(username="bench", email="bench@example.com", password="x")
+        db.add_all([jeweler, user])
+        db.flush()
+        db.execute(insert(Product), [
+            {
+                "jeweler_id": jeweler.id,
+                "name": f"Benchmark Ring {i}",
+                "material": ("Gold", "Silver", "Platinum")[i % 3],
+                "karat": ("18k", "21k", "925")[i % 3],
+                "weight": 3.5,
+                "price": float(100 + i % 5000),
+                "stock_quantity": 10,
+                "description": "Hand-finished ring with a brushed band and polished edges. " * 3,
+                "image_path": f"/static/products/ring_{i}.png",
+            }
+            for i in range(existing, products)
+        ])
+        first_product = db.query(func.min(Product.id)).scalar()
+        for start in range(0, orders, 500):
+            batch = [
+                Order(user_id=user.id, total_amount=300.0, shipping_address="Benchmark Street 1")
+                for _ in range(start, min(orders, start + 500))
+            ]
+            db.add_all(batch)
+            db.flush()
+            db.execute(insert(OrderItem), [
+                {
+                    "order_id": order.id,
+                    "product_id": first_product + k,
+                    "quantity": 1,
+                    "unit_price": 100.0,
+                    "subtotal": 100.0,
+                }
+                for order in batch
+                for k in range(3)
+            ])
+        db.execute(insert(DesignRequest), [
+            {"user_id": user.id, "description": f"Custom engagement ring #{i}", "estimated_budget": 2500.0}
+            for i in range(orders)
+        ])
+        db.commit()
+    finally:
+        db.close()
+
+
+def timed_requests(client, path: str, params: dict, encoding: str, repeat: int):
+    elapsed, wire_bytes = 0.0, 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        response = client.get(path, params=params, headers={"Accept-Encoding": encoding})
+        elapsed += time.perf_counter() - started
+        response.raise_for_status()
+        wire_bytes = response.num_bytes_downloaded
+    return elapsed / repeat * 1000, wire_bytes
+
+
+def serializer_only(items: list, repeat: int):
+    """Encoder cost alone for one product page, outside the request cycle."""
+    adapter = TypeAdapter(List[ProductResponse])
+    started = time.perf_counter()
+    for _ in range(repeat):
+        json.dumps(jsonable_encoder(adapter.validate_python(items))).encode("utf-8")
+    default_ms = (time.perf_counter() - started) / repeat * 1000
+    started = time.perf_counter()
+    for _ in range(repeat):
+        FastJSONResponse(items)
+    fast_ms = (time.perf_counter() - started) / repeat * 1000
+    return default_ms, fast_ms
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--products", type=int, default=10000)
+    parser.add_argument("--orders", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    os.makedirs("static", exist_ok=True)
+    init_db()
+    seed(args.products, args.orders)
+
+    from fastapi.testclient import TestClient
+    import main as app_module
+
+    encodings = ["identity", "gzip"] + (["br"] if brotli is not None else [])
+    endpoints = [
+        ("/api/products/", {"limit": 100}),
+        ("/api/admin/orders", {}),
+        ("/api/admin/design-requests", {}),
+    ]
+    with TestClient(app_module.app) as client:
+        for path, params in endpoints:
+            print(path, params or "")
+            for fast in (False, True):
+                settings.FAST_JSON_RESPONSES = fast
+                for encoding in encodings:
+                    ms, wire = timed_requests(client, path, params, encoding, args.repeat)
+                    label = "fast" if fast else "default"
+                    print(f"  {label:<8} {encoding:<9} {ms:8.2f} ms/request {wire:>10,} bytes")
+        settings.FAST_JSON_RESPONSES = False
+
+        items = client.get("/api/products/", params={"limit": 100}).json()
+        default_ms, fast_ms = serializer_only(items, args.repeat)
+        print(f"product page serialization: default {default_ms:.2f} ms, fast {fast_ms:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Requests/sec for a hot static image: full download, 304 revalidation and range.
+
+Start the app (e.g. ``uvicorn main:app --workers 1``) and pick an image it serves,
+ideally a content-hashed design (``/static/generated_designs/design_1.<hash>.png``)
+or one of its ``/media/...`` variants. Requires ``httpx``.
+
+Usage: python benchmarks/static_files.py --path /static/generated_designs/<file>
+           [--base-url http://localhost:8000] [--clients 50] [--requests 5000]
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+
+
+async def measure(client, path: str, headers: dict, clients: int, total: int):
+    remaining = total
+    statuses = {}
+    received = 0
+
+    async def worker():
+        nonlocal remaining, received
+        while remaining > 0:
+            remaining -= 1
+            response = await client.get(path, headers=headers)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+            received += len(response.content)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(clients)))
+    elapsed = time.perf_counter() - started
+    return total / elapsed, statuses, received / total
+
+
+async def run(base_url: str, path: str, clients: int, total: int):
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        first = await client.get(path)
+        first.raise_for_status()
+        print(f"{path}: {len(first.content)} bytes")
+        print(f"  cache-control={first.headers.get('cache-control')} etag={first.headers.get('etag')}")
+
+        scenarios = [
+            ("full GET", {}),
+            ("If-None-Match (304)", {"If-None-Match": first.headers.get("etag", "")}),
+            ("Range 0-16383", {"Range": "bytes=0-16383"}),
+        ]
+        for name, headers in scenarios:
+            rate, statuses, avg_bytes = await measure(client, path, headers, clients, total)
+            print(f"  {name:<22} {rate:8.1f} req/s  statuses={statuses}  avg_body={avg_bytes:.0f}B")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--path", required=True)
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=5000)
+    args = parser.parse_args()
+    asyncio.run(run(args.base_url, args.path, args.clients, args.requests))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,55 @@
+import os
 from pydantic_settings import BaseSettings
 from functools import lru_cache
+from typing import Literal
 
 
 class Settings(BaseSettings):
     DATABASE_URL: str = "mysql+pymysql://root:@localhost:3306/jewelry_db"
+    ASYNC_DATABASE_URL: str = ""
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30
+    DB_POOL_RECYCLE: int = 3600
+    DB_DISCONNECT_STRATEGY: Literal["pessimistic", "optimistic"] = "pessimistic"
     GEMINI_API_KEY: str = ""
+    AI_MODEL_BACKEND: Literal["gemini", "fake"] = "gemini"
+    AI_FAKE_LATENCY: float = 2.0
+    AI_JOB_CONCURRENCY: int = 4
+    AI_JOB_QUEUE_SIZE: int = 100
+    AI_JOB_TIMEOUT: float = 120
+    AI_JOB_EVENTS_MAX_SECONDS: float = 600
+    AI_DESIGN_CACHE_ENABLED: bool = True
+    AI_DESIGN_REUSE_MAX_AGE_DAYS: int = 30
+    AI_DESIGN_REUSE_MAX_VARIANTS: int = 4
+    IMAGE_IO_WORKERS: int = 4
+    IMAGE_RENDER_WORKERS: int = os.cpu_count() or 1
+    EVENT_LOOP_MONITOR_INTERVAL: float = 0.05
+    EVENT_LOOP_LAG_THRESHOLD: float = 0.1
+    STATIC_CACHE_MAX_AGE: int = 3600
+    COMPRESSION_MIN_SIZE: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+    FAST_JSON_RESPONSES: bool = False
+    PRODUCT_IMPORT_BATCH_SIZE: int = 1000
+    PRODUCT_IMPORT_MAX_ERRORS: int = 1000
+    PRODUCT_IMPORT_MAX_BYTES: int = 100 * 1024 * 1024
     SECRET_KEY: str = "your_super_secret_key_for_jwt_token_generation_change_this_in_production"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    AUTH_USER_CACHE_TTL: int = 60
+    PASSWORD_HASH_ITERATIONS: int = 100000
+    PASSWORD_HASH_WORKERS: int = os.cpu_count() or 1
+    PASSWORD_HASH_MAX_PENDING: int = 256
+    QUERY_COUNT_HEADER: bool = False
+    SERVER_TIMING_HEADER: bool = False
+    SLOW_QUERY_THRESHOLD: float = 0
+    PROFILER_ENABLED: bool = False
+    READINESS_DB_TIMEOUT: float = 2.0
+    READINESS_CACHE_TTL: float = 2.0
+    CATALOG_CACHE_TTL: int = 60
+    CATALOG_CACHE_MAXSIZE: int = 1024
+    CATALOG_CACHE_URL: str = ""
 
     class Config:
         env_file = ".env"
@@ -1,16 +1,262 @@
-from sqlalchemy import create_engine
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+from sqlalchemy import DateTime, create_engine, event, exc, literal
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
+from sqlalchemy.sql.functions import FunctionElement
 from config import settings
 
-engine = create_engine(
-    settings.DATABASE_URL,
-    pool_pre_ping=True,
-    pool_recycle=3600
+
+class PoolStats:
+    def __init__(self):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.invalidations = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+        self.lock = threading.Lock()
+
+
+class _TimedCheckoutMixin:
+    """Times how long callers wait for a pooled connection.
+
+    Stats live on the class because the pool recreates itself (same class) after
+    dispose() or a disconnect-triggered invalidation.
+    """
+
+    stats: PoolStats
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            with self.stats.lock:
+                self.stats.timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            with self.stats.lock:
+                self.stats.checkouts += 1
+                self.stats.wait_time_total += waited
+                self.stats.wait_time_max = max(self.stats.wait_time_max, waited)
+
+
+class InstrumentedQueuePool(_TimedCheckoutMixin, QueuePool):
+    stats = PoolStats()
+
+
+class InstrumentedAsyncQueuePool(_TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    stats = PoolStats()
+
+
+def engine_options(poolclass) -> dict:
+    # "pessimistic" pings on every checkout (one extra round trip, never hands out
+    # a dead connection); "optimistic" skips the ping and lets SQLAlchemy invalidate
+    # the pool when a statement fails on a disconnected connection.
+    return {
+        "poolclass": poolclass,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_DISCONNECT_STRATEGY == "pessimistic",
+    }
+
+
+engine = create_engine(settings.DATABASE_URL, **engine_options(InstrumentedQueuePool))
+
+# Async drivers for the sync URLs we support; aiosqlite doubles as the test stand-in.
+ASYNC_DRIVERS = {
+    "mysql+pymysql": "mysql+aiomysql",
+    "mysql": "mysql+aiomysql",
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+}
+
+
+def get_async_database_url() -> str:
+    if settings.ASYNC_DATABASE_URL:
+        return settings.ASYNC_DATABASE_URL
+    url = make_url(settings.DATABASE_URL)
+    return url.set(drivername=ASYNC_DRIVERS.get(url.drivername, url.drivername)).render_as_string(
+        hide_password=False
+    )
+
+
+async_engine = create_async_engine(
+    get_async_database_url(), **engine_options(InstrumentedAsyncQueuePool)
 )
 
+
+@event.listens_for(engine, "invalidate")
+def _count_invalidation(dbapi_connection, connection_record, exception):
+    with InstrumentedQueuePool.stats.lock:
+        InstrumentedQueuePool.stats.invalidations += 1
+
+
+@event.listens_for(async_engine.sync_engine, "invalidate")
+def _count_async_invalidation(dbapi_connection, connection_record, exception):
+    with InstrumentedAsyncQueuePool.stats.lock:
+        InstrumentedAsyncQueuePool.stats.invalidations += 1
+
+
+def _describe_pool(pool) -> dict:
+    stats = type(pool).stats
+    with stats.lock:
+        checkouts = stats.checkouts
+        return {
+            "pool_size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": max(0, pool.overflow()),
+            "max_overflow": settings.DB_MAX_OVERFLOW,
+            "checkouts": checkouts,
+            "timeouts": stats.timeouts,
+            "invalidations": stats.invalidations,
+            "wait_time_avg": stats.wait_time_total / checkouts if checkouts else 0.0,
+            "wait_time_max": stats.wait_time_max,
+        }
+
+
+def pool_stats() -> dict:
+    return {
+        "disconnect_strategy": settings.DB_DISCONNECT_STRATEGY,
+        "sync": _describe_pool(engine.pool),
+        "async": _describe_pool(async_engine.pool),
+    }
+
+
+class QueryCounter:
+    """Statements and database time of one context; nested counters also feed their parent."""
+
+    def __init__(self, parent: Optional["QueryCounter"] = None):
+        self.count = 0
+        self.duration = 0.0
+        self.parent = parent
+
+    def add(self, count: int, duration: float) -> None:
+        counter = self
+        while counter is not None:
+            counter.count += count
+            counter.duration += duration
+            counter = counter.parent
+
+
+_query_counter: ContextVar[Optional[QueryCounter]] = ContextVar("query_counter", default=None)
+# "GET /api/products/{product_id}" while a request is served; set by the metrics middleware.
+current_route: ContextVar[Optional[str]] = ContextVar("current_route", default=None)
+
+slow_query_logger = logging.getLogger("database.slow_query")
+SLOW_QUERY_STATEMENT_CHARS = 2000
+
+
+def parameters_shape(parameters, executemany: bool) -> str:
+    """Describe bound parameters without their values, which may hold personal data."""
+    if executemany:
+        if not parameters:
+            return "executemany of 0 rows"
+        return f"executemany of {len(parameters)} rows x {parameters_shape(parameters[0], False)}"
+    if not parameters:
+        return "no parameters"
+    if isinstance(parameters, dict):
+        return f"{len(parameters)} named ({', '.join(sorted(parameters))})"
+    return f"{len(parameters)} positional"
+
+
+def _log_slow_query(statement: str, parameters, executemany: bool, duration: float) -> None:
+    slow_query_logger.warning(
+        "Slow query: %.1f ms, route %s, %s: %s",
+        duration * 1000,
+        current_route.get() or "none",
+        parameters_shape(parameters, executemany),
+        " ".join(statement.split())[:SLOW_QUERY_STATEMENT_CHARS],
+    )
+
+
+@event.listens_for(engine, "before_cursor_execute")
+@event.listens_for(async_engine.sync_engine, "before_cursor_execute")
+def _count_query(conn, cursor, statement, parameters, context, executemany):
+    counter = _query_counter.get()
+    if counter is not None:
+        counter.add(1, 0.0)
+    if counter is not None or settings.SLOW_QUERY_THRESHOLD > 0:
+        context._query_started = time.perf_counter()
+
+
+@event.listens_for(engine, "after_cursor_execute")
+@event.listens_for(async_engine.sync_engine, "after_cursor_execute")
+def _time_query(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_query_started", None)
+    if started is None:
+        return
+    duration = time.perf_counter() - started
+    counter = _query_counter.get()
+    if counter is not None:
+        counter.add(0, duration)
+    if 0 < settings.SLOW_QUERY_THRESHOLD <= duration:
+        _log_slow_query(statement, parameters, executemany, duration)
+
+
+@contextmanager
+def count_queries():
+    """Count SQL statements and their time in the current context (request or test block)."""
+    counter = QueryCounter(parent=_query_counter.get())
+    token = _query_counter.set(counter)
+    try:
+        yield counter
+    finally:
+        _query_counter.reset(token)
+
+
+class seconds_ago(FunctionElement):
+    """The database clock minus a number of seconds.
+
+    For comparisons with server_default=func.now() columns: MySQL stores those in
+    the session time zone, so a cutoff taken from Python's UTC clock would be off
+    by the server's offset.
+    """
+
+    type = DateTime()
+    name = "seconds_ago"
+    inherit_cache = True
+
+    def __init__(self, seconds):
+        super().__init__(literal(int(seconds)))
+
+
+@compiles(seconds_ago)
+def _seconds_ago_default(element, compiler, **kw):
+    return "(CURRENT_TIMESTAMP - %s * INTERVAL '1 second')" % compiler.process(element.clauses, **kw)
+
+
+@compiles(seconds_ago, "mysql")
+def _seconds_ago_mysql(element, compiler, **kw):
+    return "(NOW() - INTERVAL %s SECOND)" % compiler.process(element.clauses, **kw)
+
+
+@compiles(seconds_ago, "sqlite")
+def _seconds_ago_sqlite(element, compiler, **kw):
+    # Same "YYYY-MM-DD HH:MM:SS" text as CURRENT_TIMESTAMP, so it compares as stored.
+    return "datetime('now', '-' || %s || ' seconds')" % compiler.process(element.clauses, **kw)
+
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# expire_on_commit=False: an expired attribute would need an implicit lazy load,
+# which AsyncSession cannot do.
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
 Base = declarative_base()
 
 
@@ -22,5 +268,12 @@ def get_db():
         db.close()
 
 
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
 def init_db():
-    Base.metadata.create_all(bind=engine)
+    from migrations import run_migrations
+
+    return run_migrations(engine)
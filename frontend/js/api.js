@@ -99,6 +99,16 @@ async function getProducts(filters = {}) {
     return apiRequest(`/api/products/${queryString ? "?" + queryString : ""}`);
 }
 
+async function searchProducts(query, filters = {}) {
+    const params = new URLSearchParams({ q: query });
+    if (filters.category_id) params.append("category_id", filters.category_id);
+    if (filters.min_price) params.append("min_price", filters.min_price);
+    if (filters.max_price) params.append("max_price", filters.max_price);
+    if (filters.karat) params.append("karat", filters.karat);
+
+    return apiRequest(`/api/products/search?${params.toString()}`);
+}
+
 async function getProduct(productId) {
     return apiRequest(`/api/products/${productId}`);
 }
@@ -147,8 +157,29 @@ async function checkout(orderData) {
     });
 }
 
-async function generateDesign(designData) {
-    return apiRequest("/api/ai/generate-design", {
+async function getDesignJob(jobId) {
+    return apiRequest(`/api/ai/jobs/${jobId}`);
+}
+
+async function generateDesign(designData, pollIntervalMs = 2000) {
+    let job = await apiRequest("/api/ai/generate-design", {
+        method: "POST",
+        body: designData,
+    });
+
+    while (job.status === "pending" || job.status === "running") {
+        await new Promise((resolve) => setTimeout(resolve, pollIntervalMs));
+        job = await getDesignJob(job.id);
+    }
+
+    if (job.status === "failed") {
+        throw { detail: job.error };
+    }
+    return job;
+}
+
+async function getDesignVariants(designData) {
+    return apiRequest("/api/ai/design-variants", {
         method: "POST",
         body: designData,
     });
@@ -158,6 +189,20 @@ async function getMyDesigns() {
     return apiRequest("/api/ai/my-designs");
 }
 
+function responsiveImage(src, variants, alt, className, sizes = "(max-width: 600px) 50vw, 300px") {
+    if (!variants) {
+        return `<img src="${BASE_URL + src}" alt="${alt}" class="${className}" loading="lazy">`;
+    }
+    const srcset = (urls) => Object.entries(urls)
+        .map(([width, url]) => `${BASE_URL + url} ${width}w`)
+        .join(", ");
+    return `<picture>
+        <source type="image/webp" srcset="${srcset(variants.webp)}" sizes="${sizes}">
+        <img src="${BASE_URL + variants.jpeg[400]}" srcset="${srcset(variants.jpeg)}" sizes="${sizes}"
+             alt="${alt}" class="${className}" loading="lazy">
+    </picture>`;
+}
+
 function formatPrice(price) {
     return new Intl.NumberFormat("ar-SA", {
         style: "currency",
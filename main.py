@@ -1,10 +1,12 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 from contextlib import asynccontextmanager
+import logging
 import os
 
-from database import engine, Base, init_db
+from database import engine, Base, init_db, pool_stats
+from config import settings
 from routers import (
     auth_router,
     products_router,
@@ -12,14 +14,31 @@ from routers import (
     orders_router,
     admin_router,
     ai_router,
+    media_router,
+    analytics_router,
 )
+from routers.ai import design_queue, fail_orphaned_designs
+from utils.compression import CompressionMiddleware
+from utils.health import ReadinessProbe, check_database, check_pools, check_static_dir, queue_check
+from utils.loop_monitor import loop_monitor
+from utils.metrics import MetricsMiddleware, PROMETHEUS_CONTENT_TYPE, request_metrics
+from utils.static_files import CachedStaticFiles
+
+logger = logging.getLogger(__name__)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    Base.metadata.create_all(bind=engine)
+    init_db()
     os.makedirs("static/generated_designs", exist_ok=True)
+    orphaned = await fail_orphaned_designs()
+    if orphaned:
+        logger.warning("Marked %d interrupted design job(s) as failed", orphaned)
+    await design_queue.start()
+    await loop_monitor.start()
     yield
+    await loop_monitor.stop()
+    await design_queue.stop()
 
 
 app = FastAPI(
@@ -35,9 +54,20 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Query-Count", "Server-Timing"],
+)
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MIN_SIZE,
+    gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+    brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
 )
 
-app.mount("/static", StaticFiles(directory="static"), name="static")
+# Outermost, so latency includes compression and the counters see every request.
+app.add_middleware(MetricsMiddleware)
+
+
+app.mount("/static", CachedStaticFiles(directory="static"), name="static")
 
 app.include_router(auth_router)
 app.include_router(products_router)
@@ -45,6 +75,8 @@ app.include_router(cart_router)
 app.include_router(orders_router)
 app.include_router(admin_router)
 app.include_router(ai_router)
+app.include_router(media_router)
+app.include_router(analytics_router)
 
 
 @app.get("/")
@@ -56,6 +88,41 @@ def root():
     }
 
 
+@app.get("/metrics")
+def prometheus_metrics():
+    return Response(request_metrics.render(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+
+@app.get("/metrics/db-pool")
+def db_pool_metrics():
+    return pool_stats()
+
+
+@app.get("/metrics/event-loop")
+def event_loop_metrics():
+    return loop_monitor.stats()
+
+
+readiness = ReadinessProbe(
+    {
+        "database": check_database,
+        "db_pool": check_pools,
+        "static_dir": check_static_dir,
+        "ai_queue": queue_check(design_queue),
+    },
+    ttl=settings.READINESS_CACHE_TTL,
+)
+
+
 @app.get("/health")
-def health_check():
-    return {"status": "healthy"}
\ No newline at end of file
+@app.get("/health/live")
+async def liveness():
+    """The worker's event loop answers; says nothing about its dependencies."""
+    return {"status": "healthy"}
+
+
+@app.get("/health/ready")
+async def readiness_check():
+    """200 when this worker can serve traffic, 503 (with the failing checks) when it cannot."""
+    result = await readiness.status()
+    return JSONResponse(result, status_code=200 if result["status"] == "ready" else 503)
\ No newline at end of file
@@ -0,0 +1,103 @@
+"""Versioned schema migrations.
+
+Each module in ``migrations/versions`` is named ``<version>_<slug>.py`` and defines
+``description`` and ``upgrade(connection)``. Applied versions are recorded in the
+``schema_migrations`` table, so every migration runs exactly once per database.
+Upgrades should be idempotent (``checkfirst=True``) because the initial migration
+creates whatever tables the current models declare.
+"""
+import importlib
+import os
+import pkgutil
+from contextlib import contextmanager
+from sqlalchemy import Column, DateTime, MetaData, String, Table, inspect, select, text
+from sqlalchemy.schema import CreateColumn
+from sqlalchemy.sql import func
+
+VERSIONS_PACKAGE = "migrations.versions"
+LOCK_NAME = "jewelry_schema_migrations"
+
+migration_metadata = MetaData()
+
+schema_migrations = Table(
+    "schema_migrations",
+    migration_metadata,
+    Column("version", String(32), primary_key=True),
+    Column("description", String(255), nullable=False),
+    Column("applied_at", DateTime, server_default=func.now()),
+)
+
+
+def discover_migrations() -> list:
+    versions_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "versions")
+    migrations = []
+    for module_info in sorted(pkgutil.iter_modules([versions_dir]), key=lambda m: m.name):
+        version = module_info.name.split("_", 1)[0]
+        module = importlib.import_module(f"{VERSIONS_PACKAGE}.{module_info.name}")
+        migrations.append((version, module))
+    return migrations
+
+
+@contextmanager
+def _migration_lock(connection):
+    # Several uvicorn workers start at once; only one may migrate at a time.
+    if connection.dialect.name == "mysql":
+        connection.execute(text("SELECT GET_LOCK(:name, 60)"), {"name": LOCK_NAME})
+        try:
+            yield
+        finally:
+            connection.execute(text("SELECT RELEASE_LOCK(:name)"), {"name": LOCK_NAME})
+    else:
+        yield
+
+
+def add_missing_columns(connection, table, column_names) -> None:
+    """ALTER TABLE ... ADD COLUMN for model columns an older database lacks."""
+    existing = {column["name"] for column in inspect(connection).get_columns(table.name)}
+    for name in column_names:
+        if name in existing:
+            continue
+        ddl = CreateColumn(table.c[name]).compile(dialect=connection.dialect)
+        connection.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {ddl}"))
+
+
+def create_missing_indexes(connection, table, index_names) -> None:
+    """CREATE INDEX for model indexes an older database lacks."""
+    existing = {index["name"] for index in inspect(connection).get_indexes(table.name)}
+    for index in table.indexes:
+        if index.name in index_names and index.name not in existing:
+            index.create(connection)
+
+
+def applied_versions(connection) -> set:
+    return set(connection.execute(select(schema_migrations.c.version)).scalars())
+
+
+def run_migrations(engine) -> list:
+    """Apply pending migrations in version order and return the versions applied."""
+    applied_now = []
+    with engine.connect() as connection:
+        with _migration_lock(connection):
+            migration_metadata.create_all(connection, checkfirst=True)
+            done = applied_versions(connection)
+            connection.commit()
+            for version, module in discover_migrations():
+                if version in done:
+                    continue
+                with connection.begin():
+                    module.upgrade(connection)
+                    connection.execute(
+                        schema_migrations.insert().values(
+                            version=version, description=module.description
+                        )
+                    )
+                applied_now.append(version)
+    return applied_now
+
+
+def migration_status(engine) -> list:
+    with engine.connect() as connection:
+        migration_metadata.create_all(connection, checkfirst=True)
+        done = applied_versions(connection)
+        connection.commit()
+    return [(version, module.description, version in done) for version, module in discover_migrations()]
@@ -0,0 +1,15 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import engine
+from migrations import run_migrations, migration_status
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "status":
+        for version, description, applied in migration_status(engine):
+            print(f"{'[x]' if applied else '[ ]'} {version} {description}")
+    else:
+        applied = run_migrations(engine)
+        print(f"Applied {len(applied)} migration(s): {', '.join(applied) or 'none'}")
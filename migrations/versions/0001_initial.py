@@ -0,0 +1,8 @@
+import models  # noqa: F401  (registers every table on Base.metadata)
+from database import Base
+
+description = "Initial schema"
+
+
+def upgrade(connection):
+    Base.metadata.create_all(connection, checkfirst=True)
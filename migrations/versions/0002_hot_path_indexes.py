@@ -0,0 +1,31 @@
+from models.product import Product, ProductImage, product_categories
+from models.cart import CartItem
+from models.order import Order, OrderItem
+from models.design import UserGeneratedDesign
+from migrations import create_missing_indexes
+
+description = "Indexes for product filters, cart/order lookups and design history"
+
+# The indexes this migration introduced. Named explicitly: later migrations add
+# indexes on columns that an older database does not have yet at this point.
+INDEXES = [
+    (Product.__table__, {
+        "ix_products_price_id",
+        "ix_products_karat_price",
+        "ix_products_material_price",
+        "ix_products_jeweler_id",
+    }),
+    (ProductImage.__table__, {"ix_product_images_product_order"}),
+    (product_categories, {"ix_product_categories_category_product"}),
+    (CartItem.__table__, {"ix_cart_items_cart_product"}),
+    (Order.__table__, {"ix_orders_user_date"}),
+    (OrderItem.__table__, {"ix_order_items_order_id", "ix_order_items_product_id"}),
+    (UserGeneratedDesign.__table__, {"ix_user_generated_designs_user_created"}),
+]
+
+
+def upgrade(connection):
+    # Databases created by create_all before this migration lack these indexes;
+    # fresh databases already got them from 0001.
+    for table, index_names in INDEXES:
+        create_missing_indexes(connection, table, index_names)
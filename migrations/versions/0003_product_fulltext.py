@@ -0,0 +1,15 @@
+from sqlalchemy import inspect, text
+from utils.search import FULLTEXT_INDEX_NAME
+
+description = "FULLTEXT index on products(name, description) for search"
+
+
+def upgrade(connection):
+    # Only MySQL has FULLTEXT; other dialects use the name prefix match in utils.search.
+    if connection.dialect.name != "mysql":
+        return
+    existing = {index["name"] for index in inspect(connection).get_indexes("products")}
+    if FULLTEXT_INDEX_NAME not in existing:
+        connection.execute(
+            text(f"CREATE FULLTEXT INDEX {FULLTEXT_INDEX_NAME} ON products (name, description)")
+        )
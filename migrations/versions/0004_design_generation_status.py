@@ -0,0 +1,8 @@
+from models.design import UserGeneratedDesign
+from migrations import add_missing_columns
+
+description = "Generation status and error on user_generated_designs for queued AI jobs"
+
+
+def upgrade(connection):
+    add_missing_columns(connection, UserGeneratedDesign.__table__, ["status", "error"])
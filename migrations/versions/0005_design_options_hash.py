@@ -0,0 +1,25 @@
+from sqlalchemy import select, update
+from models.design import UserGeneratedDesign
+from migrations import add_missing_columns, create_missing_indexes
+from utils.design_cache import options_hash
+
+description = "Content hash of design options so identical AI requests reuse stored images"
+
+
+def upgrade(connection):
+    table = UserGeneratedDesign.__table__
+    add_missing_columns(connection, table, ["options_hash"])
+    create_missing_indexes(connection, table, {"ix_user_generated_designs_options_hash"})
+
+    # Backfill so designs generated before this migration are reusable too.
+    rows = connection.execute(
+        select(table.c.id, table.c.selected_options).where(
+            table.c.options_hash.is_(None), table.c.selected_options.is_not(None)
+        )
+    ).all()
+    for design_id, selected_options in rows:
+        connection.execute(
+            update(table)
+            .where(table.c.id == design_id)
+            .values(options_hash=options_hash(selected_options))
+        )
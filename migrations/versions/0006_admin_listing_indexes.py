@@ -0,0 +1,14 @@
+from models.order import Order
+from models.design import DesignRequest
+from migrations import create_missing_indexes
+
+description = "Indexes for filtered admin order and design-request listings and exports"
+
+
+def upgrade(connection):
+    create_missing_indexes(connection, Order.__table__, {"ix_orders_status_id", "ix_orders_order_date"})
+    create_missing_indexes(
+        connection,
+        DesignRequest.__table__,
+        {"ix_design_requests_status_id", "ix_design_requests_request_date"},
+    )
@@ -0,0 +1,14 @@
+from models.analytics import DailySales, DailyProductSales
+from models.product import Product
+from migrations import create_missing_indexes
+from utils.analytics import rebuild_rollups
+
+description = "Daily sales rollup tables for analytics and a stock index for low-stock alerts"
+
+
+def upgrade(connection):
+    DailySales.__table__.create(connection, checkfirst=True)
+    DailyProductSales.__table__.create(connection, checkfirst=True)
+    create_missing_indexes(connection, Product.__table__, {"ix_products_stock_quantity"})
+    # Seed the rollups from the orders placed before they existed.
+    rebuild_rollups(connection)
@@ -0,0 +1,9 @@
+from models.product import Product
+from migrations import add_missing_columns, create_missing_indexes
+
+description = "Jeweler SKU on products, unique per jeweler, as the bulk import key"
+
+
+def upgrade(connection):
+    add_missing_columns(connection, Product.__table__, ["sku"])
+    create_missing_indexes(connection, Product.__table__, {"ix_products_jeweler_sku"})
@@ -0,0 +1,11 @@
+from models.category import Category
+from migrations import add_missing_columns, create_missing_indexes
+from utils.categories import rebuild_paths
+
+description = "Materialized category paths for the category tree and subtree product filters"
+
+
+def upgrade(connection):
+    add_missing_columns(connection, Category.__table__, ["path"])
+    create_missing_indexes(connection, Category.__table__, {"ix_categories_path"})
+    rebuild_paths(connection)
@@ -0,0 +1,8 @@
+from models.product import Product
+from migrations import create_missing_indexes
+
+description = "Index on product names for prefix search of words too short for the FULLTEXT index"
+
+
+def upgrade(connection):
+    create_missing_indexes(connection, Product.__table__, {"ix_products_name"})
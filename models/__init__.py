@@ -5,7 +5,8 @@ from models.category import Category
 from models.product import Product, ProductImage, product_categories
 from models.cart import Cart, CartItem
 from models.order import Order, OrderItem, OrderStatus
-from models.design import UserGeneratedDesign, DesignRequest, DesignRequestStatus
+from models.design import UserGeneratedDesign, DesignRequest, DesignRequestStatus, DesignGenerationStatus
+from models.analytics import DailySales, DailyProductSales
 
 __all__ = [
     "User",
@@ -23,4 +24,7 @@ __all__ = [
     "UserGeneratedDesign",
     "DesignRequest",
     "DesignRequestStatus",
+    "DesignGenerationStatus",
+    "DailySales",
+    "DailyProductSales",
 ]
\ No newline at end of file
@@ -0,0 +1,31 @@
+from sqlalchemy import Column, Integer, Float, Date, ForeignKey, Index
+from database import Base
+
+
+class DailySales(Base):
+    """Per-day order totals, maintained at checkout and on status changes."""
+
+    __tablename__ = "daily_sales"
+
+    day = Column(Date, primary_key=True)
+    order_count = Column(Integer, nullable=False, default=0, server_default="0")
+    units = Column(Integer, nullable=False, default=0, server_default="0")
+    revenue = Column(Float, nullable=False, default=0.0, server_default="0")
+    cancelled_orders = Column(Integer, nullable=False, default=0, server_default="0")
+    cancelled_revenue = Column(Float, nullable=False, default=0.0, server_default="0")
+    carts_started = Column(Integer, nullable=False, default=0, server_default="0")
+
+
+class DailyProductSales(Base):
+    """Per-day, per-product units and revenue from orders that are not cancelled."""
+
+    __tablename__ = "daily_product_sales"
+    __table_args__ = (
+        Index("ix_daily_product_sales_jeweler_day", "jeweler_id", "day"),
+    )
+
+    day = Column(Date, primary_key=True)
+    product_id = Column(Integer, ForeignKey("products.id"), primary_key=True)
+    jeweler_id = Column(Integer, ForeignKey("jewelers.id"), nullable=False)
+    units = Column(Integer, nullable=False, default=0, server_default="0")
+    revenue = Column(Float, nullable=False, default=0.0, server_default="0")
@@ -1,13 +1,60 @@
-from sqlalchemy import Column, Integer, String, ForeignKey
+from sqlalchemy import Column, Integer, String, ForeignKey, Index, event, func, inspect, select, update
 from sqlalchemy.orm import relationship
+from sqlalchemy.orm.attributes import set_committed_value
 from database import Base
 
+# Materialized path: the ids from the root down to the category itself, each
+# followed by "/", e.g. "1/4/9/". A subtree is every row whose path starts with
+# its root's path, which is one range scan on ix_categories_path.
+PATH_SEPARATOR = "/"
+
 
 class Category(Base):
     __tablename__ = "categories"
+    __table_args__ = (
+        Index("ix_categories_path", "path"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(100), nullable=False)
     parent_id = Column(Integer, ForeignKey("categories.id"), nullable=True)
+    # Maintained by the listeners below; NULL only until migration 0009 has run.
+    path = Column(String(255), nullable=True)
+
+    parent = relationship("Category", remote_side=[id], backref="children")
+
+
+categories = Category.__table__
+
+
+def _path_under(connection, parent_id, category_id) -> str:
+    parent_path = ""
+    if parent_id is not None:
+        parent_path = connection.scalar(select(categories.c.path).where(categories.c.id == parent_id)) or ""
+    return f"{parent_path}{category_id}{PATH_SEPARATOR}"
+
+
+@event.listens_for(Category, "after_insert")
+def _set_path(mapper, connection, target):
+    # The id only exists once the row is inserted, so the path is a follow-up UPDATE.
+    path = _path_under(connection, target.parent_id, target.id)
+    connection.execute(update(categories).where(categories.c.id == target.id).values(path=path))
+    set_committed_value(target, "path", path)
+
 
-    parent = relationship("Category", remote_side=[id], backref="children")
\ No newline at end of file
+@event.listens_for(Category, "after_update")
+def _move_subtree(mapper, connection, target):
+    # Also covers deleting a parent: the ORM first detaches its children.
+    if not inspect(target).attrs.parent_id.history.has_changes():
+        return
+    old_path = connection.scalar(select(categories.c.path).where(categories.c.id == target.id))
+    new_path = _path_under(connection, target.parent_id, target.id)
+    if old_path:
+        connection.execute(
+            update(categories)
+            .where(categories.c.path.like(f"{old_path}%"))
+            .values(path=new_path + func.substr(categories.c.path, len(old_path) + 1))
+        )
+    else:
+        connection.execute(update(categories).where(categories.c.id == target.id).values(path=new_path))
+    set_committed_value(target, "path", new_path)
@@ -1,6 +1,6 @@
 import enum
 import json
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Text, Enum, Float, JSON
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Text, Enum, Float, JSON, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from database import Base
@@ -13,13 +13,31 @@ class DesignRequestStatus(enum.Enum):
     COMPLETED = "completed"
 
 
+class DesignGenerationStatus(enum.Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
 class UserGeneratedDesign(Base):
     __tablename__ = "user_generated_designs"
+    __table_args__ = (
+        Index("ix_user_generated_designs_user_created", "user_id", "created_at"),
+        Index("ix_user_generated_designs_options_hash", "options_hash", "status", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     selected_options = Column(JSON, nullable=True)
+    options_hash = Column(String(64), nullable=True)
     generated_image_url = Column(String(255), nullable=True)
+    status = Column(
+        Enum(DesignGenerationStatus),
+        default=DesignGenerationStatus.PENDING,
+        server_default=DesignGenerationStatus.COMPLETED.name,
+    )
+    error = Column(Text, nullable=True)
     created_at = Column(DateTime, server_default=func.now())
 
     user = relationship("User", backref="generated_designs")
@@ -27,6 +45,10 @@ class UserGeneratedDesign(Base):
 
 class DesignRequest(Base):
     __tablename__ = "design_requests"
+    __table_args__ = (
+        Index("ix_design_requests_status_id", "status", "id"),
+        Index("ix_design_requests_request_date", "request_date"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
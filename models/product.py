@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, Text, Table
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, Text, Table, Index
 from sqlalchemy.orm import relationship
 from database import Base
 
@@ -7,14 +7,26 @@ product_categories = Table(
     Base.metadata,
     Column("product_id", Integer, ForeignKey("products.id"), primary_key=True),
     Column("category_id", Integer, ForeignKey("categories.id"), primary_key=True),
+    Index("ix_product_categories_category_product", "category_id", "product_id"),
 )
 
 
 class Product(Base):
     __tablename__ = "products"
+    __table_args__ = (
+        Index("ix_products_price_id", "price", "id"),
+        Index("ix_products_karat_price", "karat", "price"),
+        Index("ix_products_material_price", "material", "price"),
+        Index("ix_products_jeweler_id", "jeweler_id"),
+        Index("ix_products_stock_quantity", "stock_quantity"),
+        Index("ix_products_jeweler_sku", "jeweler_id", "sku", unique=True),
+        Index("ix_products_name", "name"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     jeweler_id = Column(Integer, ForeignKey("jewelers.id"), nullable=False)
+    # The jeweler's own reference; bulk imports match existing products on it.
+    sku = Column(String(64), nullable=True)
     name = Column(String(200), nullable=False)
     material = Column(String(50), nullable=True)
     karat = Column(String(10), nullable=True)
@@ -39,6 +51,9 @@ class Product(Base):
 
 class ProductImage(Base):
     __tablename__ = "product_images"
+    __table_args__ = (
+        Index("ix_product_images_product_order", "product_id", "display_order"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     product_id = Column(Integer, ForeignKey("products.id"), nullable=False)
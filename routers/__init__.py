@@ -4,6 +4,8 @@ from routers.cart import router as cart_router
 from routers.orders import router as orders_router
 from routers.admin import router as admin_router
 from routers.ai import router as ai_router
+from routers.media import router as media_router
+from routers.analytics import router as analytics_router
 
 __all__ = [
     "auth_router",
@@ -12,4 +14,6 @@ __all__ = [
     "orders_router",
     "admin_router",
     "ai_router",
+    "media_router",
+    "analytics_router",
 ]
\ No newline at end of file
@@ -1,33 +1,68 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
+import tempfile
+from datetime import date, datetime, time, timedelta
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import PlainTextResponse
+from sqlalchemy import select
+from sqlalchemy.orm import Session, selectinload
+from typing import List, Optional
 from database import get_db
+from config import settings
 from models.user import User
 from models.product import Product, ProductImage, product_categories
 from models.category import Category
 from models.payment import PaymentMethod
 from models.jeweler import Jeweler
-from models.order import Order, OrderStatus
+from models.order import Order, OrderItem, OrderStatus
 from models.design import DesignRequest, DesignRequestStatus
-from schemas.product import ProductCreate, ProductUpdate, ProductResponse
+from schemas.product import ProductCreate, ProductUpdate, ProductResponse, ProductImportReport
 from schemas.category import CategoryCreate, CategoryResponse
 from schemas.payment import PaymentMethodCreate, PaymentMethodResponse
 from schemas.jeweler import JewelerCreate, JewelerResponse
 from schemas.order import OrderStatusUpdate, OrderResponse
 from schemas.design import DesignRequestResponse, DesignRequestUpdate
-from utils.auth import get_current_user
+from utils.analytics import record_status_change
+from schemas.user import Principal
+from utils.auth import get_current_principal, get_current_user
+from utils.cache import catalog_cache
+from utils.responses import FastJSONResponse, serialize_list
+from utils.export import export_response, stream_rows
+from utils.pagination import decode_cursor, split_page
+from utils.product_import import ImportFileError, import_products
+from utils.profiler import ProfilerBusyError, collapsed, sample_stacks
+from utils.design_cache import design_cache_stats
+from utils.security import hashing_stats
+from utils.storage import storage_stats
+from routers.ai import design_queue
 
 router = APIRouter(prefix="/api/admin", tags=["Admin"])
 
+IMPORT_SPOOL_SIZE = 8 * 1024 * 1024
+# Upload chunks are gathered to this size before each write to the spool.
+IMPORT_WRITE_SIZE = 1024 * 1024
+PROFILE_MAX_SECONDS = 60
+
+
+def ensure_sku_available(db: Session, jeweler_id: int, sku: Optional[str], product_id: Optional[int] = None):
+    if sku is None:
+        return
+    query = db.query(Product.id).filter(Product.jeweler_id == jeweler_id, Product.sku == sku)
+    if product_id is not None:
+        query = query.filter(Product.id != product_id)
+    if query.first():
+        raise HTTPException(status_code=409, detail="SKU already used by another product of this jeweler")
+
 
 @router.post("/products", response_model=ProductResponse, status_code=status.HTTP_201_CREATED)
 def create_product(product_data: ProductCreate, db: Session = Depends(get_db)):
     jeweler = db.query(Jeweler).filter(Jeweler.id == product_data.jeweler_id).first()
     if not jeweler:
         raise HTTPException(status_code=404, detail="Jeweler not found")
+    ensure_sku_available(db, product_data.jeweler_id, product_data.sku)
 
     new_product = Product(
         jeweler_id=product_data.jeweler_id,
+        sku=product_data.sku,
         name=product_data.name,
         material=product_data.material,
         karat=product_data.karat,
@@ -51,9 +86,46 @@ def create_product(product_data: ProductCreate, db: Session = Depends(get_db)):
         db.commit()
         db.refresh(new_product)
 
+    catalog_cache.invalidate_product(new_product.id)
     return new_product
 
 
+@router.post("/products/import", response_model=ProductImportReport)
+async def import_products_upload(
+    request: Request,
+    import_format: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$"),
+    db: Session = Depends(get_db),
+):
+    """Create or update products from a CSV or NDJSON request body, matched on jeweler_id and sku."""
+    max_bytes = settings.PRODUCT_IMPORT_MAX_BYTES
+    too_large = HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"Import body exceeds {max_bytes} bytes",
+    )
+    content_length = request.headers.get("content-length", "")
+    if content_length.isdigit() and int(content_length) > max_bytes:
+        raise too_large
+
+    # Spool the upload so a large file is parsed from disk rather than held in memory.
+    with tempfile.SpooledTemporaryFile(max_size=IMPORT_SPOOL_SIZE) as upload:
+        received, pending = 0, bytearray()
+        async for chunk in request.stream():
+            received += len(chunk)
+            if received > max_bytes:
+                raise too_large
+            pending += chunk
+            if len(pending) >= IMPORT_WRITE_SIZE:
+                # Past IMPORT_SPOOL_SIZE the spool is a disk file, so writes leave the event loop.
+                await run_in_threadpool(upload.write, bytes(pending))
+                pending.clear()
+        await run_in_threadpool(upload.write, bytes(pending))
+        await run_in_threadpool(upload.seek, 0)
+        try:
+            return await run_in_threadpool(import_products, db, upload, import_format)
+        except ImportFileError as exc:
+            raise HTTPException(status_code=400, detail=str(exc))
+
+
 @router.put("/products/{product_id}", response_model=ProductResponse)
 def update_product(
     product_id: int,
@@ -65,6 +137,8 @@ def update_product(
         raise HTTPException(status_code=404, detail="Product not found")
 
     update_data = product_data.dict(exclude_unset=True, exclude={"category_ids"})
+    if "sku" in update_data:
+        ensure_sku_available(db, product.jeweler_id, update_data["sku"], product_id)
     for key, value in update_data.items():
         setattr(product, key, value)
 
@@ -81,6 +155,7 @@ def update_product(
 
     db.commit()
     db.refresh(product)
+    catalog_cache.invalidate_product(product_id)
     return product
 
 
@@ -91,6 +166,7 @@ def delete_product(product_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Product not found")
     db.delete(product)
     db.commit()
+    catalog_cache.invalidate_product(product_id)
     return {"message": "Product deleted successfully"}
 
 
@@ -108,6 +184,7 @@ def create_category(category_data: CategoryCreate, db: Session = Depends(get_db)
     db.add(new_category)
     db.commit()
     db.refresh(new_category)
+    catalog_cache.invalidate_categories()
     return new_category
 
 
@@ -118,9 +195,61 @@ def delete_category(category_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Category not found")
     db.delete(category)
     db.commit()
+    catalog_cache.invalidate_categories(affects_products=True)
     return {"message": "Category deleted successfully"}
 
 
+@router.get("/cache-stats")
+def get_cache_stats():
+    return catalog_cache.stats()
+
+
+@router.get("/hashing-stats")
+def get_hashing_stats():
+    return hashing_stats()
+
+
+@router.get("/ai-queue-stats")
+def get_ai_queue_stats():
+    return design_queue.stats()
+
+
+@router.get("/design-cache-stats")
+def get_design_cache_stats():
+    return design_cache_stats.as_dict()
+
+
+@router.get("/storage-stats")
+def get_storage_stats():
+    return storage_stats()
+
+
+def require_profiler(current_user: Principal = Depends(get_current_principal)) -> Principal:
+    # Profiling ties up a thread and exposes file paths and function names.
+    if not settings.PROFILER_ENABLED:
+        raise HTTPException(status_code=404, detail="Profiler is disabled")
+    return current_user
+
+
+@router.get("/profile", response_class=PlainTextResponse)
+async def profile_worker(
+    seconds: float = Query(10, gt=0, le=PROFILE_MAX_SECONDS),
+    interval_ms: int = Query(10, ge=1, le=1000),
+    idle: bool = False,
+    current_user: Principal = Depends(require_profiler),
+):
+    """Sample this worker's threads and return collapsed stacks for flamegraph.pl or speedscope.
+
+    Only the worker process that serves the request is profiled. Disabled unless
+    PROFILER_ENABLED is set, and then only for signed-in users.
+    """
+    try:
+        stacks = await run_in_threadpool(sample_stacks, seconds, interval_ms / 1000, idle)
+    except ProfilerBusyError as exc:
+        raise HTTPException(status_code=409, detail=str(exc))
+    return PlainTextResponse(collapsed(stacks))
+
+
 @router.post("/payment-methods", response_model=PaymentMethodResponse, status_code=status.HTTP_201_CREATED)
 def create_payment_method(payment_data: PaymentMethodCreate, db: Session = Depends(get_db)):
     new_payment = PaymentMethod(**payment_data.dict())
@@ -162,10 +291,144 @@ def delete_payment_method(payment_id: int, db: Session = Depends(get_db)):
     return {"message": "Payment method deleted successfully"}
 
 
+ORDER_EXPORT_COLUMNS = [
+    "order_id",
+    "order_date",
+    "user_id",
+    "status",
+    "total_amount",
+    "shipping_address",
+    "product_id",
+    "quantity",
+    "unit_price",
+    "subtotal",
+]
+DESIGN_REQUEST_EXPORT_COLUMNS = [
+    "id",
+    "user_id",
+    "jeweler_id",
+    "generated_design_id",
+    "request_date",
+    "description",
+    "attachment_url",
+    "estimated_budget",
+    "jeweler_price_offer",
+    "status",
+]
+# Admin listings page newest first on the primary key.
+ADMIN_LIST_SORT = "-id"
+
+
+def apply_date_range(query, column, date_from: Optional[date], date_to: Optional[date]):
+    # Both bounds are inclusive calendar days.
+    if date_from:
+        query = query.filter(column >= datetime.combine(date_from, time.min))
+    if date_to:
+        query = query.filter(column < datetime.combine(date_to + timedelta(days=1), time.min))
+    return query
+
+
+def apply_order_filters(query, order_status: Optional[OrderStatus], date_from, date_to):
+    if order_status:
+        query = query.filter(Order.status == order_status)
+    return apply_date_range(query, Order.order_date, date_from, date_to)
+
+
+def apply_design_request_filters(query, request_status: Optional[DesignRequestStatus], date_from, date_to):
+    if request_status:
+        query = query.filter(DesignRequest.status == request_status)
+    return apply_date_range(query, DesignRequest.request_date, date_from, date_to)
+
+
+def paginated_list(response: Response, query, id_column, limit: int, cursor: Optional[str], schema):
+    if cursor:
+        _, last_id = decode_cursor(cursor, ADMIN_LIST_SORT)
+        query = query.filter(id_column < last_id)
+    rows = query.order_by(id_column.desc()).limit(limit + 1).all()
+    items, next_cursor = split_page(rows, limit, ADMIN_LIST_SORT, "id")
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor else {}
+    if settings.FAST_JSON_RESPONSES:
+        return FastJSONResponse(serialize_list(schema, items), headers=headers)
+    response.headers.update(headers)
+    return items
+
+
 @router.get("/orders", response_model=List[OrderResponse])
-def get_all_orders(db: Session = Depends(get_db)):
-    orders = db.query(Order).all()
-    return orders
+def get_all_orders(
+    response: Response,
+    order_status: Optional[OrderStatus] = Query(None, alias="status"),
+    date_from: Optional[date] = Query(None),
+    date_to: Optional[date] = Query(None),
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous X-Next-Cursor header"),
+    db: Session = Depends(get_db),
+):
+    query = apply_order_filters(
+        db.query(Order).options(selectinload(Order.items)), order_status, date_from, date_to
+    )
+    return paginated_list(response, query, Order.id, limit, cursor, OrderResponse)
+
+
+def group_order_rows(rows):
+    """Fold consecutive joined order/item rows into one record per order."""
+    order = None
+    for row in rows:
+        if order is None or order["id"] != row["order_id"]:
+            if order is not None:
+                yield order
+            order = {
+                "id": row["order_id"],
+                "order_date": row["order_date"],
+                "user_id": row["user_id"],
+                "status": row["status"],
+                "total_amount": row["total_amount"],
+                "shipping_address": row["shipping_address"],
+                "items": [],
+            }
+        if row["product_id"] is not None:
+            order["items"].append({
+                "product_id": row["product_id"],
+                "quantity": row["quantity"],
+                "unit_price": row["unit_price"],
+                "subtotal": row["subtotal"],
+            })
+    if order is not None:
+        yield order
+
+
+@router.get("/orders/export")
+def export_orders(
+    export_format: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$"),
+    order_status: Optional[OrderStatus] = Query(None, alias="status"),
+    date_from: Optional[date] = Query(None),
+    date_to: Optional[date] = Query(None),
+):
+    """NDJSON: one order per line with its items. CSV: one row per order item."""
+    statement = apply_order_filters(
+        select(
+            Order.id.label("order_id"),
+            Order.order_date,
+            Order.user_id,
+            Order.status,
+            Order.total_amount,
+            Order.shipping_address,
+            OrderItem.product_id,
+            OrderItem.quantity,
+            OrderItem.unit_price,
+            OrderItem.subtotal,
+        ).outerjoin(OrderItem, OrderItem.order_id == Order.id),
+        order_status,
+        date_from,
+        date_to,
+    ).order_by(Order.id, OrderItem.id)
+
+    def records(db: Session):
+        rows = (dict(row._mapping) for row in stream_rows(db, statement))
+        if export_format == "csv":
+            return rows
+        return group_order_rows(rows)
+
+    return export_response(export_format, "orders", records, ORDER_EXPORT_COLUMNS)
 
 
 @router.put("/orders/{order_id}/status", response_model=OrderResponse)
@@ -174,19 +437,49 @@ def update_order_status(
     status_data: OrderStatusUpdate,
     db: Session = Depends(get_db),
 ):
-    order = db.query(Order).filter(Order.id == order_id).first()
+    order = db.query(Order).filter(Order.id == order_id).with_for_update().first()
     if not order:
         raise HTTPException(status_code=404, detail="Order not found")
+    old_status = order.status
     order.status = status_data.status
+    record_status_change(db, order, old_status)
     db.commit()
     db.refresh(order)
     return order
 
 
 @router.get("/design-requests", response_model=List[DesignRequestResponse])
-def get_all_design_requests(db: Session = Depends(get_db)):
-    requests = db.query(DesignRequest).all()
-    return requests
+def get_all_design_requests(
+    response: Response,
+    request_status: Optional[DesignRequestStatus] = Query(None, alias="status"),
+    date_from: Optional[date] = Query(None),
+    date_to: Optional[date] = Query(None),
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous X-Next-Cursor header"),
+    db: Session = Depends(get_db),
+):
+    query = apply_design_request_filters(db.query(DesignRequest), request_status, date_from, date_to)
+    return paginated_list(response, query, DesignRequest.id, limit, cursor, DesignRequestResponse)
+
+
+@router.get("/design-requests/export")
+def export_design_requests(
+    export_format: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$"),
+    request_status: Optional[DesignRequestStatus] = Query(None, alias="status"),
+    date_from: Optional[date] = Query(None),
+    date_to: Optional[date] = Query(None),
+):
+    statement = apply_design_request_filters(
+        select(*(DesignRequest.__table__.c[column] for column in DESIGN_REQUEST_EXPORT_COLUMNS)),
+        request_status,
+        date_from,
+        date_to,
+    ).order_by(DesignRequest.id)
+
+    def records(db: Session):
+        return (dict(row._mapping) for row in stream_rows(db, statement))
+
+    return export_response(export_format, "design_requests", records, DESIGN_REQUEST_EXPORT_COLUMNS)
 
 
 @router.put("/design-requests/{request_id}", response_model=DesignRequestResponse)
@@ -1,28 +1,77 @@
-import os
-import base64
-import json
-from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, status
+import asyncio
+import math
+import time
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-import google.generativeai as genai
-from database import get_db
-from models.user import User
-from models.design import UserGeneratedDesign
-from schemas.design import DesignInput, DesignResponse
-from utils.auth import get_current_user
+from database import get_db, get_async_db, AsyncSessionLocal, seconds_ago
+from schemas.user import Principal
+from models.design import UserGeneratedDesign, DesignGenerationStatus
+from schemas.design import DesignInput, DesignGenerateRequest, DesignResponse, DesignVariant
+from utils.auth import get_current_principal
+from utils.design_cache import options_hash, find_variants, afind_variants, design_cache_stats, image_variant_id
+from utils.design_models import build_design_model
+from utils.images import build_all_variants
+from utils.jobs import JobQueue, QueueFullError
+from utils.storage import ensure_dir, write_content_addressed
 from config import settings
 
 router = APIRouter(prefix="/api/ai", tags=["AI Design"])
 
 DESIGNS_DIR = "static/generated_designs"
+SSE_POLL_INTERVAL = 1.0
+FINISHED_STATUSES = {DesignGenerationStatus.COMPLETED, DesignGenerationStatus.FAILED}
+UNFINISHED_STATUSES = [DesignGenerationStatus.PENDING, DesignGenerationStatus.RUNNING]
+INTERRUPTED_ERROR = "Design generation was interrupted by a server restart, please retry"
+# Longest a live worker can hold a job: a full queue ahead of it, then its own run.
+ORPHANED_JOB_AGE = settings.AI_JOB_TIMEOUT * (math.ceil(settings.AI_JOB_QUEUE_SIZE / settings.AI_JOB_CONCURRENCY) + 1)
 
-if settings.GEMINI_API_KEY:
-    genai.configure(api_key=settings.GEMINI_API_KEY)
+design_model = build_design_model()
 
 
-def ensure_designs_dir():
-    if not os.path.exists(DESIGNS_DIR):
-        os.makedirs(DESIGNS_DIR)
+async def _fail_abandoned(design_ids) -> None:
+    """Jobs dropped from the queue at shutdown; without this they would stay pending."""
+    async with AsyncSessionLocal() as db:
+        await db.execute(
+            update(UserGeneratedDesign)
+            .where(
+                UserGeneratedDesign.id.in_(design_ids),
+                UserGeneratedDesign.status.in_(UNFINISHED_STATUSES),
+            )
+            .values(status=DesignGenerationStatus.FAILED, error=INTERRUPTED_ERROR)
+        )
+        await db.commit()
+
+
+# Started and stopped by main.lifespan.
+design_queue = JobQueue(
+    "design-generation",
+    concurrency=settings.AI_JOB_CONCURRENCY,
+    max_size=settings.AI_JOB_QUEUE_SIZE,
+    on_abandoned=_fail_abandoned,
+)
+
+
+async def fail_orphaned_designs() -> int:
+    """Fail pending or running designs that no worker can still be holding.
+
+    A clean shutdown fails its own jobs; this catches those of a crashed process.
+    Only rows older than ORPHANED_JOB_AGE are touched, since other workers may be
+    running newer ones.
+    """
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            update(UserGeneratedDesign)
+            .where(
+                UserGeneratedDesign.status.in_(UNFINISHED_STATUSES),
+                UserGeneratedDesign.created_at < seconds_ago(ORPHANED_JOB_AGE),
+            )
+            .values(status=DesignGenerationStatus.FAILED, error=INTERRUPTED_ERROR)
+        )
+        await db.commit()
+    return result.rowcount
 
 
 def construct_prompt(data: DesignInput) -> str:
@@ -57,93 +106,218 @@ def construct_prompt(data: DesignInput) -> str:
     return prompt.strip()
 
 
-def save_image(image_data: bytes, user_id: int) -> str:
-    ensure_designs_dir()
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"design_{user_id}_{timestamp}.png"
-    filepath = os.path.join(DESIGNS_DIR, filename)
+async def save_image(image_data: bytes, user_id: int) -> str:
+    await ensure_dir(DESIGNS_DIR)
+    filename = await write_content_addressed(DESIGNS_DIR, f"design_{user_id}", ".png", image_data)
+    return f"/static/generated_designs/{filename}"
 
-    with open(filepath, "wb") as f:
-        f.write(image_data)
 
-    return f"/static/generated_designs/{filename}"
+async def _update_design(design_id: int, **values) -> None:
+    async with AsyncSessionLocal() as db:
+        await db.execute(
+            update(UserGeneratedDesign).where(UserGeneratedDesign.id == design_id).values(**values)
+        )
+        await db.commit()
 
 
-@router.post("/generate-design", response_model=DesignResponse, status_code=status.HTTP_201_CREATED)
-async def generate_design(
+async def run_design_job(design_id: int, user_id: int, prompt: str) -> None:
+    try:
+        await _update_design(design_id, status=DesignGenerationStatus.RUNNING)
+        design_queue.notify(design_id)
+        started = time.perf_counter()
+        image_bytes = await asyncio.wait_for(design_model.generate(prompt), settings.AI_JOB_TIMEOUT)
+        design_cache_stats.record_generation(time.perf_counter() - started)
+        image_url = await save_image(image_bytes, user_id)
+        await build_all_variants(image_url)
+    except asyncio.CancelledError:
+        # The queue is stopping; CancelledError is not an Exception, so record it here.
+        await _update_design(design_id, status=DesignGenerationStatus.FAILED, error=INTERRUPTED_ERROR)
+        raise
+    except Exception as e:
+        if isinstance(e, asyncio.TimeoutError):
+            error = "Design generation timed out"
+        elif "API key" in str(e) or "authentication" in str(e).lower():
+            error = "Invalid Gemini API key or authentication failed"
+        else:
+            error = f"Error generating design: {str(e)}"
+        await _update_design(design_id, status=DesignGenerationStatus.FAILED, error=error)
+        raise
+    await _update_design(
+        design_id,
+        status=DesignGenerationStatus.COMPLETED,
+        generated_image_url=image_url,
+    )
+
+
+def _get_user_design(db: Session, design_id: int, user_id: int) -> UserGeneratedDesign:
+    design = (
+        db.query(UserGeneratedDesign)
+        .filter(UserGeneratedDesign.id == design_id, UserGeneratedDesign.user_id == user_id)
+        .first()
+    )
+    if not design:
+        raise HTTPException(status_code=404, detail="Design job not found")
+    return design
+
+
+async def _reuse_variant(
+    db: AsyncSession, user_id: int, options: dict, key: str, variant_id: str = None
+) -> UserGeneratedDesign:
+    """Copy a stored variant into the user's designs, or return None on a cache miss."""
+    variants = await afind_variants(db, key)
+    if variant_id is not None:
+        variants = [
+            variant for variant in variants if image_variant_id(variant.generated_image_url) == variant_id
+        ]
+        if not variants:
+            raise HTTPException(status_code=404, detail="Design variant not found")
+    if not variants:
+        return None
+
+    design = UserGeneratedDesign(
+        user_id=user_id,
+        selected_options=options,
+        options_hash=key,
+        generated_image_url=variants[0].generated_image_url,
+        status=DesignGenerationStatus.COMPLETED,
+    )
+    db.add(design)
+    await db.commit()
+    await db.refresh(design)
+    return design
+
+
+@router.post("/design-variants", response_model=list[DesignVariant])
+def get_design_variants(
     design_input: DesignInput,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db),
 ):
-    if not settings.GEMINI_API_KEY:
+    """Stored images for these exact options; pass one as variant_id to generate-design."""
+    return [
+        DesignVariant(
+            variant_id=image_variant_id(variant.generated_image_url),
+            generated_image_url=variant.generated_image_url,
+        )
+        for variant in find_variants(db, options_hash(design_input.dict()))
+    ]
+
+
+@router.post("/generate-design", response_model=DesignResponse, status_code=status.HTTP_202_ACCEPTED)
+async def generate_design(
+    response: Response,
+    design_input: DesignGenerateRequest,
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_async_db),
+):
+    options = design_input.dict(exclude={"force_fresh", "variant_id"})
+    key = options_hash(options)
+
+    if settings.AI_DESIGN_CACHE_ENABLED and not design_input.force_fresh:
+        cached = await _reuse_variant(db, current_user.id, options, key, design_input.variant_id)
+        if cached is not None:
+            design_cache_stats.record_hit()
+            response.status_code = status.HTTP_200_OK
+            return cached
+    design_cache_stats.record_miss(forced=design_input.force_fresh)
+
+    if not design_model.configured:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Gemini API key not configured",
         )
 
     prompt = construct_prompt(design_input)
+    new_design = UserGeneratedDesign(
+        user_id=current_user.id,
+        selected_options=options,
+        options_hash=key,
+        status=DesignGenerationStatus.PENDING,
+    )
+    db.add(new_design)
+    await db.commit()
+    await db.refresh(new_design)
 
     try:
-        model = genai.GenerativeModel("gemini-3-pro-image-preview")
-        
-        response = await model.generate_content_async(
-            prompt,
-            generation_config={
-                "response_modalities": ["image", "text"],
-            }
+        design_queue.submit(
+            new_design.id, lambda: run_design_job(new_design.id, current_user.id, prompt)
+        )
+    except QueueFullError:
+        await _update_design(
+            new_design.id, status=DesignGenerationStatus.FAILED, error="Design queue is full"
+        )
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many designs are being generated, please retry shortly",
+            headers={"Retry-After": "5"},
         )
 
-        image_data = None
-        for part in response.parts:
-            if hasattr(part, "inline_data"):
-                image_data = part.inline_data.data
-                break
-
-        if not image_data:
-            text_response = response.text if hasattr(response, "text") else "No image generated"
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Failed to generate image. Response: {text_response}",
-            )
-
-        if isinstance(image_data, str):
-            image_bytes = base64.b64decode(image_data)
-        else:
-            image_bytes = image_data
+    return new_design
 
-        image_url = save_image(image_bytes, current_user.id)
 
-        new_design = UserGeneratedDesign(
-            user_id=current_user.id,
-            selected_options=design_input.dict(),
-            generated_image_url=image_url,
-        )
-        db.add(new_design)
-        db.commit()
-        db.refresh(new_design)
+@router.get("/jobs/{job_id}", response_model=DesignResponse)
+def get_design_job(
+    job_id: int,
+    current_user: Principal = Depends(get_current_principal),
+    db: Session = Depends(get_db),
+):
+    return _get_user_design(db, job_id, current_user.id)
 
-        return new_design
 
-    except Exception as e:
-        if "API key" in str(e) or "authentication" in str(e).lower():
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Invalid Gemini API key or authentication failed",
+@router.get("/jobs/{job_id}/events")
+async def stream_design_job(
+    job_id: int,
+    current_user: Principal = Depends(get_current_principal),
+):
+    async def load():
+        async with AsyncSessionLocal() as db:
+            design = await db.scalar(
+                select(UserGeneratedDesign).where(
+                    UserGeneratedDesign.id == job_id, UserGeneratedDesign.user_id == current_user.id
+                )
             )
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error generating design: {str(e)}",
-        )
+        if not design:
+            raise HTTPException(status_code=404, detail="Design job not found")
+        return DesignResponse.model_validate(design)
+
+    job = await load()
+
+    async def events():
+        nonlocal job
+        last_status = None
+        deadline = time.monotonic() + settings.AI_JOB_EVENTS_MAX_SECONDS
+        while True:
+            if job.status != last_status:
+                last_status = job.status
+                yield f"event: status\ndata: {job.model_dump_json()}\n\n"
+            if job.status in FINISHED_STATUSES:
+                return
+            if time.monotonic() >= deadline:
+                # Bounded even if the job never finishes; the client can reconnect or poll.
+                yield f"event: timeout\ndata: {job.model_dump_json()}\n\n"
+                return
+            # Woken immediately if this worker runs the job; otherwise re-read periodically.
+            await design_queue.wait_for_update(job_id, timeout=SSE_POLL_INTERVAL)
+            job = await load()
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.get("/my-designs", response_model=list[DesignResponse])
 def get_my_designs(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db),
 ):
     designs = (
         db.query(UserGeneratedDesign)
-        .filter(UserGeneratedDesign.user_id == current_user.id)
+        .filter(
+            UserGeneratedDesign.user_id == current_user.id,
+            UserGeneratedDesign.status == DesignGenerationStatus.COMPLETED,
+        )
         .order_by(UserGeneratedDesign.created_at.desc())
         .all()
     )
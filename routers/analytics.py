@@ -0,0 +1,180 @@
+from collections import OrderedDict
+from datetime import date, timedelta
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from typing import List, Literal, Optional
+from database import get_db
+from models.analytics import DailySales, DailyProductSales
+from models.jeweler import Jeweler
+from models.product import Product
+from schemas.analytics import (
+    RevenuePoint,
+    ProductSales,
+    JewelerSales,
+    ConversionPoint,
+    ConversionReport,
+    LowStockProduct,
+)
+from utils.analytics import rebuild_rollups
+
+router = APIRouter(prefix="/api/admin/analytics", tags=["Analytics"])
+
+DEFAULT_WINDOW_DAYS = 30
+
+
+def date_window(date_from: Optional[date], date_to: Optional[date]):
+    # Inclusive calendar days; defaults to the last DEFAULT_WINDOW_DAYS days.
+    date_to = date_to or date.today()
+    date_from = date_from or date_to - timedelta(days=DEFAULT_WINDOW_DAYS - 1)
+    if date_from > date_to:
+        raise HTTPException(status_code=400, detail="date_from must not be after date_to")
+    return date_from, date_to
+
+
+def _rate(orders: int, carts: int) -> Optional[float]:
+    return round(orders / carts, 4) if carts else None
+
+
+@router.get("/revenue", response_model=List[RevenuePoint])
+def get_revenue(
+    period: Literal["day", "week"] = "day",
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    db: Session = Depends(get_db),
+):
+    """Orders, units and revenue per day or per ISO week (starting Monday)."""
+    date_from, date_to = date_window(date_from, date_to)
+    rows = db.query(DailySales).filter(
+        DailySales.day >= date_from, DailySales.day <= date_to
+    ).order_by(DailySales.day).all()
+
+    points = OrderedDict()
+    for row in rows:
+        start = row.day - timedelta(days=row.day.weekday()) if period == "week" else row.day
+        point = points.setdefault(start, {
+            "period_start": start, "order_count": 0, "units": 0, "revenue": 0.0,
+            "cancelled_orders": 0, "cancelled_revenue": 0.0,
+        })
+        point["order_count"] += row.order_count
+        point["units"] += row.units
+        point["revenue"] += row.revenue
+        point["cancelled_orders"] += row.cancelled_orders
+        point["cancelled_revenue"] += row.cancelled_revenue
+    for point in points.values():
+        point["revenue"] = round(point["revenue"], 2)
+        point["cancelled_revenue"] = round(point["cancelled_revenue"], 2)
+    return list(points.values())
+
+
+@router.get("/products", response_model=List[ProductSales])
+def get_product_sales(
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    jeweler_id: Optional[int] = None,
+    limit: int = Query(20, ge=1, le=200),
+    db: Session = Depends(get_db),
+):
+    """Best-selling products by units sold in the window."""
+    date_from, date_to = date_window(date_from, date_to)
+    units = func.sum(DailyProductSales.units).label("units")
+    statement = (
+        select(
+            DailyProductSales.product_id,
+            Product.name,
+            DailyProductSales.jeweler_id,
+            units,
+            func.sum(DailyProductSales.revenue).label("revenue"),
+        )
+        .outerjoin(Product, Product.id == DailyProductSales.product_id)
+        .where(DailyProductSales.day >= date_from, DailyProductSales.day <= date_to)
+        .group_by(DailyProductSales.product_id, Product.name, DailyProductSales.jeweler_id)
+        .having(units > 0)
+        .order_by(units.desc(), DailyProductSales.product_id)
+        .limit(limit)
+    )
+    if jeweler_id is not None:
+        statement = statement.where(DailyProductSales.jeweler_id == jeweler_id)
+    return [
+        ProductSales(
+            product_id=row.product_id,
+            name=row.name,
+            jeweler_id=row.jeweler_id,
+            units=row.units,
+            revenue=round(row.revenue, 2),
+        )
+        for row in db.execute(statement)
+    ]
+
+
+@router.get("/jewelers", response_model=List[JewelerSales])
+def get_jeweler_sales(
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    db: Session = Depends(get_db),
+):
+    """Units and revenue per jeweler in the window, highest revenue first."""
+    date_from, date_to = date_window(date_from, date_to)
+    revenue = func.sum(DailyProductSales.revenue).label("revenue")
+    statement = (
+        select(
+            DailyProductSales.jeweler_id,
+            Jeweler.name,
+            func.sum(DailyProductSales.units).label("units"),
+            revenue,
+        )
+        .outerjoin(Jeweler, Jeweler.id == DailyProductSales.jeweler_id)
+        .where(DailyProductSales.day >= date_from, DailyProductSales.day <= date_to)
+        .group_by(DailyProductSales.jeweler_id, Jeweler.name)
+        .order_by(revenue.desc(), DailyProductSales.jeweler_id)
+    )
+    return [
+        JewelerSales(jeweler_id=row.jeweler_id, name=row.name, units=row.units, revenue=round(row.revenue, 2))
+        for row in db.execute(statement)
+    ]
+
+
+@router.get("/conversion", response_model=ConversionReport)
+def get_conversion(
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    db: Session = Depends(get_db),
+):
+    """Carts started versus orders placed, per day and over the whole window."""
+    date_from, date_to = date_window(date_from, date_to)
+    rows = db.query(DailySales).filter(
+        DailySales.day >= date_from, DailySales.day <= date_to
+    ).order_by(DailySales.day).all()
+    # Cancelled orders still converted a cart.
+    days = [
+        ConversionPoint(
+            day=row.day,
+            carts_started=row.carts_started,
+            order_count=row.order_count + row.cancelled_orders,
+            conversion_rate=_rate(row.order_count + row.cancelled_orders, row.carts_started),
+        )
+        for row in rows
+    ]
+    carts = sum(point.carts_started for point in days)
+    orders = sum(point.order_count for point in days)
+    return ConversionReport(carts_started=carts, order_count=orders, conversion_rate=_rate(orders, carts), days=days)
+
+
+@router.get("/low-stock", response_model=List[LowStockProduct])
+def get_low_stock(
+    threshold: int = Query(5, ge=0),
+    limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_db),
+):
+    """Products at or below the stock threshold, emptiest first."""
+    return db.query(Product).filter(
+        Product.stock_quantity <= threshold
+    ).order_by(Product.stock_quantity, Product.id).limit(limit).all()
+
+
+@router.post("/rebuild")
+def rebuild_analytics(db: Session = Depends(get_db)):
+    """Recompute the order rollups from the order tables, e.g. after a manual data fix."""
+    rebuild_rollups(db.connection())
+    db.commit()
+    return {"message": "Analytics rollups rebuilt"}
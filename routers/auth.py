@@ -1,10 +1,11 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from datetime import timedelta
 from database import get_db
 from models.user import User
 from schemas.user import UserCreate, UserResponse, UserLogin, Token
-from utils.security import get_password_hash, verify_password
+from utils.security import get_password_hash_async, verify_password_async, needs_rehash
 from utils.auth import create_access_token, get_current_user
 from config import settings
 
@@ -12,16 +13,20 @@ router = APIRouter(prefix="/api/auth", tags=["Authentication"])
 
 
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-def register(user_data: UserCreate, db: Session = Depends(get_db)):
-    existing_user = db.query(User).filter(
-        (User.username == user_data.username) | (User.email == user_data.email)
-    ).first()
+async def register(user_data: UserCreate, db: Session = Depends(get_db)):
+    # Handlers are async so hashing can await its own executor; blocking DB work
+    # is pushed to the threadpool instead of running on the event loop.
+    existing_user = await run_in_threadpool(
+        lambda: db.query(User).filter(
+            (User.username == user_data.username) | (User.email == user_data.email)
+        ).first()
+    )
     if existing_user:
         if existing_user.username == user_data.username:
             raise HTTPException(status_code=400, detail="Username already registered")
         raise HTTPException(status_code=400, detail="Email already registered")
 
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await get_password_hash_async(user_data.password)
     new_user = User(
         username=user_data.username,
         email=user_data.email,
@@ -33,25 +38,38 @@ def register(user_data: UserCreate, db: Session = Depends(get_db)):
         gender=user_data.gender,
         address=user_data.address,
     )
-    db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+
+    def persist():
+        db.add(new_user)
+        db.commit()
+        db.refresh(new_user)
+
+    await run_in_threadpool(persist)
     return new_user
 
 
 @router.post("/login", response_model=Token)
-def login(user_data: UserLogin, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.username == user_data.username).first()
-    if not user or not verify_password(user_data.password, user.password):
+async def login(user_data: UserLogin, db: Session = Depends(get_db)):
+    user = await run_in_threadpool(
+        lambda: db.query(User).filter(User.username == user_data.username).first()
+    )
+    if not user or not await verify_password_async(user_data.password, user.password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid username or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    username, user_id = user.username, user.id
+
+    # Upgrade hashes stored with an older iteration count while the plaintext is at hand.
+    if needs_rehash(user.password):
+        user.password = await get_password_hash_async(user_data.password)
+        await run_in_threadpool(db.commit)
+
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        data={"sub": user.username, "user_id": user.id},
+        data={"sub": username, "user_id": user_id},
         expires_delta=access_token_expires,
     )
     return Token(access_token=access_token, token_type="bearer")
@@ -1,26 +1,62 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
-from database import get_db
-from models.user import User
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload
+from typing import List, Optional
+from database import get_db, get_async_db
+from schemas.user import Principal
 from models.product import Product
 from models.cart import Cart, CartItem
 from schemas.cart import CartResponse, CartItemCreate, CartItemWithProduct
-from utils.auth import get_current_user
+from utils.analytics import record_cart_started
+from utils.auth import get_current_principal
 
 router = APIRouter(prefix="/api/cart", tags=["Cart"])
 
 
+def load_cart(db: Session, user_id: int) -> Optional[Cart]:
+    """Fetch the cart, its items and the product fields shown in responses in one query."""
+    return (
+        db.query(Cart)
+        .options(cart_eager_options())
+        .filter(Cart.user_id == user_id)
+        .populate_existing()
+        .first()
+    )
+
+
+def cart_eager_options():
+    return joinedload(Cart.items).joinedload(CartItem.product).load_only(
+        Product.name, Product.price, Product.image_path
+    )
+
+
+async def load_cart_async(db: AsyncSession, user_id: int) -> Optional[Cart]:
+    result = await db.execute(
+        select(Cart)
+        .options(cart_eager_options())
+        .where(Cart.user_id == user_id)
+        .execution_options(populate_existing=True)
+    )
+    return result.unique().scalar_one_or_none()
+
+
 def get_or_create_cart(db: Session, user_id: int) -> Cart:
-    cart = db.query(Cart).filter(Cart.user_id == user_id).first()
+    cart = load_cart(db, user_id)
     if not cart:
-        cart = Cart(user_id=user_id)
-        db.add(cart)
+        db.add(Cart(user_id=user_id))
         db.commit()
-        db.refresh(cart)
+        cart = load_cart(db, user_id)
     return cart
 
 
+def find_cart_item(cart: Cart, item_id: int) -> CartItem:
+    for item in cart.items:
+        if item.id == item_id:
+            return item
+    raise HTTPException(status_code=404, detail="Cart item not found")
+
+
 def calculate_cart_total(cart: Cart) -> float:
     total = 0.0
     for item in cart.items:
@@ -54,15 +90,22 @@ def format_cart_response(cart: Cart) -> CartResponse:
 
 
 @router.get("/", response_model=CartResponse)
-def get_cart(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    cart = get_or_create_cart(db, current_user.id)
+async def get_cart(
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_async_db),
+):
+    cart = await load_cart_async(db, current_user.id)
+    if not cart:
+        db.add(Cart(user_id=current_user.id))
+        await db.commit()
+        cart = await load_cart_async(db, current_user.id)
     return format_cart_response(cart)
 
 
 @router.post("/add", response_model=CartResponse, status_code=status.HTTP_201_CREATED)
 def add_to_cart(
     item_data: CartItemCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db),
 ):
     product = db.query(Product).filter(Product.id == item_data.product_id).first()
@@ -74,12 +117,13 @@ def add_to_cart(
 
     cart = get_or_create_cart(db, current_user.id)
 
-    existing_item = (
-        db.query(CartItem)
-        .filter(CartItem.cart_id == cart.id, CartItem.product_id == item_data.product_id)
-        .first()
+    existing_item = next(
+        (item for item in cart.items if item.product_id == item_data.product_id), None
     )
 
+    if not cart.items:
+        record_cart_started(db)
+
     if existing_item:
         existing_item.quantity += item_data.quantity
     else:
@@ -91,24 +135,21 @@ def add_to_cart(
         db.add(new_item)
 
     db.commit()
-    db.refresh(cart)
-    return format_cart_response(cart)
+    return format_cart_response(load_cart(db, current_user.id))
 
 
 @router.put("/update/{item_id}", response_model=CartResponse)
 def update_cart_item(
     item_id: int,
     quantity: int,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db),
 ):
-    cart = db.query(Cart).filter(Cart.user_id == current_user.id).first()
+    cart = load_cart(db, current_user.id)
     if not cart:
         raise HTTPException(status_code=404, detail="Cart not found")
 
-    item = db.query(CartItem).filter(CartItem.id == item_id, CartItem.cart_id == cart.id).first()
-    if not item:
-        raise HTTPException(status_code=404, detail="Cart item not found")
+    item = find_cart_item(cart, item_id)
 
     if quantity <= 0:
         db.delete(item)
@@ -116,35 +157,31 @@ def update_cart_item(
         item.quantity = quantity
 
     db.commit()
-    db.refresh(cart)
-    return format_cart_response(cart)
+    return format_cart_response(load_cart(db, current_user.id))
 
 
 @router.delete("/remove/{item_id}", response_model=CartResponse)
 def remove_from_cart(
     item_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db),
 ):
-    cart = db.query(Cart).filter(Cart.user_id == current_user.id).first()
+    cart = load_cart(db, current_user.id)
     if not cart:
         raise HTTPException(status_code=404, detail="Cart not found")
 
-    item = db.query(CartItem).filter(CartItem.id == item_id, CartItem.cart_id == cart.id).first()
-    if not item:
-        raise HTTPException(status_code=404, detail="Cart item not found")
+    item = find_cart_item(cart, item_id)
 
     db.delete(item)
     db.commit()
-    db.refresh(cart)
-    return format_cart_response(cart)
+    return format_cart_response(load_cart(db, current_user.id))
 
 
 @router.delete("/clear", response_model=CartResponse)
-def clear_cart(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    cart = db.query(Cart).filter(Cart.user_id == current_user.id).first()
+def clear_cart(current_user: Principal = Depends(get_current_principal), db: Session = Depends(get_db)):
+    cart = load_cart(db, current_user.id)
     if cart:
         db.query(CartItem).filter(CartItem.cart_id == cart.id).delete()
         db.commit()
-        db.refresh(cart)
+        cart = load_cart(db, current_user.id)
     return format_cart_response(cart) if cart else CartResponse(id=0, user_id=current_user.id, items=[], total_amount=0.0)
\ No newline at end of file
@@ -0,0 +1,32 @@
+import os
+from fastapi import APIRouter, HTTPException, Request
+from utils.images import resolve_variant, build_variant
+from utils.static_files import immutable_not_modified, serve_file
+
+router = APIRouter(prefix="/media", tags=["Media"])
+
+
+@router.get("/{width}/{path:path}")
+async def get_image_variant(width: int, path: str, request: Request):
+    """Resized WebP/JPEG copy of a static image, rendered on first request and cached on disk."""
+    not_modified = immutable_not_modified(path, request.headers)
+    if not_modified is not None:
+        return not_modified
+
+    resolved = resolve_variant(width, path)
+    if resolved is None:
+        raise HTTPException(status_code=404, detail="Image variant not found")
+    source, target, fmt = resolved
+
+    try:
+        source_mtime = os.stat(source).st_mtime
+    except OSError:
+        raise HTTPException(status_code=404, detail="Image not found")
+    # Re-render when a source without a content hash in its name was replaced in place.
+    if not os.path.exists(target) or os.stat(target).st_mtime < source_mtime:
+        try:
+            await build_variant(source, target, width, fmt)
+        except OSError:
+            raise HTTPException(status_code=422, detail="Image could not be resized")
+
+    return serve_file(target, request.headers)
@@ -1,32 +1,45 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select, update, insert, delete
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
 from typing import List
-from database import get_db
-from models.user import User
+from database import get_db, get_async_db
+from schemas.user import Principal
 from models.order import Order, OrderItem, OrderStatus
 from models.cart import Cart, CartItem
+from models.product import Product
 from schemas.order import OrderCreate, OrderResponse, OrderStatusUpdate
-from utils.auth import get_current_user
+from utils.auth import get_current_principal
+from utils.analytics import record_order_placed
+from utils.cache import catalog_cache
 
 router = APIRouter(prefix="/api/orders", tags=["Orders"])
 
 
 @router.get("/", response_model=List[OrderResponse])
-def get_orders(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+async def get_orders(
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    orders = db.query(Order).filter(Order.user_id == current_user.id).all()
-    return orders
+    orders = await db.scalars(
+        select(Order)
+        .options(selectinload(Order.items))
+        .where(Order.user_id == current_user.id)
+    )
+    return orders.all()
 
 
 @router.get("/{order_id}", response_model=OrderResponse)
-def get_order(
+async def get_order(
     order_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    order = db.query(Order).filter(Order.id == order_id, Order.user_id == current_user.id).first()
+    order = await db.scalar(
+        select(Order)
+        .options(selectinload(Order.items))
+        .where(Order.id == order_id, Order.user_id == current_user.id)
+    )
     if not order:
         raise HTTPException(status_code=404, detail="Order not found")
     return order
@@ -35,55 +48,90 @@ def get_order(
 @router.post("/checkout", response_model=OrderResponse, status_code=status.HTTP_201_CREATED)
 def checkout(
     order_data: OrderCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db),
 ):
-    cart = db.query(Cart).filter(Cart.user_id == current_user.id).first()
-    if not cart or not cart.items:
+    # One round trip for the cart, its items and the product fields we need.
+    cart_rows = (
+        db.query(
+            CartItem.cart_id,
+            CartItem.product_id,
+            CartItem.quantity,
+            Product.name,
+            Product.price,
+            Product.jeweler_id,
+        )
+        .join(Cart, CartItem.cart_id == Cart.id)
+        .join(Product, CartItem.product_id == Product.id)
+        .filter(Cart.user_id == current_user.id)
+        .order_by(CartItem.product_id)
+        .all()
+    )
+    if not cart_rows:
         raise HTTPException(status_code=400, detail="Cart is empty")
 
-    total_amount = 0.0
     order_items = []
-
-    for cart_item in cart.items:
-        if cart_item.product.stock_quantity < cart_item.quantity:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Not enough stock for product: {cart_item.product.name}",
-            )
-
-        unit_price = cart_item.product.price
-        subtotal = unit_price * cart_item.quantity
+    total_amount = 0.0
+    for row in cart_rows:
+        subtotal = row.price * row.quantity
         total_amount += subtotal
+        order_items.append(
+            {
+                "product_id": row.product_id,
+                "quantity": row.quantity,
+                "unit_price": row.price,
+                "subtotal": subtotal,
+            }
+        )
 
-        order_item = OrderItem(
-            product_id=cart_item.product_id,
-            quantity=cart_item.quantity,
-            unit_price=unit_price,
-            subtotal=subtotal,
+    try:
+        # Conditional decrements make the stock check and the write one atomic step,
+        # so two buyers racing for the last piece cannot both succeed. Rows are
+        # touched in product_id order to keep lock acquisition deadlock-free.
+        for row in cart_rows:
+            result = db.execute(
+                update(Product)
+                .where(Product.id == row.product_id, Product.stock_quantity >= row.quantity)
+                .values(stock_quantity=Product.stock_quantity - row.quantity)
+                .execution_options(synchronize_session=False)
+            )
+            if result.rowcount != 1:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Not enough stock for product: {row.name}",
+                )
+
+        new_order = Order(
+            user_id=current_user.id,
+            payment_method_id=order_data.payment_method_id,
+            shipping_address=order_data.shipping_address,
+            transfer_receipt=order_data.transfer_receipt,
+            total_amount=total_amount,
+            status=OrderStatus.PENDING,
         )
-        order_items.append(order_item)
+        db.add(new_order)
+        db.flush()
 
-        cart_item.product.stock_quantity -= cart_item.quantity
+        for item in order_items:
+            item["order_id"] = new_order.id
+        db.execute(insert(OrderItem), order_items)
 
-    new_order = Order(
-        user_id=current_user.id,
-        payment_method_id=order_data.payment_method_id,
-        shipping_address=order_data.shipping_address,
-        transfer_receipt=order_data.transfer_receipt,
-        total_amount=total_amount,
-        status=OrderStatus.PENDING,
-    )
-    db.add(new_order)
-    db.commit()
-    db.refresh(new_order)
+        record_order_placed(db, new_order, [
+            {**item, "jeweler_id": row.jeweler_id} for item, row in zip(order_items, cart_rows)
+        ])
 
-    for item in order_items:
-        item.order_id = new_order.id
-        db.add(item)
+        db.execute(
+            delete(CartItem)
+            .where(CartItem.cart_id == cart_rows[0].cart_id)
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
 
-    db.query(CartItem).filter(CartItem.cart_id == cart.id).delete()
+    # Stock levels are part of the cached catalog responses.
+    catalog_cache.invalidate_products(item["product_id"] for item in order_items)
 
-    db.commit()
     db.refresh(new_order)
-    return new_order
\ No newline at end of file
+    return new_order
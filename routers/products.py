@@ -1,16 +1,85 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session, joinedload
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import false, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 from typing import Optional, List
-from database import get_db
+from database import get_async_db, async_engine
+from config import settings
 from models.product import Product, ProductImage, product_categories
 from models.category import Category
 from schemas.product import ProductResponse, ProductCreate, ProductUpdate, ProductFilter
+from schemas.category import CategoryResponse, CategoryWithChildren
+from utils.cache import catalog_cache
+from utils.categories import build_tree
+from utils.responses import FastJSONResponse
+from utils.pagination import decode_cursor, keyset_filter, split_page
+from utils.search import tokenize, search_clauses
 
 router = APIRouter(prefix="/api/products", tags=["Products"])
 
+# sort name -> (model attribute, descending)
+PRODUCT_SORTS = {
+    "id": ("id", False),
+    "price": ("price", False),
+    "-price": ("price", True),
+}
+
+
+async def category_tree(db: AsyncSession) -> dict:
+    """The whole category hierarchy from one query, cached until a category changes."""
+    async def load_tree():
+        rows = (await db.execute(
+            select(Category.id, Category.name, Category.parent_id, Category.path).order_by(Category.id)
+        )).all()
+        return build_tree(rows)
+
+    return await catalog_cache.aget_or_load(catalog_cache.CATEGORY_TREE_KEY, load_tree)
+
+
+async def category_filter_path(db: AsyncSession, category_id: Optional[int]) -> Optional[str]:
+    """Path of the category to filter by, or "" when that category does not exist."""
+    if not category_id:
+        return None
+    return (await category_tree(db))["paths"].get(str(category_id), "")
+
+
+def apply_product_filters(
+    query,
+    category_path: Optional[str] = None,
+    material: Optional[str] = None,
+    min_price: Optional[float] = None,
+    max_price: Optional[float] = None,
+    karat: Optional[str] = None,
+):
+    if category_path == "":
+        query = query.where(false())
+    elif category_path:
+        # Products in the category or any descendant; a semi-join, so a product
+        # linked to several categories of the subtree is listed once.
+        query = query.where(Product.id.in_(
+            select(product_categories.c.product_id)
+            .join(Category, Category.id == product_categories.c.category_id)
+            .where(Category.path.like(f"{category_path}%"))
+        ))
+
+    if material:
+        query = query.where(Product.material.ilike(f"%{material}%"))
+
+    if min_price is not None:
+        query = query.where(Product.price >= min_price)
+
+    if max_price is not None:
+        query = query.where(Product.price <= max_price)
+
+    if karat:
+        query = query.where(Product.karat == karat)
+
+    return query
+
 
 @router.get("/", response_model=List[ProductResponse])
-def get_products(
+async def get_products(
+    response: Response,
     category_id: Optional[int] = Query(None),
     material: Optional[str] = Query(None),
     min_price: Optional[float] = Query(None),
@@ -18,43 +87,126 @@ def get_products(
     karat: Optional[str] = Query(None),
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
-    db: Session = Depends(get_db),
+    sort: str = Query("id", pattern="^(id|price|-price)$"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous X-Next-Cursor header"),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    query = db.query(Product).options(joinedload(Product.images))
+    cache_key = await catalog_cache.aproduct_list_key(
+        category_id=category_id,
+        material=material,
+        min_price=min_price,
+        max_price=max_price,
+        karat=karat,
+        skip=0 if cursor else skip,
+        limit=limit,
+        sort=sort,
+        cursor=cursor,
+    )
 
-    if category_id:
-        query = query.join(product_categories).filter(product_categories.c.category_id == category_id)
+    async def load_page():
+        # Images are fetched with a second IN (...) query so LIMIT applies to products, not image rows.
+        query = apply_product_filters(
+            select(Product).options(selectinload(Product.images)),
+            await category_filter_path(db, category_id), material, min_price, max_price, karat,
+        )
 
-    if material:
-        query = query.filter(Product.material.ilike(f"%{material}%"))
+        sort_attr, descending = PRODUCT_SORTS[sort]
+        sort_column = getattr(Product, sort_attr)
 
-    if min_price is not None:
-        query = query.filter(Product.price >= min_price)
+        if descending:
+            query = query.order_by(sort_column.desc(), Product.id.desc())
+        elif sort_column is Product.id:
+            query = query.order_by(Product.id)
+        else:
+            query = query.order_by(sort_column, Product.id)
 
-    if max_price is not None:
-        query = query.filter(Product.price <= max_price)
+        if cursor:
+            value, last_id = decode_cursor(cursor, sort)
+            query = query.where(keyset_filter(sort_column, Product.id, value, last_id, descending))
+        elif skip:
+            query = query.offset(skip)
 
-    if karat:
-        query = query.filter(Product.karat == karat)
+        rows = (await db.scalars(query.limit(limit + 1))).all()
+        products, next_cursor = split_page(rows, limit, sort, sort_attr)
+        return {
+            "items": [ProductResponse.model_validate(p).model_dump(mode="json") for p in products],
+            "next_cursor": next_cursor,
+        }
 
-    products = query.offset(skip).limit(limit).all()
-    return products
+    page = await catalog_cache.aget_or_load(cache_key, load_page)
+    headers = {"X-Next-Cursor": page["next_cursor"]} if page["next_cursor"] else {}
+    if settings.FAST_JSON_RESPONSES:
+        # Cached items are already ProductResponse dumps; skip re-validating them.
+        return FastJSONResponse(page["items"], headers=headers)
+    response.headers.update(headers)
+    return page["items"]
 
 
-@router.get("/{product_id}", response_model=ProductResponse)
-def get_product(product_id: int, db: Session = Depends(get_db)):
-    product = (
-        db.query(Product)
-        .options(joinedload(Product.images))
-        .filter(Product.id == product_id)
-        .first()
+@router.get("/search", response_model=List[ProductResponse])
+async def search_products(
+    q: str = Query(..., min_length=1, max_length=200),
+    category_id: Optional[int] = Query(None),
+    min_price: Optional[float] = Query(None),
+    max_price: Optional[float] = Query(None),
+    karat: Optional[str] = Query(None),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db),
+):
+    terms = tokenize(q)
+    if not terms:
+        return []
+
+    cache_key = await catalog_cache.aproduct_list_key(
+        search=" ".join(terms),
+        category_id=category_id,
+        min_price=min_price,
+        max_price=max_price,
+        karat=karat,
+        skip=skip,
+        limit=limit,
     )
+
+    async def load_results():
+        matched, relevance = search_clauses(async_engine.dialect.name, terms)
+        query = apply_product_filters(
+            select(Product).options(selectinload(Product.images)).where(matched),
+            await category_filter_path(db, category_id), None, min_price, max_price, karat,
+        )
+        query = query.order_by(relevance.desc(), Product.id).offset(skip).limit(limit)
+        products = (await db.scalars(query)).all()
+        return [ProductResponse.model_validate(p).model_dump(mode="json") for p in products]
+
+    return await catalog_cache.aget_or_load(cache_key, load_results)
+
+
+@router.get("/{product_id}", response_model=ProductResponse)
+async def get_product(product_id: int, db: AsyncSession = Depends(get_async_db)):
+    async def load_product():
+        product = await db.scalar(
+            select(Product)
+            .options(selectinload(Product.images))
+            .where(Product.id == product_id)
+        )
+        if not product:
+            return None
+        return ProductResponse.model_validate(product).model_dump(mode="json")
+
+    product = await catalog_cache.aget_or_load(catalog_cache.product_key(product_id), load_product)
     if not product:
         raise HTTPException(status_code=404, detail="Product not found")
     return product
 
 
-@router.get("/categories/", tags=["Categories"])
-def get_categories(db: Session = Depends(get_db)):
-    categories = db.query(Category).all()
-    return categories
\ No newline at end of file
+@router.get("/categories/", response_model=List[CategoryResponse], tags=["Categories"])
+async def get_categories(db: AsyncSession = Depends(get_async_db)):
+    async def load_categories():
+        categories = (await db.scalars(select(Category))).all()
+        return [CategoryResponse.model_validate(c).model_dump(mode="json") for c in categories]
+
+    return await catalog_cache.aget_or_load(catalog_cache.CATEGORIES_KEY, load_categories)
+
+
+@router.get("/categories/tree", response_model=List[CategoryWithChildren], tags=["Categories"])
+async def get_category_tree(db: AsyncSession = Depends(get_async_db)):
+    return (await category_tree(db))["roots"]
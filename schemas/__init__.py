@@ -1,4 +1,4 @@
-from schemas.user import UserCreate, UserResponse, UserLogin, Token, TokenData
+from schemas.user import UserCreate, UserResponse, UserLogin, Token, TokenData, Principal
 from schemas.product import (
     ProductCreate,
     ProductUpdate,
@@ -6,6 +6,9 @@ from schemas.product import (
     ProductImageCreate,
     ProductImageResponse,
     ProductFilter,
+    ProductImportRow,
+    ProductImportError,
+    ProductImportReport,
 )
 from schemas.cart import CartResponse, CartItemCreate, CartItemResponse, CartItemUpdate
 from schemas.order import (
@@ -16,7 +19,9 @@ from schemas.order import (
 )
 from schemas.design import (
     DesignInput,
+    DesignGenerateRequest,
     DesignResponse,
+    DesignVariant,
     DesignRequestCreate,
     DesignRequestResponse,
     DesignRequestUpdate,
@@ -24,6 +29,15 @@ from schemas.design import (
 from schemas.category import CategoryCreate, CategoryResponse
 from schemas.payment import PaymentMethodCreate, PaymentMethodResponse
 from schemas.jeweler import JewelerCreate, JewelerResponse
+from schemas.media import ImageVariants
+from schemas.analytics import (
+    RevenuePoint,
+    ProductSales,
+    JewelerSales,
+    ConversionPoint,
+    ConversionReport,
+    LowStockProduct,
+)
 
 __all__ = [
     "UserCreate",
@@ -31,12 +45,16 @@ __all__ = [
     "UserLogin",
     "Token",
     "TokenData",
+    "Principal",
     "ProductCreate",
     "ProductUpdate",
     "ProductResponse",
     "ProductImageCreate",
     "ProductImageResponse",
     "ProductFilter",
+    "ProductImportRow",
+    "ProductImportError",
+    "ProductImportReport",
     "CartResponse",
     "CartItemCreate",
     "CartItemResponse",
@@ -46,7 +64,9 @@ __all__ = [
     "OrderItemResponse",
     "OrderStatusUpdate",
     "DesignInput",
+    "DesignGenerateRequest",
     "DesignResponse",
+    "DesignVariant",
     "DesignRequestCreate",
     "DesignRequestResponse",
     "DesignRequestUpdate",
@@ -56,4 +76,11 @@ __all__ = [
     "PaymentMethodResponse",
     "JewelerCreate",
     "JewelerResponse",
+    "ImageVariants",
+    "RevenuePoint",
+    "ProductSales",
+    "JewelerSales",
+    "ConversionPoint",
+    "ConversionReport",
+    "LowStockProduct",
 ]
\ No newline at end of file
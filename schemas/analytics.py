@@ -0,0 +1,51 @@
+from pydantic import BaseModel
+from typing import List, Optional
+from datetime import date
+
+
+class RevenuePoint(BaseModel):
+    period_start: date
+    order_count: int
+    units: int
+    revenue: float
+    cancelled_orders: int
+    cancelled_revenue: float
+
+
+class ProductSales(BaseModel):
+    product_id: int
+    name: Optional[str] = None
+    jeweler_id: int
+    units: int
+    revenue: float
+
+
+class JewelerSales(BaseModel):
+    jeweler_id: int
+    name: Optional[str] = None
+    units: int
+    revenue: float
+
+
+class ConversionPoint(BaseModel):
+    day: date
+    carts_started: int
+    order_count: int
+    conversion_rate: Optional[float] = None
+
+
+class ConversionReport(BaseModel):
+    carts_started: int
+    order_count: int
+    conversion_rate: Optional[float] = None
+    days: List[ConversionPoint]
+
+
+class LowStockProduct(BaseModel):
+    id: int
+    name: str
+    jeweler_id: int
+    stock_quantity: int
+
+    class Config:
+        from_attributes = True
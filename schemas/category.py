@@ -19,7 +19,10 @@ class CategoryResponse(CategoryBase):
 
 
 class CategoryWithChildren(CategoryResponse):
-    children: List["CategoryResponse"] = []
+    children: List["CategoryWithChildren"] = []
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+CategoryWithChildren.model_rebuild()
\ No newline at end of file
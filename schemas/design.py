@@ -1,7 +1,8 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, computed_field
 from typing import Optional, Dict, Any
 from datetime import datetime
-from models.design import DesignRequestStatus
+from models.design import DesignRequestStatus, DesignGenerationStatus
+from schemas.media import ImageVariants, variants_for
 
 
 class DesignInput(BaseModel):
@@ -14,17 +15,40 @@ class DesignInput(BaseModel):
     gemstone_color: Optional[str] = Field(default=None, description="Color of the gemstone if applicable")
 
 
+class DesignGenerateRequest(DesignInput):
+    force_fresh: bool = Field(default=False, description="Always call the model instead of reusing a stored image")
+    variant_id: Optional[str] = Field(default=None, description="Reuse this variant from design-variants")
+
+
 class DesignResponse(BaseModel):
     id: int
     user_id: int
     selected_options: Optional[Dict[str, Any]] = None
     generated_image_url: Optional[str] = None
+    status: DesignGenerationStatus = DesignGenerationStatus.COMPLETED
+    error: Optional[str] = None
     created_at: Optional[datetime] = None
 
+    @computed_field
+    @property
+    def image_variants(self) -> Optional[ImageVariants]:
+        return variants_for(self.generated_image_url)
+
     class Config:
         from_attributes = True
 
 
+class DesignVariant(BaseModel):
+    """A stored image for some design options, without the design it came from."""
+    variant_id: str
+    generated_image_url: str
+
+    @computed_field
+    @property
+    def image_variants(self) -> Optional[ImageVariants]:
+        return variants_for(self.generated_image_url)
+
+
 class DesignRequestBase(BaseModel):
     description: Optional[str] = None
     attachment_url: Optional[str] = None
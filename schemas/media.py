@@ -0,0 +1,14 @@
+from pydantic import BaseModel
+from typing import Dict, Optional
+from utils.images import image_variants
+
+
+class ImageVariants(BaseModel):
+    thumbnail: str
+    webp: Dict[int, str]
+    jpeg: Dict[int, str]
+
+
+def variants_for(image_path: Optional[str]) -> Optional[ImageVariants]:
+    variants = image_variants(image_path)
+    return ImageVariants(**variants) if variants else None
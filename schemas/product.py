@@ -1,6 +1,7 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, computed_field
 from typing import Optional, List
 from datetime import datetime
+from schemas.media import ImageVariants, variants_for
 
 
 class ProductImageBase(BaseModel):
@@ -16,11 +17,17 @@ class ProductImageResponse(ProductImageBase):
     id: int
     product_id: int
 
+    @computed_field
+    @property
+    def image_variants(self) -> Optional[ImageVariants]:
+        return variants_for(self.image_path)
+
     class Config:
         from_attributes = True
 
 
 class ProductBase(BaseModel):
+    sku: Optional[str] = Field(None, max_length=64)
     name: str
     material: Optional[str] = None
     karat: Optional[str] = None
@@ -37,6 +44,7 @@ class ProductCreate(ProductBase):
 
 
 class ProductUpdate(BaseModel):
+    sku: Optional[str] = Field(None, max_length=64)
     name: Optional[str] = None
     material: Optional[str] = None
     karat: Optional[str] = None
@@ -48,11 +56,54 @@ class ProductUpdate(BaseModel):
     category_ids: Optional[List[int]] = None
 
 
+class ProductImportRow(BaseModel):
+    """One CSV or NDJSON row of a bulk import, matched on (jeweler_id, sku).
+
+    Everything but the key is optional so rows can update a few columns of
+    existing products; name and price are checked for new products. Lengths
+    mirror the column sizes so a bad row fails alone instead of its batch.
+    """
+
+    jeweler_id: int
+    sku: str = Field(..., min_length=1, max_length=64)
+    name: Optional[str] = Field(None, min_length=1, max_length=200)
+    material: Optional[str] = Field(None, max_length=50)
+    karat: Optional[str] = Field(None, max_length=10)
+    weight: Optional[float] = None
+    price: Optional[float] = Field(None, ge=0)
+    stock_quantity: Optional[int] = Field(None, ge=0)
+    description: Optional[str] = None
+    image_path: Optional[str] = Field(None, max_length=255)
+    category_ids: Optional[List[int]] = None
+
+
+class ProductImportError(BaseModel):
+    row: int
+    sku: Optional[str] = None
+    errors: List[str]
+
+
+class ProductImportReport(BaseModel):
+    rows: int
+    created: int
+    updated: int
+    merged: int
+    failed: int
+    errors: List[ProductImportError]
+    errors_truncated: bool
+    seconds: float
+
+
 class ProductResponse(ProductBase):
     id: int
     jeweler_id: int
     images: List[ProductImageResponse] = []
 
+    @computed_field
+    @property
+    def image_variants(self) -> Optional[ImageVariants]:
+        return variants_for(self.image_path)
+
     class Config:
         from_attributes = True
 
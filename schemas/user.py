@@ -44,4 +44,9 @@ class Token(BaseModel):
 
 class TokenData(BaseModel):
     username: Optional[str] = None
-    user_id: Optional[int] = None
\ No newline at end of file
+    user_id: Optional[int] = None
+
+
+class Principal(BaseModel):
+    id: int
+    username: str
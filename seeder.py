@@ -3,16 +3,23 @@ import os
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from sqlalchemy import text
-from database import engine, SessionLocal, Base
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+from itertools import islice
+from sqlalchemy import Table, func, insert, select, text
+from database import engine, SessionLocal, Base, init_db
 from models.user import User
 from models.jeweler import Jeweler
 from models.category import Category
 from models.payment import PaymentMethod
 from models.product import Product, ProductImage, product_categories
 from models.cart import Cart, CartItem
-from models.order import Order, OrderItem
-from models.design import UserGeneratedDesign, DesignRequest
+from models.order import Order, OrderItem, OrderStatus
+from models.design import UserGeneratedDesign, DesignRequest, DesignRequestStatus, DesignGenerationStatus
+from utils.analytics import rebuild_rollups
+from utils.design_cache import options_hash
 from utils.security import get_password_hash
 
 
@@ -21,6 +28,8 @@ def clear_database():
     db = SessionLocal()
     try:
         tables = [
+            "daily_product_sales",
+            "daily_sales",
             "design_requests",
             "user_generated_designs",
             "order_items",
@@ -35,10 +44,15 @@ def clear_database():
             "jewelers",
             "users",
         ]
-        for table in tables:
-            db.execute(text(f"SET FOREIGN_KEY_CHECKS = 0"))
-            db.execute(text(f"TRUNCATE TABLE {table}"))
-            db.execute(text(f"SET FOREIGN_KEY_CHECKS = 1"))
+        if db.get_bind().dialect.name == "mysql":
+            db.execute(text("SET FOREIGN_KEY_CHECKS = 0"))
+            for table in tables:
+                db.execute(text(f"TRUNCATE TABLE {table}"))
+            db.execute(text("SET FOREIGN_KEY_CHECKS = 1"))
+        else:
+            # Children first, so foreign keys hold throughout.
+            for table in tables:
+                db.execute(text(f"DELETE FROM {table}"))
         db.commit()
         print("Database cleared successfully!")
     except Exception as e:
@@ -50,6 +64,8 @@ def clear_database():
 
 def seed_users(db):
     print("Seeding users...")
+    # PBKDF2 is deliberately slow; the sample users share one password, so hash it once.
+    sample_password = get_password_hash("password123")
     users = [
         User(
             username="admin",
@@ -63,7 +79,7 @@ def seed_users(db):
         User(
             username="john_doe",
             email="john@example.com",
-            password=get_password_hash("password123"),
+            password=sample_password,
             first_name="John",
             last_name="Doe",
             phone="+1987654321",
@@ -72,7 +88,7 @@ def seed_users(db):
         User(
             username="jane_smith",
             email="jane@example.com",
-            password=get_password_hash("password123"),
+            password=sample_password,
             first_name="Jane",
             last_name="Smith",
             phone="+1555666777",
@@ -81,7 +97,7 @@ def seed_users(db):
         User(
             username="mohammed_ali",
             email="mohammed@example.com",
-            password=get_password_hash("password123"),
+            password=sample_password,
             first_name="Mohammed",
             last_name="Ali",
             phone="+966501234567",
@@ -90,7 +106,7 @@ def seed_users(db):
         User(
             username="sarah_wilson",
             email="sarah@example.com",
-            password=get_password_hash("password123"),
+            password=sample_password,
             first_name="Sarah",
             last_name="Wilson",
             phone="+1444555666",
@@ -360,8 +376,8 @@ def run_seeder():
     print("Starting Database Seeding...")
     print("=" * 50)
 
-    print("Creating database tables...")
-    Base.metadata.create_all(bind=engine)
+    print("Applying database migrations...")
+    init_db()
     print("Tables created successfully!")
 
     clear_database()
@@ -402,5 +418,233 @@ def run_seeder():
         db.close()
 
 
+GENERATED_PASSWORD = "password123"
+MATERIALS = [("Gold", "18k"), ("Gold", "21k"), ("Gold", "22k"), ("Silver", "925"), ("Platinum", "950"), ("Rose Gold", "18k")]
+PRODUCT_TYPES = ["Ring", "Necklace", "Bracelet", "Pendant", "Chain", "Earrings", "Band"]
+# Weighted towards orders that have run their course, as in a store with history.
+ORDER_STATUSES = [OrderStatus.DELIVERED] * 6 + [OrderStatus.SHIPPED] * 2 + [
+    OrderStatus.PROCESSING,
+    OrderStatus.PENDING,
+    OrderStatus.CANCELLED,
+]
+DESIGN_OPTIONS = {
+    "type": ["Ring", "Necklace", "Bracelet", "Earrings"],
+    "color": ["Gold", "Silver", "Rose Gold", "White Gold"],
+    "shape": ["Round", "Oval", "Square", "Heart"],
+    "material": ["Gold", "Silver", "Platinum"],
+    "karat": ["18k", "21k", "22k"],
+}
+
+
+def next_id(connection, model) -> int:
+    return (connection.execute(select(func.max(model.id))).scalar() or 0) + 1
+
+
+def insert_batches(connection, model, rows, batch_size: int) -> int:
+    """executemany-insert rows in batches, committing each; returns the row count."""
+    table = model if isinstance(model, Table) else model.__table__
+    count = 0
+    for batch in iter(lambda: list(islice(rows, batch_size)), []):
+        connection.execute(insert(table), batch)
+        connection.commit()
+        count += len(batch)
+    return count
+
+
+def generate_dataset(users, jewelers, products, orders, designs, seed=42, days=365, batch_size=5000):
+    """Bulk-generate a reproducible load-test dataset on top of the sample data.
+
+    Rows carry explicit ids, so foreign keys are computed rather than read back,
+    and every table is written with batched executemany inserts.
+    """
+    rng = random.Random(seed)
+    now = datetime.utcnow().replace(microsecond=0)
+    started = time.perf_counter()
+
+    with engine.connect() as connection:
+        if connection.dialect.name == "mysql":
+            # Every reference points at a row written earlier in this run; skip the lookups.
+            connection.execute(text("SET FOREIGN_KEY_CHECKS = 0"))
+        password = get_password_hash(GENERATED_PASSWORD)
+        category_ids = list(connection.execute(select(Category.id)).scalars())
+        payment_ids = list(connection.execute(select(PaymentMethod.id)).scalars())
+
+        def report(label, count):
+            print(f"  {label:<24} {count:>10,}  ({time.perf_counter() - started:.1f} s)")
+
+        first_user = next_id(connection, User)
+        report("users", insert_batches(connection, User, (
+            {
+                "id": first_user + i,
+                "username": f"user{first_user + i}",
+                "email": f"user{first_user + i}@example.com",
+                "password": password,
+                "first_name": f"First{i}",
+                "last_name": f"Last{i}",
+                "address": f"{rng.randint(1, 9999)} Load Test Street",
+                "created_at": now - timedelta(days=rng.uniform(0, days)),
+            }
+            for i in range(users)
+        ), batch_size))
+
+        first_jeweler = next_id(connection, Jeweler)
+        report("jewelers", insert_batches(connection, Jeweler, (
+            {
+                "id": first_jeweler + i,
+                "name": f"Jeweler {first_jeweler + i}",
+                "shop_name": f"Workshop {first_jeweler + i}",
+                "rating": round(rng.uniform(3.5, 5.0), 1),
+            }
+            for i in range(jewelers)
+        ), batch_size))
+
+        first_product = next_id(connection, Product)
+        prices = [round(rng.uniform(50, 5000), 2) for _ in range(products)]
+
+        def product_rows():
+            for i in range(products):
+                material, karat = rng.choice(MATERIALS)
+                kind = rng.choice(PRODUCT_TYPES)
+                yield {
+                    "id": first_product + i,
+                    "jeweler_id": first_jeweler + rng.randrange(jewelers),
+                    "sku": f"GEN-{first_product + i}",
+                    "name": f"{material} {kind} {first_product + i}",
+                    "material": material,
+                    "karat": karat,
+                    "weight": round(rng.uniform(1, 30), 2),
+                    "price": prices[i],
+                    "stock_quantity": rng.randint(0, 50),
+                    "description": f"{karat} {material.lower()} {kind.lower()}, generated for load testing.",
+                    "image_path": f"/static/products/{kind.lower()}.jpg",
+                }
+
+        report("products", insert_batches(connection, Product, product_rows(), batch_size))
+        report("product categories", insert_batches(connection, product_categories, (
+            {"product_id": first_product + i, "category_id": category_id}
+            for i in range(products)
+            for category_id in rng.sample(category_ids, min(len(category_ids), rng.randint(1, 2)))
+        ), batch_size))
+
+        # Order dates rise with ids over the last `days` days, like a real history.
+        first_order = next_id(connection, Order)
+        first_item = next_id(connection, OrderItem)
+        span = timedelta(days=days)
+
+        def order_rows():
+            item_id = first_item
+            for i in range(orders):
+                order_id = first_order + i
+                total = 0.0
+                items = []
+                for index in rng.sample(range(products), min(products, rng.choices((1, 2, 3, 4), (50, 30, 15, 5))[0])):
+                    quantity = rng.choices((1, 2, 3), (80, 15, 5))[0]
+                    subtotal = round(prices[index] * quantity, 2)
+                    total += subtotal
+                    items.append({
+                        "id": item_id,
+                        "order_id": order_id,
+                        "product_id": first_product + index,
+                        "quantity": quantity,
+                        "unit_price": prices[index],
+                        "subtotal": subtotal,
+                    })
+                    item_id += 1
+                order = {
+                    "id": order_id,
+                    "user_id": first_user + rng.randrange(users),
+                    "payment_method_id": rng.choice(payment_ids) if payment_ids else None,
+                    "order_date": now - span + span * (i + rng.random()) / orders,
+                    "status": rng.choice(ORDER_STATUSES),
+                    "total_amount": round(total, 2),
+                    "shipping_address": f"{rng.randint(1, 9999)} Load Test Street",
+                }
+                yield order, items
+
+        order_count = item_count = 0
+        rows = order_rows()
+        # Orders and their items are committed together, a batch of orders at a time.
+        for batch in iter(lambda: list(islice(rows, batch_size)), []):
+            items = [item for _, order_items in batch for item in order_items]
+            connection.execute(insert(Order.__table__), [order for order, _ in batch])
+            connection.execute(insert(OrderItem.__table__), items)
+            connection.commit()
+            order_count += len(batch)
+            item_count += len(items)
+        report("orders", order_count)
+        report("order items", item_count)
+
+        first_design = next_id(connection, UserGeneratedDesign)
+
+        def design_rows():
+            for i in range(designs):
+                options = {name: rng.choice(values) for name, values in DESIGN_OPTIONS.items()}
+                yield {
+                    "id": first_design + i,
+                    "user_id": first_user + rng.randrange(users),
+                    "selected_options": options,
+                    "options_hash": options_hash(options),
+                    "generated_image_url": "/static/generated_designs/sample.png",
+                    "status": DesignGenerationStatus.COMPLETED,
+                    "created_at": now - span + span * (i + rng.random()) / designs,
+                }
+
+        report("generated designs", insert_batches(connection, UserGeneratedDesign, design_rows(), batch_size))
+        # Every other design is sent to a jeweler as a custom request.
+        report("design requests", insert_batches(connection, DesignRequest, (
+            {
+                "user_id": first_user + rng.randrange(users),
+                "jeweler_id": first_jeweler + rng.randrange(jewelers),
+                "generated_design_id": first_design + i,
+                "request_date": now - span + span * (i + rng.random()) / designs,
+                "description": "Custom piece based on my generated design",
+                "estimated_budget": round(rng.uniform(200, 10000), 2),
+                "status": rng.choice(list(DesignRequestStatus)),
+            }
+            for i in range(0, designs, 2)
+        ), batch_size))
+
+        rebuild_rollups(connection)
+        connection.commit()
+        print(f"  analytics rollups rebuilt  ({time.perf_counter() - started:.1f} s)")
+        if connection.dialect.name == "mysql":
+            connection.execute(text("SET FOREIGN_KEY_CHECKS = 1"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Seed the database with sample data.")
+    parser.add_argument(
+        "--generate",
+        action="store_true",
+        help="also bulk-generate a load-test dataset (set DATABASE_URL to target SQLite or MySQL)",
+    )
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--jewelers", type=int, default=200)
+    parser.add_argument("--products", type=int, default=50000)
+    parser.add_argument("--orders", type=int, default=1000000)
+    parser.add_argument("--designs", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=42, help="random seed; the same seed gives the same rows, dated relative to today")
+    parser.add_argument("--days", type=int, default=365, help="spread orders and designs over this many days")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    args = parser.parse_args()
+    if args.generate and min(args.users, args.jewelers, args.products) < 1:
+        parser.error("--users, --jewelers and --products must be at least 1")
+
+    run_seeder()
+    if args.generate:
+        print("Generating load-test dataset...")
+        generate_dataset(
+            args.users,
+            args.jewelers,
+            args.products,
+            args.orders,
+            args.designs,
+            seed=args.seed,
+            days=args.days,
+            batch_size=args.batch_size,
+        )
+        print(f"Generated users log in with password {GENERATED_PASSWORD!r}")
+
+
 if __name__ == "__main__":
-    run_seeder()
\ No newline at end of file
+    main()
\ No newline at end of file
@@ -0,0 +1,92 @@
+import os
+import tempfile
+
+# Configure before the app is imported: settings are read once, at import time.
+WORKDIR = tempfile.mkdtemp(prefix="jewelry-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{WORKDIR}/test.db"
+os.environ["ASYNC_DATABASE_URL"] = ""
+# Cached responses would hide the statements the tests count.
+os.environ["CATALOG_CACHE_TTL"] = "0"
+os.environ["CATALOG_CACHE_URL"] = ""
+os.environ["PASSWORD_HASH_ITERATIONS"] = "1000"
+os.environ["AI_MODEL_BACKEND"] = "fake"
+# Relative paths (static/, .env) resolve inside the scratch directory.
+os.chdir(WORKDIR)
+os.makedirs("static", exist_ok=True)
+
+import itertools
+import pytest
+from fastapi.testclient import TestClient
+from database import SessionLocal
+from models import Jeweler, Product, ProductImage
+
+_usernames = itertools.count(1)
+
+
+@pytest.fixture(scope="session")
+def client():
+    import main
+
+    with TestClient(main.app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def make_user(client):
+    """Register a new user and return their Bearer headers."""
+    def make() -> dict:
+        username = f"user{next(_usernames)}"
+        response = client.post(
+            "/api/auth/register",
+            json={"username": username, "email": f"{username}@example.com", "password": "secret"},
+        )
+        assert response.status_code == 201, response.text
+        token = client.post("/api/auth/login", json={"username": username, "password": "secret"}).json()
+        return {"Authorization": f"Bearer {token['access_token']}"}
+
+    return make
+
+
+@pytest.fixture
+def auth_headers(make_user):
+    """Bearer headers for a newly registered user, so each test starts with an empty cart."""
+    return make_user()
+
+
+@pytest.fixture
+def make_products(client):
+    def make(count: int, **fields) -> list:
+        """Create count products; fields override the defaults below for every product."""
+        db = SessionLocal()
+        try:
+            jeweler = Jeweler(name="Test Jeweler")
+            db.add(jeweler)
+            db.flush()
+            products = [
+                Product(
+                    **{
+                        "jeweler_id": jeweler.id,
+                        "name": f"Ring {i}",
+                        "price": 100 + i,
+                        "stock_quantity": 50,
+                        "material": "Gold",
+                        "karat": "18k",
+                        **fields,
+                    }
+                )
+                for i in range(count)
+            ]
+            db.add_all(products)
+            db.flush()
+            # Two images each, so a lazy load of Product.images would show per product.
+            db.add_all(
+                ProductImage(product_id=product.id, image_path=f"products/{product.id}-{order}.jpg", display_order=order)
+                for product in products
+                for order in range(2)
+            )
+            db.commit()
+            return [product.id for product in products]
+        finally:
+            db.close()
+
+    return make
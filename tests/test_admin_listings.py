@@ -0,0 +1,105 @@
+import csv
+import io
+import json
+from datetime import date, timedelta
+from database import SessionLocal
+from models import User
+from models.design import DesignRequest, DesignRequestStatus
+
+
+def place_order(client, headers, product_ids) -> int:
+    for product_id in product_ids:
+        response = client.post("/api/cart/add", json={"product_id": product_id, "quantity": 1}, headers=headers)
+        assert response.status_code == 201, response.text
+    response = client.post("/api/orders/checkout", json={"shipping_address": "1 Test St"}, headers=headers)
+    assert response.status_code == 201, response.text
+    return response.json()["id"]
+
+
+def set_status(client, order_id: int, status: str) -> None:
+    response = client.put(f"/api/admin/orders/{order_id}/status", json={"status": status})
+    assert response.status_code == 200, response.text
+
+
+def walk_orders(client, **params) -> list:
+    ids, cursor = [], None
+    while True:
+        response = client.get("/api/admin/orders", params={**params, **({"cursor": cursor} if cursor else {})})
+        assert response.status_code == 200, response.text
+        ids.extend(order["id"] for order in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            return ids
+
+
+def test_orders_page_newest_first_by_status(client, auth_headers, make_products):
+    product_ids = make_products(3)
+    order_ids = [place_order(client, auth_headers, [product_id]) for product_id in product_ids]
+    for order_id in order_ids:
+        set_status(client, order_id, "shipped")
+
+    shipped = walk_orders(client, status="shipped", limit=2)
+
+    assert shipped == sorted(set(shipped), reverse=True)
+    assert set(order_ids) <= set(shipped)
+    assert not set(order_ids) & set(walk_orders(client, status="pending", limit=50))
+
+
+def test_orders_filter_by_date(client, auth_headers, make_products):
+    order_id = place_order(client, auth_headers, make_products(1))
+    today = date.today()
+
+    assert order_id in walk_orders(client, date_from=today.isoformat(), limit=500)
+    assert order_id not in walk_orders(client, date_to=(today - timedelta(days=2)).isoformat(), limit=500)
+
+
+def test_order_export_formats(client, auth_headers, make_products):
+    order_id = place_order(client, auth_headers, make_products(2))
+    set_status(client, order_id, "delivered")
+
+    response = client.get("/api/admin/orders/export", params={"status": "delivered"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    orders = {order["id"]: order for order in map(json.loads, response.text.splitlines())}
+    assert orders[order_id]["status"] == "delivered"
+    assert len(orders[order_id]["items"]) == 2
+
+    response = client.get("/api/admin/orders/export", params={"status": "delivered", "format": "csv"})
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = [row for row in csv.DictReader(io.StringIO(response.text)) if row["order_id"] == str(order_id)]
+    assert len(rows) == 2
+
+
+def test_forged_admin_cursor_is_rejected(client):
+    assert client.get("/api/admin/orders", params={"cursor": "bm9wZQ"}).status_code == 400
+
+
+def test_design_requests_list_and_export(client):
+    db = SessionLocal()
+    try:
+        user = User(username="requester", password="x", email="requester@example.com")
+        db.add(user)
+        db.flush()
+        requests = [
+            DesignRequest(user_id=user.id, description=f"Request {i}", status=status)
+            for i, status in enumerate([DesignRequestStatus.ACCEPTED] * 3 + [DesignRequestStatus.REJECTED])
+        ]
+        db.add_all(requests)
+        db.commit()
+        accepted = sorted((r.id for r in requests[:3]), reverse=True)
+    finally:
+        db.close()
+
+    first = client.get("/api/admin/design-requests", params={"status": "accepted", "limit": 2})
+    second = client.get(
+        "/api/admin/design-requests",
+        params={"status": "accepted", "limit": 2, "cursor": first.headers["X-Next-Cursor"]},
+    )
+    assert [item["id"] for item in first.json() + second.json()] == accepted
+    assert "X-Next-Cursor" not in second.headers
+
+    response = client.get("/api/admin/design-requests/export", params={"status": "accepted", "format": "csv"})
+    assert response.status_code == 200
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert sorted((int(row["id"]) for row in rows), reverse=True) == accepted
+    assert {row["status"] for row in rows} == {"accepted"}
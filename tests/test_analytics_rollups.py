@@ -0,0 +1,105 @@
+from datetime import date
+from sqlalchemy import select
+from database import SessionLocal
+from models.analytics import DailySales, DailyProductSales
+from models.order import Order
+from utils.analytics import _update_or_insert, daily_sales
+
+
+def place_order(client, headers, quantities: dict) -> int:
+    for product_id, quantity in quantities.items():
+        response = client.post("/api/cart/add", json={"product_id": product_id, "quantity": quantity}, headers=headers)
+        assert response.status_code == 201, response.text
+    response = client.post("/api/orders/checkout", json={"shipping_address": "1 Test St"}, headers=headers)
+    assert response.status_code == 201, response.text
+    return response.json()["id"]
+
+
+def set_status(client, order_id: int, status: str) -> None:
+    response = client.put(f"/api/admin/orders/{order_id}/status", json={"status": status})
+    assert response.status_code == 200, response.text
+
+
+def day_totals() -> dict:
+    """Every rollup row, as plain tuples."""
+    db = SessionLocal()
+    try:
+        return {
+            "days": {
+                row.day: (row.order_count, row.units, row.revenue, row.cancelled_orders, row.cancelled_revenue)
+                for row in db.scalars(select(DailySales))
+            },
+            "products": {
+                (row.day, row.product_id): (row.units, row.revenue)
+                for row in db.scalars(select(DailyProductSales))
+            },
+        }
+    finally:
+        db.close()
+
+
+def product_totals(product_ids) -> dict:
+    db = SessionLocal()
+    try:
+        rows = db.scalars(select(DailyProductSales).where(DailyProductSales.product_id.in_(product_ids)))
+        return {row.product_id: (row.units, row.revenue) for row in rows}
+    finally:
+        db.close()
+
+
+def order_day(order_id: int):
+    db = SessionLocal()
+    try:
+        return db.get(Order, order_id).order_date.date()
+    finally:
+        db.close()
+
+
+def test_checkout_and_cancel_move_the_rollups(client, auth_headers, make_products):
+    first, second = make_products(2)
+    before = day_totals()["days"]
+
+    order_id = place_order(client, auth_headers, {first: 2, second: 1})
+    day = order_day(order_id)
+    placed = day_totals()["days"][day]
+    previous = before.get(day, (0, 0, 0.0, 0, 0.0))
+
+    revenue = 2 * 100 + 101
+    assert placed[:3] == (previous[0] + 1, previous[1] + 3, previous[2] + revenue)
+    assert product_totals([first, second]) == {first: (2, 200), second: (1, 101)}
+
+    set_status(client, order_id, "cancelled")
+    cancelled = day_totals()["days"][day]
+    assert cancelled == (previous[0], previous[1], previous[2], previous[3] + 1, previous[4] + revenue)
+    assert product_totals([first, second]) == {first: (0, 0), second: (0, 0)}
+
+    # Moving between two non-cancelled states leaves the rollups alone.
+    set_status(client, order_id, "processing")
+    set_status(client, order_id, "shipped")
+    assert day_totals()["days"][day] == placed
+    assert product_totals([first, second]) == {first: (2, 200), second: (1, 101)}
+
+
+def test_rebuild_matches_the_incremental_rollups(client, auth_headers, make_products):
+    product_ids = make_products(3)
+    place_order(client, auth_headers, {product_ids[0]: 1, product_ids[1]: 2})
+    set_status(client, place_order(client, auth_headers, {product_ids[2]: 1}), "cancelled")
+    # A cancelled product's row stays at zero incrementally; a rebuild has no row at all.
+    incremental = day_totals()
+    incremental["products"] = {key: value for key, value in incremental["products"].items() if value != (0, 0)}
+
+    assert client.post("/api/admin/analytics/rebuild").status_code == 200
+
+    assert day_totals() == incremental
+
+
+def test_generic_increment_inserts_then_updates(client):
+    db = SessionLocal()
+    try:
+        keys = {"day": date(2000, 1, 1)}
+        for _ in range(2):
+            _update_or_insert(db, daily_sales, keys, {"carts_started": 1}, {**keys, "carts_started": 1})
+        assert db.get(DailySales, date(2000, 1, 1)).carts_started == 2
+    finally:
+        db.rollback()
+        db.close()
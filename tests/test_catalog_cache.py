@@ -0,0 +1,88 @@
+import pytest
+from utils.cache import _MISSING, CatalogCache, MemoryBackend, catalog_cache
+
+
+@pytest.fixture
+def live_cache(monkeypatch):
+    """Turn the app's catalog cache on (the suite runs with CATALOG_CACHE_TTL=0)."""
+    monkeypatch.setattr(catalog_cache, "backend", MemoryBackend(ttl=60))
+    monkeypatch.setattr(catalog_cache, "enabled", True)
+    return catalog_cache
+
+
+def test_memory_backend_evicts_least_recently_used():
+    backend = MemoryBackend(maxsize=2)
+    backend.set("a", 1)
+    backend.set("b", 2)
+    backend.get("a")
+    backend.set("c", 3)
+
+    assert (backend.get("a"), backend.get("c")) == (1, 3)
+    assert backend.get("b") is _MISSING and backend.evictions == 1
+
+
+def test_memory_backend_expires_entries(monkeypatch):
+    backend = MemoryBackend(ttl=10)
+    backend.set("a", 1)
+    monkeypatch.setattr("utils.cache.time.monotonic", lambda: float("inf"))
+
+    assert backend.get("a") is _MISSING
+    assert backend.size() == 0
+
+
+def test_loader_runs_once_per_key():
+    cache = CatalogCache(MemoryBackend())
+    calls = []
+
+    def load():
+        calls.append(1)
+        return {"value": len(calls)}
+
+    assert cache.get_or_load("key", load) == {"value": 1}
+    assert cache.get_or_load("key", load) == {"value": 1}
+    assert (len(calls), cache.hits, cache.misses) == (1, 1, 1)
+
+
+def test_value_loaded_across_an_invalidation_is_not_stored():
+    cache = CatalogCache(MemoryBackend())
+
+    def load_while_product_changes():
+        cache.invalidate_product(1)
+        return "stale"
+
+    assert cache.get_or_load(cache.product_key(1), load_while_product_changes) == "stale"
+    assert cache.get_or_load(cache.product_key(1), lambda: "fresh") == "fresh"
+
+
+def test_product_write_moves_list_keys_to_a_new_generation():
+    cache = CatalogCache(MemoryBackend())
+    before = cache.product_list_key(sort="id", limit=20)
+
+    cache.invalidate_products([1, 2])
+
+    assert cache.product_list_key(sort="id", limit=20) != before
+
+
+def test_admin_update_is_visible_through_the_cache(client, make_products, live_cache):
+    (product_id,) = make_products(1, material="Cached")
+    assert client.get(f"/api/products/{product_id}").json()["price"] == 100
+    assert [p["price"] for p in client.get("/api/products/", params={"material": "Cached"}).json()] == [100]
+    hits = live_cache.hits
+
+    assert client.get(f"/api/products/{product_id}").json()["price"] == 100
+    assert live_cache.hits == hits + 1
+
+    response = client.put(f"/api/admin/products/{product_id}", json={"price": 150})
+    assert response.status_code == 200, response.text
+
+    assert client.get(f"/api/products/{product_id}").json()["price"] == 150
+    assert [p["price"] for p in client.get("/api/products/", params={"material": "Cached"}).json()] == [150]
+
+
+def test_admin_delete_is_visible_through_the_cache(client, make_products, live_cache):
+    (product_id,) = make_products(1)
+    assert client.get(f"/api/products/{product_id}").status_code == 200
+
+    assert client.delete(f"/api/admin/products/{product_id}").status_code == 200
+
+    assert client.get(f"/api/products/{product_id}").status_code == 404
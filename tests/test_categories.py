@@ -0,0 +1,99 @@
+from database import SessionLocal
+from models.category import Category
+from utils.categories import compute_paths
+
+
+def create_category(client, name: str, parent_id: int = None) -> int:
+    response = client.post("/api/admin/categories", json={"name": name, "parent_id": parent_id})
+    assert response.status_code == 201, response.text
+    return response.json()["id"]
+
+
+def link(client, product_id: int, *category_ids) -> None:
+    response = client.put(f"/api/admin/products/{product_id}", json={"category_ids": list(category_ids)})
+    assert response.status_code == 200, response.text
+
+
+def listed(client, category_id: int) -> list:
+    response = client.get("/api/products/", params={"category_id": category_id, "limit": 100})
+    assert response.status_code == 200, response.text
+    return [product["id"] for product in response.json()]
+
+
+def find_node(nodes, category_id: int):
+    for node in nodes:
+        if node["id"] == category_id:
+            return node
+        found = find_node(node["children"], category_id)
+        if found is not None:
+            return found
+    return None
+
+
+def test_compute_paths_handles_orphans_and_cycles():
+    rows = [(1, None), (2, 1), (3, 2), (4, 99), (5, 6), (6, 5)]
+
+    assert compute_paths(rows) == {1: "1/", 2: "1/2/", 3: "1/2/3/", 4: "4/"}
+
+
+def test_tree_nests_children_under_their_parents(client):
+    root = create_category(client, "Necklaces")
+    child = create_category(client, "Chains", root)
+    grandchild = create_category(client, "Rope chains", child)
+
+    tree = client.get("/api/products/categories/tree").json()
+
+    node = find_node(tree, root)
+    assert node["parent_id"] is None and node in tree
+    assert [c["id"] for c in node["children"]] == [child]
+    assert [c["id"] for c in node["children"][0]["children"]] == [grandchild]
+
+
+def test_category_filter_includes_descendants(client, make_products):
+    root = create_category(client, "Rings")
+    child = create_category(client, "Bands", root)
+    grandchild = create_category(client, "Wedding bands", child)
+    sibling = create_category(client, "Earrings")
+    in_grandchild, in_child_and_grandchild, in_sibling = make_products(3)
+    link(client, in_grandchild, grandchild)
+    link(client, in_child_and_grandchild, child, grandchild)
+    link(client, in_sibling, sibling)
+
+    assert listed(client, root) == [in_grandchild, in_child_and_grandchild]
+    assert listed(client, child) == [in_grandchild, in_child_and_grandchild]
+    assert listed(client, grandchild) == [in_grandchild, in_child_and_grandchild]
+    assert listed(client, sibling) == [in_sibling]
+    assert listed(client, 10**6) == []
+
+
+def test_moving_a_subtree_rewrites_its_paths(client, make_products):
+    old_parent = create_category(client, "Bracelets")
+    new_parent = create_category(client, "Bangles")
+    moved = create_category(client, "Cuffs", old_parent)
+    below = create_category(client, "Open cuffs", moved)
+    (product_id,) = make_products(1)
+    link(client, product_id, below)
+
+    db = SessionLocal()
+    try:
+        db.get(Category, moved).parent_id = new_parent
+        db.commit()
+        paths = {c.id: c.path for c in db.query(Category).filter(Category.id.in_([moved, below]))}
+    finally:
+        db.close()
+
+    assert paths == {moved: f"{new_parent}/{moved}/", below: f"{new_parent}/{moved}/{below}/"}
+    assert listed(client, new_parent) == [product_id]
+    assert listed(client, old_parent) == []
+
+
+def test_deleting_a_parent_makes_its_children_roots(client):
+    parent = create_category(client, "Anklets")
+    child = create_category(client, "Beaded anklets", parent)
+    client.get("/api/products/categories/tree")
+
+    assert client.delete(f"/api/admin/categories/{parent}").status_code == 200
+
+    tree = client.get("/api/products/categories/tree").json()
+    assert find_node(tree, parent) is None
+    assert child in [node["id"] for node in tree]
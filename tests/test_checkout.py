@@ -0,0 +1,86 @@
+from database import SessionLocal
+from models import Order, Product
+from utils.cache import catalog_cache
+
+CHECKOUT = {"shipping_address": "1 Test St"}
+
+
+def add_to_cart(client, headers, product_id: int, quantity: int = 1) -> None:
+    response = client.post("/api/cart/add", json={"product_id": product_id, "quantity": quantity}, headers=headers)
+    assert response.status_code == 201, response.text
+
+
+def stock(product_id: int) -> int:
+    db = SessionLocal()
+    try:
+        return db.get(Product, product_id).stock_quantity
+    finally:
+        db.close()
+
+
+def order_count() -> int:
+    db = SessionLocal()
+    try:
+        return db.query(Order).count()
+    finally:
+        db.close()
+
+
+def test_checkout_decrements_stock_and_empties_the_cart(client, auth_headers, make_products):
+    first, second = make_products(2, stock_quantity=5)
+    add_to_cart(client, auth_headers, first, 2)
+    add_to_cart(client, auth_headers, second, 5)
+
+    response = client.post("/api/orders/checkout", json=CHECKOUT, headers=auth_headers)
+
+    assert response.status_code == 201, response.text
+    assert (stock(first), stock(second)) == (3, 0)
+    assert client.get("/api/cart/", headers=auth_headers).json()["items"] == []
+
+
+def test_last_piece_is_sold_once(client, make_user, make_products):
+    (product_id,) = make_products(1, stock_quantity=1)
+    first_buyer, second_buyer = make_user(), make_user()
+    add_to_cart(client, first_buyer, product_id)
+    add_to_cart(client, second_buyer, product_id)
+
+    assert client.post("/api/orders/checkout", json=CHECKOUT, headers=first_buyer).status_code == 201
+    orders = order_count()
+    response = client.post("/api/orders/checkout", json=CHECKOUT, headers=second_buyer)
+
+    assert response.status_code == 400
+    assert response.json()["detail"].startswith("Not enough stock")
+    assert stock(product_id) == 0
+    assert order_count() == orders
+
+
+def test_failed_checkout_rolls_back_earlier_decrements(client, auth_headers, make_products):
+    plentiful, scarce = make_products(2, stock_quantity=3)
+    add_to_cart(client, auth_headers, plentiful, 2)
+    add_to_cart(client, auth_headers, scarce, 3)
+    db = SessionLocal()
+    try:
+        db.get(Product, scarce).stock_quantity = 2
+        db.commit()
+    finally:
+        db.close()
+
+    response = client.post("/api/orders/checkout", json=CHECKOUT, headers=auth_headers)
+
+    assert response.status_code == 400
+    # The first product was decremented before the second failed; both roll back.
+    assert (stock(plentiful), stock(scarce)) == (3, 2)
+    assert len(client.get("/api/cart/", headers=auth_headers).json()["items"]) == 2
+
+
+def test_checkout_invalidates_the_cache_once(client, auth_headers, make_products, monkeypatch):
+    ids = make_products(3)
+    for product_id in ids:
+        add_to_cart(client, auth_headers, product_id)
+    batches = []
+    monkeypatch.setattr(catalog_cache, "invalidate_products", lambda product_ids: batches.append(list(product_ids)))
+
+    response = client.post("/api/orders/checkout", json=CHECKOUT, headers=auth_headers)
+
+    assert response.status_code == 201, response.text
+    assert batches == [ids]
@@ -0,0 +1,116 @@
+import gzip
+import zlib
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import Response, StreamingResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+import utils.compression
+from utils.compression import CompressionMiddleware, negotiate_encoding
+
+LARGE = b'{"items": "' + b"x" * 4096 + b'"}'
+
+
+def json_response(request):
+    return Response(LARGE, media_type="application/json", headers={"ETag": '"v1"'})
+
+
+def small_response(request):
+    return Response(b"{}", media_type="application/json")
+
+
+def image_response(request):
+    return Response(LARGE, media_type="image/png")
+
+
+def stream_response(request):
+    async def chunks():
+        for _ in range(3):
+            yield LARGE
+
+    return StreamingResponse(chunks(), media_type="application/x-ndjson")
+
+
+@pytest.fixture
+def compressed_client():
+    app = Starlette(routes=[
+        Route("/json", json_response),
+        Route("/small", small_response),
+        Route("/image", image_response),
+        Route("/stream", stream_response),
+    ])
+    app.add_middleware(CompressionMiddleware, minimum_size=1024)
+    return TestClient(app)
+
+
+def raw_get(client, path: str, accept_encoding: str):
+    """The response and its body as sent, before httpx decodes it."""
+    with client.stream("GET", path, headers={"Accept-Encoding": accept_encoding}) as response:
+        return response, b"".join(response.iter_raw())
+
+
+@pytest.mark.parametrize(
+    "header, with_brotli, expected",
+    [
+        ("gzip, deflate", False, "gzip"),
+        ("gzip;q=0", False, None),
+        ("identity", False, None),
+        ("*", False, "gzip"),
+        ("br, gzip", False, "gzip"),
+        ("br, gzip", True, "br"),
+        ("br;q=0.5, gzip", True, "gzip"),
+        ("*;q=0.1, gzip;q=0", True, "br"),
+        ("gzip;q=bogus", False, None),
+    ],
+)
+def test_negotiate_encoding(monkeypatch, header, with_brotli, expected):
+    monkeypatch.setattr(utils.compression, "brotli", object() if with_brotli else None)
+
+    assert negotiate_encoding(header) == expected
+
+
+def test_large_json_is_gzipped(compressed_client, monkeypatch):
+    monkeypatch.setattr(utils.compression, "brotli", None)
+
+    response, body = raw_get(compressed_client, "/json", "gzip")
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.headers["Content-Length"] == str(len(body))
+    assert "Accept-Encoding" in response.headers["Vary"]
+    # The compressed body differs byte for byte, so the validator becomes weak.
+    assert response.headers["ETag"] == 'W/"v1"'
+    assert gzip.decompress(body) == LARGE
+
+
+@pytest.mark.parametrize("path", ["/small", "/image"])
+def test_small_and_binary_responses_pass_through(compressed_client, path):
+    response, body = raw_get(compressed_client, path, "gzip")
+
+    assert "Content-Encoding" not in response.headers
+    assert body in (LARGE, b"{}")
+
+
+def test_without_accept_encoding_nothing_is_compressed(compressed_client):
+    response, body = raw_get(compressed_client, "/json", "identity")
+
+    assert "Content-Encoding" not in response.headers
+    assert body == LARGE
+
+
+def test_streamed_chunks_are_flushed(compressed_client, monkeypatch):
+    monkeypatch.setattr(utils.compression, "brotli", None)
+
+    response, body = raw_get(compressed_client, "/stream", "gzip")
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Content-Length" not in response.headers
+    assert zlib.decompress(body, 31) == LARGE * 3
+
+
+def test_brotli_when_installed(compressed_client):
+    brotli = pytest.importorskip("brotli")
+
+    response, body = raw_get(compressed_client, "/json", "br")
+
+    assert response.headers["Content-Encoding"] == "br"
+    assert brotli.decompress(body) == LARGE
@@ -0,0 +1,157 @@
+import asyncio
+import itertools
+import json
+import os
+from datetime import datetime, timedelta
+import pytest
+from config import settings
+from database import SessionLocal
+from models import User
+from models.design import UserGeneratedDesign, DesignGenerationStatus
+from routers import ai
+from routers.ai import ORPHANED_JOB_AGE, INTERRUPTED_ERROR, fail_orphaned_designs
+from utils.design_models import FakeDesignModel
+from utils.jobs import JobQueue, QueueFullError
+
+DESIGN = {"type": "Ring", "color": "Gold", "shape": "Round", "material": "Gold", "karat": "18k"}
+
+_designers = itertools.count(1)
+
+
+@pytest.fixture(autouse=True)
+def instant_model(monkeypatch):
+    monkeypatch.setattr(ai, "design_model", FakeDesignModel(latency=0, jitter=0, size=32))
+
+
+def make_designs(*created_ats, user_id: int = None) -> list:
+    """Pending designs, of a fresh user unless user_id is given; None keeps the database's created_at default."""
+    db = SessionLocal()
+    try:
+        if user_id is None:
+            username = f"designer{next(_designers)}"
+            user = User(username=username, password="x", email=f"{username}@example.com")
+            db.add(user)
+            db.flush()
+            user_id = user.id
+        designs = [
+            UserGeneratedDesign(
+                user_id=user_id,
+                status=DesignGenerationStatus.PENDING,
+                **({"created_at": created_at} if created_at is not None else {}),
+            )
+            for created_at in created_ats
+        ]
+        db.add_all(designs)
+        db.commit()
+        return [design.id for design in designs]
+    finally:
+        db.close()
+
+
+def design_status(design_id: int):
+    db = SessionLocal()
+    try:
+        design = db.get(UserGeneratedDesign, design_id)
+        return design.status, design.error
+    finally:
+        db.close()
+
+
+def read_events(client, job_id: int, headers) -> list:
+    with client.stream("GET", f"/api/ai/jobs/{job_id}/events", headers=headers) as response:
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        body = "".join(response.iter_text())
+    events = []
+    for block in body.strip().split("\n\n"):
+        name, data = block.split("\n")
+        events.append((name[len("event: "):], json.loads(data[len("data: "):])))
+    return events
+
+
+def test_queue_caps_concurrency_and_fails_abandoned_jobs():
+    async def scenario():
+        abandoned = []
+
+        async def record_abandoned(ids):
+            abandoned.extend(ids)
+
+        queue = JobQueue("test", concurrency=1, max_size=2, on_abandoned=record_abandoned)
+        await queue.start()
+        release = asyncio.Event()
+        queue.submit(1, release.wait)
+        await asyncio.sleep(0)
+        queue.submit(2, release.wait)
+        queue.submit(3, release.wait)
+        with pytest.raises(QueueFullError):
+            queue.submit(4, release.wait)
+        running, depth = queue.running, queue.depth()
+        await queue.stop()
+        return running, depth, abandoned, queue.stats()
+
+    running, depth, abandoned, stats = asyncio.run(scenario())
+
+    assert (running, depth) == (1, 2)
+    assert abandoned == [2, 3]
+    assert stats["rejected"] == 1
+
+
+def test_generated_design_streams_to_completion(client, auth_headers):
+    response = client.post("/api/ai/generate-design", json={**DESIGN, "force_fresh": True}, headers=auth_headers)
+    assert response.status_code == 202, response.text
+    job_id = response.json()["id"]
+
+    events = read_events(client, job_id, auth_headers)
+
+    assert {name for name, _ in events} == {"status"}
+    assert events[-1][1]["status"] == "completed"
+    job = client.get(f"/api/ai/jobs/{job_id}", headers=auth_headers).json()
+    assert job["status"] == "completed"
+    assert os.path.exists(job["generated_image_url"].lstrip("/"))
+
+
+def test_other_users_cannot_see_a_job(client, auth_headers):
+    (job_id,) = make_designs(None)
+
+    assert client.get(f"/api/ai/jobs/{job_id}", headers=auth_headers).status_code == 404
+    assert client.get(f"/api/ai/jobs/{job_id}/events", headers=auth_headers).status_code == 404
+
+
+def test_event_stream_ends_with_timeout(client, auth_headers, monkeypatch):
+    user_id = client.get("/api/auth/me", headers=auth_headers).json()["id"]
+    (job_id,) = make_designs(None, user_id=user_id)
+    monkeypatch.setattr(settings, "AI_JOB_EVENTS_MAX_SECONDS", 0)
+
+    events = read_events(client, job_id, auth_headers)
+
+    assert [(name, data["status"]) for name, data in events] == [("status", "pending"), ("timeout", "pending")]
+
+
+def test_full_queue_fails_the_design_with_503(client, auth_headers, monkeypatch):
+    def full(*args):
+        raise QueueFullError("full")
+
+    monkeypatch.setattr(ai.design_queue, "submit", full)
+
+    response = client.post("/api/ai/generate-design", json={**DESIGN, "force_fresh": True}, headers=auth_headers)
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "5"
+    user_id = client.get("/api/auth/me", headers=auth_headers).json()["id"]
+    db = SessionLocal()
+    try:
+        design = db.query(UserGeneratedDesign).filter(UserGeneratedDesign.user_id == user_id).one()
+    finally:
+        db.close()
+    assert (design.status, design.error) == (DesignGenerationStatus.FAILED, "Design queue is full")
+
+
+def test_orphan_sweep_fails_only_jobs_older_than_the_cutoff(client):
+    stale_id, young_id = make_designs(
+        datetime.utcnow() - timedelta(seconds=ORPHANED_JOB_AGE + 60), None
+    )
+
+    assert client.portal.call(fail_orphaned_designs) >= 1
+
+    assert design_status(stale_id) == (DesignGenerationStatus.FAILED, INTERRUPTED_ERROR)
+    assert design_status(young_id) == (DesignGenerationStatus.PENDING, None)
@@ -0,0 +1,108 @@
+from datetime import datetime, timedelta
+import pytest
+from config import settings
+from database import SessionLocal
+from models.design import UserGeneratedDesign, DesignGenerationStatus
+from utils.design_cache import find_variants, image_variant_id, options_hash
+
+
+def design_options(shape: str) -> dict:
+    return {"type": "Ring", "color": "Gold", "shape": shape, "material": "Gold", "karat": "18k"}
+
+
+def store_completed(client, headers, options: dict, image_url: str, age: timedelta = timedelta(0)) -> None:
+    user_id = client.get("/api/auth/me", headers=headers).json()["id"]
+    db = SessionLocal()
+    try:
+        db.add(UserGeneratedDesign(
+            user_id=user_id,
+            selected_options=options,
+            options_hash=options_hash(options),
+            generated_image_url=image_url,
+            status=DesignGenerationStatus.COMPLETED,
+            created_at=datetime.utcnow() - age,
+        ))
+        db.commit()
+    finally:
+        db.close()
+
+
+def test_options_hash_ignores_case_spacing_and_absent_gemstones():
+    options = {**design_options("Oval"), "gemstone_type": "None", "gemstone_color": "Red"}
+    respelled = {**design_options("  oval "), "material": "GOLD", "gemstone_type": None}
+
+    assert options_hash(options) == options_hash(respelled)
+    assert options_hash(options) != options_hash(design_options("Square"))
+
+
+def test_identical_request_reuses_a_stored_image(client, auth_headers, make_user):
+    options = design_options("Reuse heart")
+    store_completed(client, make_user(), options, "/static/generated_designs/reused.png")
+
+    response = client.post("/api/ai/generate-design", json=options, headers=auth_headers)
+
+    assert response.status_code == 200, response.text
+    assert response.json()["status"] == "completed"
+    assert response.json()["generated_image_url"] == "/static/generated_designs/reused.png"
+
+
+def test_variant_can_be_picked_by_id(client, auth_headers, make_user):
+    options = design_options("Reuse pear")
+    owner = make_user()
+    store_completed(client, owner, options, "/static/generated_designs/older.png", timedelta(hours=1))
+    store_completed(client, owner, options, "/static/generated_designs/newer.png")
+
+    variants = client.post("/api/ai/design-variants", json=options, headers=auth_headers).json()
+    assert [variant["generated_image_url"] for variant in variants] == [
+        "/static/generated_designs/newer.png", "/static/generated_designs/older.png",
+    ]
+
+    response = client.post(
+        "/api/ai/generate-design",
+        json={**options, "variant_id": image_variant_id("/static/generated_designs/older.png")},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200, response.text
+    assert response.json()["generated_image_url"] == "/static/generated_designs/older.png"
+
+    response = client.post("/api/ai/generate-design", json={**options, "variant_id": "0" * 16}, headers=auth_headers)
+    assert response.status_code == 404
+
+
+def test_force_fresh_skips_stored_images(client, auth_headers, make_user, monkeypatch):
+    options = design_options("Reuse cushion")
+    store_completed(client, make_user(), options, "/static/generated_designs/cushion.png")
+    submitted = []
+    monkeypatch.setattr("routers.ai.design_queue.submit", lambda job_id, run: submitted.append(job_id))
+
+    response = client.post("/api/ai/generate-design", json={**options, "force_fresh": True}, headers=auth_headers)
+
+    assert response.status_code == 202, response.text
+    assert submitted == [response.json()["id"]]
+
+
+def test_images_past_the_reuse_age_are_not_offered(client, make_user):
+    options = design_options("Reuse marquise")
+    headers = make_user()
+    age = timedelta(days=settings.AI_DESIGN_REUSE_MAX_AGE_DAYS, hours=1)
+    store_completed(client, headers, options, "/static/generated_designs/old.png", age)
+    store_completed(client, headers, options, "/static/generated_designs/recent.png", timedelta(days=1))
+
+    db = SessionLocal()
+    try:
+        urls = [design.generated_image_url for design in find_variants(db, options_hash(options))]
+    finally:
+        db.close()
+    assert urls == ["/static/generated_designs/recent.png"]
+
+
+@pytest.mark.parametrize("count", [1, 3])
+def test_variants_are_distinct_images(client, make_user, count):
+    options = design_options(f"Reuse emerald {count}")
+    headers = make_user()
+    for age in range(count):
+        store_completed(client, headers, options, "/static/generated_designs/same.png", timedelta(minutes=age))
+
+    variants = client.post("/api/ai/design-variants", json=options, headers=headers).json()
+
+    assert len(variants) == 1
@@ -0,0 +1,64 @@
+import asyncio
+import logging
+import time
+from utils.loop_monitor import EventLoopMonitor
+
+
+def block_the_loop(seconds: float) -> None:
+    time.sleep(seconds)
+
+
+def run_monitor(monitor: EventLoopMonitor, body) -> None:
+    async def scenario():
+        await monitor.start()
+        try:
+            await body()
+        finally:
+            await monitor.stop()
+
+    asyncio.run(scenario())
+
+
+def test_blocking_call_is_logged_with_its_stack(caplog):
+    monitor = EventLoopMonitor(interval=0.01, threshold=0.05)
+
+    async def body():
+        await asyncio.sleep(0.05)
+        block_the_loop(0.3)
+        await asyncio.sleep(0.05)
+
+    with caplog.at_level(logging.WARNING, logger="utils.loop_monitor"):
+        run_monitor(monitor, body)
+
+    assert monitor.stats()["stalls"] == 1
+    assert monitor.stats()["lag_max"] >= 0.2
+    [record] = caplog.records
+    assert "Event loop blocked" in record.getMessage()
+    assert "block_the_loop" in record.getMessage()
+
+
+def test_awaiting_does_not_count_as_a_stall(caplog):
+    monitor = EventLoopMonitor(interval=0.01, threshold=0.1)
+
+    async def body():
+        await asyncio.gather(*(asyncio.sleep(0.02) for _ in range(50)))
+        await asyncio.sleep(0.1)
+
+    with caplog.at_level(logging.WARNING, logger="utils.loop_monitor"):
+        run_monitor(monitor, body)
+
+    assert monitor.stats()["samples"] > 0
+    assert monitor.stats()["stalls"] == 0
+    assert caplog.records == []
+
+
+def test_zero_threshold_disables_the_monitor():
+    monitor = EventLoopMonitor(interval=0.01, threshold=0)
+
+    async def body():
+        await asyncio.sleep(0.05)
+
+    run_monitor(monitor, body)
+
+    assert monitor.stats()["enabled"] is False
+    assert monitor.stats()["samples"] == 0
@@ -0,0 +1,63 @@
+import io
+import os
+import threading
+from PIL import Image
+import utils.images
+
+
+def write_image(name: str, size=(600, 300)) -> str:
+    os.makedirs("static/products", exist_ok=True)
+    Image.new("RGB", size, (200, 150, 50)).save(os.path.join("static/products", name))
+    return f"products/{name}"
+
+
+def test_variant_is_resized_on_the_render_pool(client, monkeypatch):
+    relative = write_image("band.png")
+    threads = []
+    render = utils.images.render_variant
+
+    def recording_render(*args):
+        threads.append(threading.current_thread().name)
+        return render(*args)
+
+    monkeypatch.setattr(utils.images, "render_variant", recording_render)
+
+    response = client.get(f"/media/200/{relative}.webp")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "image/webp"
+    assert Image.open(io.BytesIO(response.content)).size == (200, 100)
+    assert os.path.exists(f"static/variants/200/{relative}.webp")
+    assert len(threads) == 1 and threads[0].startswith("image-render")
+
+    # Served from disk the second time.
+    assert client.get(f"/media/200/{relative}.webp").content == response.content
+    assert len(threads) == 1
+
+
+def test_jpeg_variant_of_a_transparent_image(client):
+    os.makedirs("static/products", exist_ok=True)
+    Image.new("RGBA", (800, 800), (0, 0, 0, 0)).save("static/products/clear.png")
+
+    response = client.get("/media/400/products/clear.png.jpg")
+
+    assert response.status_code == 200
+    assert Image.open(io.BytesIO(response.content)).mode == "RGB"
+
+
+def test_unknown_variants_are_not_found(client):
+    relative = write_image("stud.png")
+
+    assert client.get(f"/media/300/{relative}.webp").status_code == 404
+    assert client.get(f"/media/200/{relative}.gif").status_code == 404
+    assert client.get("/media/200/products/missing.png.webp").status_code == 404
+    # Clients normalize "..", so the traversal guard is checked directly.
+    assert utils.images.resolve_variant(200, "../outside.png.webp") is None
+
+
+def test_unreadable_source_is_unprocessable(client):
+    os.makedirs("static/products", exist_ok=True)
+    with open("static/products/broken.png", "wb") as f:
+        f.write(b"not a png")
+
+    assert client.get("/media/200/products/broken.png.webp").status_code == 422
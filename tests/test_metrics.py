@@ -0,0 +1,67 @@
+import re
+from config import settings
+from utils.metrics import RequestMetrics
+
+
+def metric(text: str, name: str, **labels) -> float:
+    """Value of the sample with exactly these labels, or 0 if it is absent."""
+    label_text = ",".join(f'{key}="{value}"' for key, value in labels.items())
+    match = re.search(rf"^{re.escape(name)}\{{{re.escape(label_text)}\}} (\S+)$", text, re.MULTILINE)
+    return float(match.group(1)) if match else 0.0
+
+
+def test_requests_are_labelled_by_route_template(client, make_products):
+    product_ids = make_products(2)
+    route = {"method": "GET", "route": "/api/products/{product_id}"}
+    before = client.get("/metrics").text
+
+    for product_id in product_ids:
+        assert client.get(f"/api/products/{product_id}").status_code == 200
+    assert client.get("/api/products/0").status_code == 404
+
+    after = client.get("/metrics").text
+    assert client.get("/metrics").headers["content-type"].startswith("text/plain; version=0.0.4")
+    count = "http_request_duration_seconds_count"
+    assert metric(after, count, **route) - metric(before, count, **route) == 3
+    responses = "http_responses_total"
+    assert metric(after, responses, **route, status=200) - metric(before, responses, **route, status=200) == 2
+    assert metric(after, responses, **route, status=404) - metric(before, responses, **route, status=404) == 1
+    statements = "http_request_db_statements_total"
+    assert metric(after, statements, **route) > metric(before, statements, **route)
+    assert f"/api/products/{product_ids[0]}" not in after
+
+
+def test_unknown_paths_share_one_label(client):
+    client.get("/no/such/path/1")
+    client.get("/no/such/path/2")
+
+    text = client.get("/metrics").text
+
+    assert metric(text, "http_responses_total", method="GET", route="unmatched", status=404) >= 2
+    assert "/no/such/path" not in text
+
+
+def test_histogram_buckets_are_cumulative():
+    metrics = RequestMetrics(buckets=(0.1, 1.0))
+    for seconds in (0.05, 0.5, 5.0):
+        metrics.started("GET", "/x")
+        metrics.finished("GET", "/x", 200, seconds, statements=1, db_seconds=0.01)
+
+    text = metrics.render()
+
+    bucket = "http_request_duration_seconds_bucket"
+    assert [metric(text, bucket, method="GET", route="/x", le=le) for le in ("0.1", "1.0", "+Inf")] == [1, 2, 3]
+    assert metric(text, "http_requests_in_flight", method="GET", route="/x") == 0
+    assert metric(text, "http_request_db_statements_total", method="GET", route="/x") == 3
+
+
+def test_timing_headers(client, make_products, monkeypatch):
+    (product_id,) = make_products(1)
+    monkeypatch.setattr(settings, "SERVER_TIMING_HEADER", True)
+    monkeypatch.setattr(settings, "QUERY_COUNT_HEADER", True)
+
+    response = client.get(f"/api/products/{product_id}")
+
+    assert re.fullmatch(r'app;dur=[\d.]+, db;desc="\d+ queries";dur=[\d.]+', response.headers["Server-Timing"])
+    assert response.headers["Timing-Allow-Origin"] == "*"
+    assert int(response.headers["X-Query-Count"]) >= 1
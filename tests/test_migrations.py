@@ -0,0 +1,80 @@
+from sqlalchemy import create_engine, inspect, text
+from migrations import discover_migrations, run_migrations
+from utils.design_cache import options_hash
+
+ALL_VERSIONS = [version for version, _ in discover_migrations()]
+
+# What migrations after 0001 added to a database that create_all built before them.
+LATER_INDEXES = {
+    "products": [
+        "ix_products_price_id", "ix_products_karat_price", "ix_products_material_price",
+        "ix_products_jeweler_id", "ix_products_stock_quantity", "ix_products_jeweler_sku", "ix_products_name",
+    ],
+    "product_images": ["ix_product_images_product_order"],
+    "product_categories": ["ix_product_categories_category_product"],
+    "cart_items": ["ix_cart_items_cart_product"],
+    "orders": ["ix_orders_user_date", "ix_orders_status_id", "ix_orders_order_date"],
+    "order_items": ["ix_order_items_order_id", "ix_order_items_product_id"],
+    "user_generated_designs": [
+        "ix_user_generated_designs_user_created", "ix_user_generated_designs_options_hash",
+    ],
+    "design_requests": ["ix_design_requests_status_id", "ix_design_requests_request_date"],
+    "categories": ["ix_categories_path"],
+}
+LATER_COLUMNS = {
+    "products": ["sku"],
+    "categories": ["path"],
+    "user_generated_designs": ["status", "error", "options_hash"],
+}
+LATER_TABLES = ["daily_sales", "daily_product_sales"]
+
+
+def schema(engine) -> dict:
+    inspector = inspect(engine)
+    return {
+        table: (
+            sorted(column["name"] for column in inspector.get_columns(table)),
+            sorted(index["name"] for index in inspector.get_indexes(table)),
+        )
+        for table in inspector.get_table_names()
+    }
+
+
+def test_fresh_database_gets_every_migration_once(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/fresh.db")
+
+    assert run_migrations(engine) == ALL_VERSIONS
+    assert run_migrations(engine) == []
+
+
+def test_database_from_before_the_migrations_is_brought_up_to_date(tmp_path):
+    fresh = create_engine(f"sqlite:///{tmp_path}/fresh.db")
+    run_migrations(fresh)
+    legacy = create_engine(f"sqlite:///{tmp_path}/legacy.db")
+    run_migrations(legacy)
+    with legacy.begin() as connection:
+        for table, indexes in LATER_INDEXES.items():
+            for index in indexes:
+                connection.execute(text(f"DROP INDEX {index}"))
+        for table, columns in LATER_COLUMNS.items():
+            for column in columns:
+                connection.execute(text(f"ALTER TABLE {table} DROP COLUMN {column}"))
+        for table in LATER_TABLES:
+            connection.execute(text(f"DROP TABLE {table}"))
+        connection.execute(text("DELETE FROM schema_migrations WHERE version != '0001'"))
+        connection.execute(text("INSERT INTO categories (id, name, parent_id) VALUES (1, 'Rings', NULL), (2, 'Bands', 1)"))
+        connection.execute(text("INSERT INTO users (id, username, password, email) VALUES (1, 'old', 'x', 'old@example.com')"))
+        connection.execute(text(
+            "INSERT INTO user_generated_designs (id, user_id, selected_options) "
+            "VALUES (1, 1, '{\"type\": \"Ring\", \"material\": \"Gold\"}')"
+        ))
+
+    assert run_migrations(legacy) == ALL_VERSIONS[1:]
+
+    assert schema(legacy) == schema(fresh)
+    with legacy.connect() as connection:
+        assert dict(connection.execute(text("SELECT id, path FROM categories")).all()) == {1: "1/", 2: "1/2/"}
+        design = connection.execute(text("SELECT status, options_hash FROM user_generated_designs")).one()
+    # Designs from before the job queue existed were all finished.
+    assert design.status == "COMPLETED"
+    assert design.options_hash == options_hash({"type": "Ring", "material": "Gold"})
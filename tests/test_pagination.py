@@ -0,0 +1,57 @@
+import base64
+import json
+import pytest
+
+
+def forge_cursor(*parts) -> str:
+    return base64.urlsafe_b64encode(json.dumps(list(parts)).encode("utf-8")).decode("utf-8").rstrip("=")
+
+
+def walk(client, **params) -> list:
+    """Follow X-Next-Cursor to the end and return the product ids in the order served."""
+    ids, cursor = [], None
+    while True:
+        response = client.get("/api/products/", params={**params, **({"cursor": cursor} if cursor else {})})
+        assert response.status_code == 200, response.text
+        ids.extend(product["id"] for product in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            return ids
+
+
+@pytest.mark.parametrize("sort", ["id", "price", "-price"])
+def test_cursor_pages_cover_every_product_once(client, make_products, sort):
+    ids = make_products(5, material=f"Pagination {sort}")
+
+    served = walk(client, material=f"Pagination {sort}", sort=sort, limit=2)
+
+    # Prices rise with id, so every sort order is id order or its reverse.
+    assert served == (ids[::-1] if sort == "-price" else ids)
+
+
+def test_cursor_breaks_price_ties_on_id(client, make_products):
+    ids = make_products(5, material="Pagination ties", price=250)
+
+    assert walk(client, material="Pagination ties", sort="price", limit=2) == ids
+
+
+@pytest.mark.parametrize(
+    "sort, cursor",
+    [
+        ("price", "not a cursor"),
+        ("price", forge_cursor("id", 3, 3)),
+        ("price", forge_cursor("price", {"a": 1}, 3)),
+        ("price", forge_cursor("price", "100", 3)),
+        ("price", forge_cursor("price", None, 3)),
+        ("price", forge_cursor("price", True, 3)),
+        ("price", "WyJwcmljZSIsTmFOLDNd"),  # ["price",NaN,3]
+        ("price", forge_cursor("price", 100.0, "3")),
+        ("id", forge_cursor("id", [1], 3)),
+        ("id", forge_cursor("id", 1.5, 3)),
+    ],
+)
+def test_forged_cursor_is_rejected(client, sort, cursor):
+    response = client.get("/api/products/", params={"sort": sort, "cursor": cursor})
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid pagination cursor"
@@ -0,0 +1,64 @@
+import base64
+import hashlib
+from config import settings
+from database import SessionLocal
+from models import User
+from utils.security import LEGACY_ITERATIONS, get_password_hash, needs_rehash, verify_password
+
+
+def legacy_hash(password: str, salt: str = "legacysalt") -> str:
+    """A hash from before the iteration count was stored in it."""
+    digest = hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt.encode("utf-8"), LEGACY_ITERATIONS)
+    return f"pbkdf2_sha256${salt}${base64.b64encode(digest).decode('utf-8')}"
+
+
+def test_hash_records_its_iterations():
+    hashed = get_password_hash("secret")
+
+    assert hashed.split("$")[1] == str(settings.PASSWORD_HASH_ITERATIONS)
+    assert verify_password("secret", hashed)
+    assert not verify_password("wrong", hashed)
+    assert not needs_rehash(hashed)
+
+
+def test_legacy_hash_still_verifies_and_needs_rehash():
+    hashed = legacy_hash("secret")
+
+    assert verify_password("secret", hashed)
+    assert needs_rehash(hashed)
+
+
+def test_malformed_hash_never_verifies():
+    assert not verify_password("secret", "md5$abc$def")
+    assert not verify_password("secret", "garbage")
+
+
+def test_login_upgrades_a_legacy_hash(client):
+    db = SessionLocal()
+    try:
+        db.add(User(username="legacy", email="legacy@example.com", password=legacy_hash("secret")))
+        db.commit()
+    finally:
+        db.close()
+
+    response = client.post("/api/auth/login", json={"username": "legacy", "password": "secret"})
+
+    assert response.status_code == 200, response.text
+    db = SessionLocal()
+    try:
+        stored = db.query(User).filter(User.username == "legacy").one().password
+    finally:
+        db.close()
+    assert stored.split("$")[1] == str(settings.PASSWORD_HASH_ITERATIONS)
+    assert verify_password("secret", stored)
+
+
+def test_saturated_hash_pool_sheds_load(client, monkeypatch):
+    monkeypatch.setattr(settings, "PASSWORD_HASH_MAX_PENDING", 0)
+
+    response = client.post(
+        "/api/auth/register",
+        json={"username": "shed", "email": "shed@example.com", "password": "secret"},
+    )
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
@@ -0,0 +1,93 @@
+import json
+import pytest
+from config import settings
+from database import SessionLocal
+from models import Jeweler, Product
+
+
+@pytest.fixture
+def jeweler_id(client):
+    db = SessionLocal()
+    try:
+        jeweler = Jeweler(name="Import Jeweler")
+        db.add(jeweler)
+        db.commit()
+        return jeweler.id
+    finally:
+        db.close()
+
+
+def import_rows(client, rows, **params):
+    body = "\n".join(json.dumps(row) for row in rows)
+    response = client.post("/api/admin/products/import", content=body, params=params)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def product(jeweler_id: int, sku: str) -> Product:
+    db = SessionLocal()
+    try:
+        return db.query(Product).filter(Product.jeweler_id == jeweler_id, Product.sku == sku).one()
+    finally:
+        db.close()
+
+
+def test_import_creates_then_updates(client, jeweler_id):
+    report = import_rows(client, [{"jeweler_id": jeweler_id, "sku": "A1", "name": "Band", "price": 120}])
+    assert (report["created"], report["updated"], report["failed"]) == (1, 0, 0)
+
+    report = import_rows(client, [{"jeweler_id": jeweler_id, "sku": "A1", "stock_quantity": 7}])
+    assert (report["created"], report["updated"], report["failed"]) == (0, 1, 0)
+    updated = product(jeweler_id, "A1")
+    assert (updated.name, updated.price, updated.stock_quantity) == ("Band", 120, 7)
+
+
+def test_repeated_key_in_a_batch_applies_in_file_order(client, jeweler_id):
+    report = import_rows(client, [
+        {"jeweler_id": jeweler_id, "sku": "R1", "name": "Hoop", "price": 80, "stock_quantity": 1},
+        {"jeweler_id": jeweler_id, "sku": "R1", "stock_quantity": 5},
+        {"jeweler_id": jeweler_id, "sku": "R1", "price": 90},
+    ])
+
+    assert (report["rows"], report["created"], report["merged"], report["failed"]) == (3, 1, 2, 0)
+    imported = product(jeweler_id, "R1")
+    assert (imported.name, imported.price, imported.stock_quantity) == ("Hoop", 90, 5)
+
+
+def test_bad_rows_fail_alone(client, jeweler_id):
+    report = import_rows(client, [
+        {"jeweler_id": jeweler_id, "sku": "B1", "name": "Pendant", "price": 60},
+        {"jeweler_id": jeweler_id, "sku": "B2", "price": 10},
+        {"jeweler_id": jeweler_id, "sku": "B3", "name": "Chain", "price": -1},
+        {"jeweler_id": 0, "sku": "B4", "name": "Stud", "price": 15},
+    ])
+
+    assert (report["created"], report["failed"]) == (1, 3)
+    assert sorted(error["row"] for error in report["errors"]) == [2, 3, 4]
+
+
+def test_csv_import(client, jeweler_id):
+    body = f"jeweler_id,sku,name,price,stock_quantity\n{jeweler_id},C1,Cuff,300,\n"
+    response = client.post("/api/admin/products/import", content=body, params={"format": "csv"})
+
+    assert response.status_code == 200, response.text
+    assert response.json()["created"] == 1
+    assert (product(jeweler_id, "C1").name, product(jeweler_id, "C1").price) == ("Cuff", 300)
+
+
+def test_csv_without_key_columns_is_rejected(client):
+    response = client.post("/api/admin/products/import", content="name,price\nRing,10\n", params={"format": "csv"})
+
+    assert response.status_code == 400
+
+
+def test_oversized_upload_is_refused(client, jeweler_id, monkeypatch):
+    monkeypatch.setattr(settings, "PRODUCT_IMPORT_MAX_BYTES", 64)
+    row = json.dumps({"jeweler_id": jeweler_id, "sku": "BIG", "name": "Too big", "price": 1}) + "\n"
+
+    response = client.post("/api/admin/products/import", content=row * 2)
+    assert response.status_code == 413
+
+    # Without a Content-Length the limit is enforced while the body streams in.
+    response = client.post("/api/admin/products/import", content=iter([row.encode()] * 2))
+    assert response.status_code == 413
@@ -0,0 +1,67 @@
+"""Pin the SQL statements issued by the hot endpoints, so an N+1 regression fails.
+
+Reads must not grow with the number of items: a lazy load per cart item, order
+item or product image shows up as a larger count for the larger basket.
+Checkout writes one conditional stock decrement and one rollup increment per
+product by design; anything more per item fails too.
+"""
+import pytest
+from database import count_queries
+
+SMALL, LARGE = 1, 8
+
+CART_STATEMENTS = 1
+ORDER_LIST_STATEMENTS = 2
+ORDER_STATEMENTS = 2
+PRODUCT_LIST_STATEMENTS = 2
+CHECKOUT_STATEMENTS = 7
+CHECKOUT_STATEMENTS_PER_ITEM = 2
+
+
+def statements(client, method: str, url: str, expected_status: int = 200, **kwargs):
+    with count_queries() as queries:
+        response = client.request(method, url, **kwargs)
+    assert response.status_code == expected_status, response.text
+    return queries.count, response
+
+
+def fill_cart(client, headers, product_ids) -> None:
+    for product_id in product_ids:
+        response = client.post("/api/cart/add", json={"product_id": product_id, "quantity": 1}, headers=headers)
+        assert response.status_code == 201, response.text
+
+
+@pytest.mark.parametrize("items", [SMALL, LARGE])
+def test_cart_statements(client, auth_headers, make_products, items):
+    fill_cart(client, auth_headers, make_products(items))
+    count, response = statements(client, "GET", "/api/cart/", headers=auth_headers)
+    assert len(response.json()["items"]) == items
+    assert count == CART_STATEMENTS
+
+
+@pytest.mark.parametrize("items", [SMALL, LARGE])
+def test_checkout_and_order_statements(client, auth_headers, make_products, items):
+    fill_cart(client, auth_headers, make_products(items))
+    count, response = statements(
+        client, "POST", "/api/orders/checkout", 201,
+        json={"shipping_address": "1 Test St"}, headers=auth_headers,
+    )
+    assert count == CHECKOUT_STATEMENTS + CHECKOUT_STATEMENTS_PER_ITEM * items
+    order_id = response.json()["id"]
+
+    count, response = statements(client, "GET", "/api/orders/", headers=auth_headers)
+    assert len(response.json()[0]["items"]) == items
+    assert count == ORDER_LIST_STATEMENTS
+
+    count, response = statements(client, "GET", f"/api/orders/{order_id}", headers=auth_headers)
+    assert len(response.json()["items"]) == items
+    assert count == ORDER_STATEMENTS
+
+
+@pytest.mark.parametrize("limit", [SMALL, LARGE])
+def test_product_list_statements(client, make_products, limit):
+    make_products(LARGE)
+    count, response = statements(client, "GET", "/api/products/", params={"limit": limit})
+    assert len(response.json()) == limit
+    assert all(len(product["images"]) == 2 for product in response.json())
+    assert count == PRODUCT_LIST_STATEMENTS
@@ -0,0 +1,49 @@
+"""EXPLAIN the hot queries and fail if any of them falls back to a full table scan.
+
+SQLite's planner picks indexes regardless of table size, so the scratch test
+database is enough. MySQL may prefer a scan on tiny tables; point DATABASE_URL
+at a seeded database (see ``seeder.py``) to check its plans.
+"""
+import pytest
+from sqlalchemy import select, text
+from database import engine
+from models import Product, Cart, CartItem, Order, OrderItem, UserGeneratedDesign, product_categories
+
+HOT_QUERIES = {
+    "products by karat and price": select(Product.id).where(
+        Product.karat == "18k", Product.price.between(500, 3000)
+    ),
+    "products keyset page by price": select(Product.id)
+    .where((Product.price > 1000) | ((Product.price == 1000) & (Product.id > 5)))
+    .order_by(Product.price, Product.id)
+    .limit(21),
+    "products in category": select(product_categories.c.product_id).where(
+        product_categories.c.category_id == 1
+    ),
+    "cart by user": select(Cart.id).where(Cart.user_id == 1),
+    "cart item by cart and product": select(CartItem.id).where(
+        CartItem.cart_id == 1, CartItem.product_id == 1
+    ),
+    "orders by user": select(Order.id).where(Order.user_id == 1).order_by(Order.order_date.desc()),
+    "order items by order": select(OrderItem.id).where(OrderItem.order_id == 1),
+    "designs by user, newest first": select(UserGeneratedDesign.id)
+    .where(UserGeneratedDesign.user_id == 1)
+    .order_by(UserGeneratedDesign.created_at.desc()),
+}
+
+
+def full_scans(connection, sql: str) -> list:
+    if connection.dialect.name == "sqlite":
+        plan = connection.execute(text(f"EXPLAIN QUERY PLAN {sql}")).all()
+        # "SCAN <table>" without an index is a full table scan; "SEARCH ... USING INDEX" is not.
+        return [row.detail for row in plan if row.detail.startswith("SCAN") and "INDEX" not in row.detail]
+    plan = connection.execute(text(f"EXPLAIN {sql}")).mappings().all()
+    return [f"{row['table']}: type=ALL" for row in plan if row["type"] == "ALL"]
+
+
+@pytest.mark.parametrize("name", HOT_QUERIES)
+def test_hot_query_uses_an_index(client, name):
+    # The client fixture starts the app, which applies the migrations.
+    sql = str(HOT_QUERIES[name].compile(dialect=engine.dialect, compile_kwargs={"literal_binds": True}))
+    with engine.connect() as connection:
+        assert full_scans(connection, sql) == []
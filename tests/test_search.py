@@ -0,0 +1,35 @@
+def search(client, q: str, **params) -> list:
+    response = client.get("/api/products/search", params={"q": q, **params})
+    assert response.status_code == 200, response.text
+    return [product["id"] for product in response.json()]
+
+
+def test_short_words_match_name_prefixes(client, make_products):
+    (necklace,) = make_products(1, name="Nebulosa necklace")
+    (ring,) = make_products(1, name="Oval ring")
+
+    assert necklace in search(client, "ne")
+    assert ring not in search(client, "ne")
+    assert search(client, "NEBULOSA") == [necklace]
+
+
+def test_products_matching_more_terms_rank_first(client, make_products):
+    (one,) = make_products(1, name="Quokka")
+    (both,) = make_products(1, name="Quokkaquill")
+
+    # "quokkaq" is only a prefix of the second name; "quokka" is a prefix of both.
+    assert search(client, "quokka quokkaq") == [both, one]
+
+
+def test_underscore_is_not_a_wildcard(client, make_products):
+    (underscored,) = make_products(1, name="zz_plain")
+    (other,) = make_products(1, name="zzxplain")
+
+    assert search(client, "zz_p") == [underscored]
+    assert other not in search(client, "zz_p")
+
+
+def test_query_without_words_finds_nothing(client, make_products):
+    make_products(1)
+
+    assert search(client, "!!!") == []
@@ -0,0 +1,112 @@
+import gzip
+import os
+import pytest
+
+BODY = b"0123456789abcdef"
+
+
+def write_static(name: str, data: bytes = BODY) -> str:
+    path = os.path.join("static", "test-assets", name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+    return f"/static/test-assets/{name}"
+
+
+def test_plain_file_is_revalidated_with_its_etag(client):
+    url = write_static("plain.txt")
+
+    response = client.get(url)
+
+    assert response.status_code == 200
+    assert response.content == BODY
+    assert response.headers["Cache-Control"].endswith("must-revalidate")
+    assert response.headers["Accept-Ranges"] == "bytes"
+    assert "Last-Modified" in response.headers
+    etag = response.headers["ETag"]
+    for if_none_match in (etag, f"W/{etag}", f'"other", {etag}', "*"):
+        revalidated = client.get(url, headers={"If-None-Match": if_none_match})
+        assert revalidated.status_code == 304
+        assert revalidated.headers["ETag"] == etag
+    assert client.get(url, headers={"If-None-Match": '"other"'}).status_code == 200
+
+
+def test_replacing_a_file_changes_its_etag(client):
+    url = write_static("replaced.txt")
+    etag = client.get(url).headers["ETag"]
+
+    write_static("replaced.txt", BODY * 2)
+
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_hashed_name_is_immutable(client):
+    url = write_static("logo.0123456789abcdef.png")
+
+    response = client.get(url)
+
+    assert response.headers["Cache-Control"] == "public, max-age=31536000, immutable"
+    assert response.headers["ETag"] == '"0123456789abcdef"'
+    # Revalidating a content-hashed name never needs the file.
+    missing = client.get("/static/test-assets/gone.fedcba9876543210.png", headers={"If-None-Match": '"fedcba9876543210"'})
+    assert missing.status_code == 304
+
+
+@pytest.mark.parametrize(
+    "header, expected, content_range",
+    [
+        ("bytes=2-5", b"2345", "bytes 2-5/16"),
+        ("bytes=10-", b"abcdef", "bytes 10-15/16"),
+        ("bytes=-3", b"def", "bytes 13-15/16"),
+        ("bytes=14-99", b"ef", "bytes 14-15/16"),
+    ],
+)
+def test_single_byte_range(client, header, expected, content_range):
+    url = write_static("ranged.bin")
+
+    response = client.get(url, headers={"Range": header})
+
+    assert response.status_code == 206
+    assert response.content == expected
+    assert response.headers["Content-Range"] == content_range
+
+
+def test_unsatisfiable_range(client):
+    url = write_static("short.bin")
+
+    response = client.get(url, headers={"Range": "bytes=100-200"})
+
+    assert response.status_code == 416
+    assert response.headers["Content-Range"] == "bytes */16"
+
+
+@pytest.mark.parametrize("headers", [{"Range": "bytes=0-1,4-5"}, {"Range": "items=0-1"}])
+def test_unsupported_ranges_get_the_whole_file(client, headers):
+    url = write_static("whole.bin")
+
+    response = client.get(url, headers=headers)
+
+    assert response.status_code == 200
+    assert response.content == BODY
+
+
+def test_stale_if_range_gets_the_whole_file(client):
+    url = write_static("if-range.bin")
+
+    response = client.get(url, headers={"Range": "bytes=0-1", "If-Range": '"stale"'})
+
+    assert response.status_code == 200
+    assert response.content == BODY
+
+
+def test_precompressed_sibling_is_served(client):
+    svg = b"<svg xmlns='http://www.w3.org/2000/svg'>" + b" " * 2048 + b"</svg>"
+    url = write_static("icon.svg", svg)
+    write_static("icon.svg.gz", gzip.compress(svg))
+
+    response = client.get(url, headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["Vary"]
+    assert response.content == svg
+    assert client.get(url, headers={"Accept-Encoding": "identity"}).headers.get("Content-Encoding") is None
@@ -0,0 +1,54 @@
+import asyncio
+import os
+import pytest
+from utils import storage
+from utils.storage import content_hash, ensure_dir, storage_stats, write_content_addressed, write_file_atomic
+
+
+def test_atomic_write_replaces_the_whole_file(tmp_path):
+    path = str(tmp_path / "image.png")
+    writes = storage_stats()["writes"]
+
+    asyncio.run(write_file_atomic(path, b"old"))
+    asyncio.run(write_file_atomic(path, b"new contents"))
+
+    with open(path, "rb") as f:
+        assert f.read() == b"new contents"
+    assert os.listdir(tmp_path) == ["image.png"]
+    assert storage_stats()["writes"] == writes + 2
+
+
+def test_failed_write_leaves_no_temporary_file(tmp_path, monkeypatch):
+    path = str(tmp_path / "image.png")
+    asyncio.run(write_file_atomic(path, b"old"))
+    failures = storage_stats()["failures"]
+
+    async def failing_replace(*args, **kwargs):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(storage.aiofiles.os, "replace", failing_replace)
+    with pytest.raises(OSError):
+        asyncio.run(write_file_atomic(path, b"new"))
+
+    with open(path, "rb") as f:
+        assert f.read() == b"old"
+    assert os.listdir(tmp_path) == ["image.png"]
+    assert storage_stats()["failures"] == failures + 1
+    assert storage_stats()["in_flight"] == 0
+
+
+def test_content_addressed_names_follow_the_bytes(tmp_path):
+    directory = str(tmp_path / "designs")
+
+    async def write_all():
+        await ensure_dir(directory)
+        return [
+            await write_content_addressed(directory, "design_1", ".png", data)
+            for data in (b"first", b"first", b"second")
+        ]
+
+    first, again, second = asyncio.run(write_all())
+
+    assert first == again == f"design_1.{content_hash(b'first')}.png"
+    assert second != first
+    assert sorted(os.listdir(directory)) == sorted({first, second})
@@ -1,11 +1,29 @@
-from utils.auth import create_access_token, verify_token, get_current_user, get_current_user_optional
-from utils.security import get_password_hash, verify_password
+from utils.auth import (
+    create_access_token,
+    verify_token,
+    get_current_user,
+    get_current_user_optional,
+    get_current_principal,
+)
+from utils.security import (
+    get_password_hash,
+    verify_password,
+    get_password_hash_async,
+    verify_password_async,
+    needs_rehash,
+    hashing_stats,
+)
 
 __all__ = [
     "create_access_token",
     "verify_token",
     "get_current_user",
     "get_current_user_optional",
+    "get_current_principal",
     "get_password_hash",
     "verify_password",
+    "get_password_hash_async",
+    "verify_password_async",
+    "needs_rehash",
+    "hashing_stats",
 ]
\ No newline at end of file
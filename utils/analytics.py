@@ -0,0 +1,188 @@
+from datetime import date, datetime
+from typing import Iterable
+from sqlalchemy import and_, case, delete, func, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from models.analytics import DailySales, DailyProductSales
+from models.order import Order, OrderItem, OrderStatus
+from models.product import Product
+
+daily_sales = DailySales.__table__
+daily_product_sales = DailyProductSales.__table__
+
+
+def _as_date(value) -> date:
+    # SQLite returns DATE(...) as text.
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value))
+
+
+def _increment(db: Session, table, keys: dict, amounts: dict, insert_only: dict = None) -> None:
+    """Add amounts to the rollup row identified by keys, creating it if missing.
+
+    A single upsert statement on MySQL and SQLite, so concurrent checkouts never
+    lose an increment. Other dialects update first and insert if no row matched.
+    """
+    values = {**keys, **(insert_only or {}), **amounts}
+    dialect = db.get_bind().dialect.name
+    if dialect == "mysql":
+        from sqlalchemy.dialects.mysql import insert as upsert
+
+        statement = upsert(table).values(**values)
+        statement = statement.on_duplicate_key_update(
+            {column: table.c[column] + statement.inserted[column] for column in amounts}
+        )
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as upsert
+
+        statement = upsert(table).values(**values)
+        statement = statement.on_conflict_do_update(
+            index_elements=list(keys),
+            set_={column: table.c[column] + statement.excluded[column] for column in amounts},
+        )
+    else:
+        _update_or_insert(db, table, keys, amounts, values)
+        return
+    db.execute(statement)
+
+
+def _update_or_insert(db: Session, table, keys: dict, amounts: dict, values: dict) -> None:
+    increment = (
+        update(table)
+        .where(and_(*(table.c[column] == value for column, value in keys.items())))
+        .values({column: table.c[column] + amount for column, amount in amounts.items()})
+    )
+    if db.execute(increment).rowcount:
+        return
+    try:
+        with db.begin_nested():
+            db.execute(insert(table).values(**values))
+    except IntegrityError:
+        # A concurrent transaction inserted the row first; it exists now.
+        db.execute(increment)
+
+
+def record_order_placed(db: Session, order: Order, items: Iterable[dict]) -> None:
+    """Add a new order to the rollups; items carry product_id, jeweler_id, quantity, subtotal.
+
+    Runs inside the checkout transaction so the rollups commit or roll back with it.
+    """
+    day = _as_date(order.order_date)
+    items = sorted(items, key=lambda item: item["product_id"])
+    _increment(db, daily_sales, {"day": day}, {
+        "order_count": 1,
+        "units": sum(item["quantity"] for item in items),
+        "revenue": order.total_amount,
+    })
+    for item in items:
+        _increment(
+            db,
+            daily_product_sales,
+            {"day": day, "product_id": item["product_id"]},
+            {"units": item["quantity"], "revenue": item["subtotal"]},
+            insert_only={"jeweler_id": item["jeweler_id"]},
+        )
+
+
+def record_status_change(db: Session, order: Order, old_status: OrderStatus) -> None:
+    """Move an order's totals in or out of the rollups when it is (un)cancelled."""
+    was_cancelled = old_status == OrderStatus.CANCELLED
+    is_cancelled = order.status == OrderStatus.CANCELLED
+    if was_cancelled == is_cancelled:
+        return
+    sign = -1 if is_cancelled else 1
+
+    items = db.execute(
+        select(OrderItem.product_id, OrderItem.quantity, OrderItem.subtotal, Product.jeweler_id)
+        .join(Product, OrderItem.product_id == Product.id)
+        .where(OrderItem.order_id == order.id)
+        .order_by(OrderItem.product_id)
+    ).all()
+    day = _as_date(order.order_date)
+    _increment(db, daily_sales, {"day": day}, {
+        "order_count": sign,
+        "units": sign * sum(item.quantity for item in items),
+        "revenue": sign * order.total_amount,
+        "cancelled_orders": -sign,
+        "cancelled_revenue": -sign * order.total_amount,
+    })
+    for item in items:
+        _increment(
+            db,
+            daily_product_sales,
+            {"day": day, "product_id": item.product_id},
+            {"units": sign * item.quantity, "revenue": sign * item.subtotal},
+            insert_only={"jeweler_id": item.jeweler_id},
+        )
+
+
+def record_cart_started(db: Session) -> None:
+    """Count a cart going from empty to non-empty: the top of the cart-to-order funnel."""
+    _increment(db, daily_sales, {"day": date.today()}, {"carts_started": 1})
+
+
+def rebuild_rollups(connection) -> None:
+    """Recompute the order rollups from orders and order_items.
+
+    carts_started has no raw history to rebuild from, so existing counts are kept.
+    """
+    carts_started = dict(connection.execute(
+        select(daily_sales.c.day, daily_sales.c.carts_started).where(daily_sales.c.carts_started != 0)
+    ).all())
+    connection.execute(delete(daily_product_sales))
+    connection.execute(delete(daily_sales))
+
+    day = func.date(Order.order_date)
+    cancelled = Order.status == OrderStatus.CANCELLED
+    active_units = (
+        select(OrderItem.order_id, func.sum(OrderItem.quantity).label("units"))
+        .group_by(OrderItem.order_id)
+        .subquery()
+    )
+    rows = {}
+    for row in connection.execute(
+        select(
+            day.label("day"),
+            func.sum(case((cancelled, 0), else_=1)).label("order_count"),
+            func.sum(case((cancelled, 0), else_=func.coalesce(active_units.c.units, 0))).label("units"),
+            func.sum(case((cancelled, 0), else_=Order.total_amount)).label("revenue"),
+            func.sum(case((cancelled, 1), else_=0)).label("cancelled_orders"),
+            func.sum(case((cancelled, Order.total_amount), else_=0)).label("cancelled_revenue"),
+        )
+        .outerjoin(active_units, active_units.c.order_id == Order.id)
+        .group_by(day)
+    ):
+        values = dict(row._mapping)
+        values["day"] = _as_date(values["day"])
+        values["carts_started"] = carts_started.pop(values["day"], 0)
+        rows[values["day"]] = values
+    for cart_day, count in carts_started.items():
+        rows[cart_day] = {
+            "day": cart_day, "order_count": 0, "units": 0, "revenue": 0.0,
+            "cancelled_orders": 0, "cancelled_revenue": 0.0, "carts_started": count,
+        }
+    if rows:
+        connection.execute(insert(daily_sales), list(rows.values()))
+
+    product_rows = [
+        {**dict(row._mapping), "day": _as_date(row.day)}
+        for row in connection.execute(
+            select(
+                day.label("day"),
+                OrderItem.product_id,
+                Product.jeweler_id,
+                func.sum(OrderItem.quantity).label("units"),
+                func.sum(OrderItem.subtotal).label("revenue"),
+            )
+            .select_from(OrderItem)
+            .join(Order, OrderItem.order_id == Order.id)
+            .join(Product, OrderItem.product_id == Product.id)
+            .where(~cancelled)
+            .group_by(day, OrderItem.product_id, Product.jeweler_id)
+        )
+    ]
+    if product_rows:
+        connection.execute(insert(daily_product_sales), product_rows)
@@ -4,13 +4,21 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import JWTError, jwt
 from sqlalchemy.orm import Session
-from schemas.user import TokenData
+from schemas.user import TokenData, Principal
 from config import settings
 from database import get_db
 from models.user import User
+from utils.cache import MemoryBackend
 
 security = HTTPBearer(auto_error=False)
 
+# user_id -> username for accounts recently confirmed to still exist. Lets
+# identity-only routes trust the token claims without a users lookup per request.
+# The cache is per worker and the app never deletes or renames users, so there
+# is no explicit eviction: a removed account stops authenticating within
+# AUTH_USER_CACHE_TTL seconds (0 checks the database on every request).
+_known_users = MemoryBackend(maxsize=10000, ttl=settings.AUTH_USER_CACHE_TTL)
+
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
@@ -63,6 +71,48 @@ def get_current_user(
     return user
 
 
+def get_current_principal(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db),
+) -> Principal:
+    """Authenticate from the verified token claims without loading the full User row.
+
+    Use this for routes that only need the caller's id; use get_current_user when
+    the handler reads profile fields.
+    """
+    if credentials is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    token_data = verify_token(credentials.credentials)
+    if token_data is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    user_id = token_data.user_id
+    if user_id is not None and _known_users.get(str(user_id)) == token_data.username:
+        return Principal(id=user_id, username=token_data.username)
+
+    if user_id is not None:
+        row = db.query(User.id, User.username).filter(User.id == user_id).first()
+    else:
+        row = db.query(User.id, User.username).filter(User.username == token_data.username).first()
+    if row is None or row.username != token_data.username:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    if settings.AUTH_USER_CACHE_TTL > 0:
+        _known_users.set(str(row.id), row.username)
+    return Principal(id=row.id, username=row.username)
+
+
 def get_current_user_optional(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db),
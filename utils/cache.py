@@ -0,0 +1,232 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Iterable, Optional
+from fastapi.concurrency import run_in_threadpool
+from config import settings
+
+_MISSING = object()
+
+
+class MemoryBackend:
+    """Bounded in-process store with per-entry TTL and LRU eviction."""
+
+    # Dict operations under a lock: cheap enough to call from the event loop.
+    blocking = False
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.evictions = 0
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()
+        self._counters: dict = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return _MISSING
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return _MISSING
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def incr(self, key: str) -> int:
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + 1
+            return self._counters[key]
+
+    def counter(self, key: str) -> int:
+        return self._counters.get(key, 0)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._counters.clear()
+
+    def size(self) -> int:
+        return len(self._data)
+
+
+class RedisBackend:
+    """Shared store so several uvicorn workers see the same entries and invalidations.
+
+    Requires the optional ``redis`` package; LRU eviction is left to the Redis
+    server's ``maxmemory-policy``.
+    """
+
+    # Every call is a network round trip; async callers run it in the threadpool.
+    blocking = True
+
+    def __init__(self, url: str, ttl: float = 60, prefix: str = "jewelry:cache:"):
+        import redis
+
+        self.ttl = ttl
+        self.prefix = prefix
+        self.evictions = None
+        self._client = redis.Redis.from_url(url)
+
+    def get(self, key: str) -> Any:
+        raw = self._client.get(self.prefix + key)
+        if raw is None:
+            return _MISSING
+        return json.loads(raw)
+
+    def set(self, key: str, value: Any) -> None:
+        self._client.set(self.prefix + key, json.dumps(value), ex=max(1, int(self.ttl)))
+
+    def delete(self, key: str) -> None:
+        self._client.delete(self.prefix + key)
+
+    def incr(self, key: str) -> int:
+        return int(self._client.incr(self.prefix + key))
+
+    def counter(self, key: str) -> int:
+        return int(self._client.get(self.prefix + key) or 0)
+
+    def clear(self) -> None:
+        keys = list(self._client.scan_iter(match=self.prefix + "*"))
+        if keys:
+            self._client.delete(*keys)
+
+    def size(self) -> Optional[int]:
+        return None
+
+
+class CatalogCache:
+    """Read-through cache for catalog endpoints, invalidated by the admin write paths.
+
+    Cached values must be JSON-compatible so any backend can hold them. Product
+    listings are keyed under a generation counter: any product write bumps it,
+    which orphans every cached page at once without enumerating keys.
+
+    Every invalidation also bumps INVALIDATIONS_KEY. A loaded value is only
+    stored if no invalidation happened while it loaded, so a write that lands
+    mid-load cannot leave a stale entry behind for the whole TTL.
+    """
+
+    LIST_GENERATION_KEY = "products:list:gen"
+    INVALIDATIONS_KEY = "invalidations"
+    CATEGORIES_KEY = "categories"
+    CATEGORY_TREE_KEY = "categories:tree"
+
+    def __init__(self, backend, enabled: bool = True):
+        self.backend = backend
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    async def _acall(self, method: Callable, *args) -> Any:
+        if self.backend.blocking:
+            return await run_in_threadpool(method, *args)
+        return method(*args)
+
+    def get_or_load(self, key: str, loader: Callable[[], Any]) -> Any:
+        if not self.enabled:
+            return loader()
+        value = self.backend.get(key)
+        if value is not _MISSING:
+            with self._lock:
+                self.hits += 1
+            return value
+        with self._lock:
+            self.misses += 1
+        invalidations = self.backend.counter(self.INVALIDATIONS_KEY)
+        value = loader()
+        if self.backend.counter(self.INVALIDATIONS_KEY) == invalidations:
+            self.backend.set(key, value)
+        return value
+
+    async def aget_or_load(self, key: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        if not self.enabled:
+            return await loader()
+        value = await self._acall(self.backend.get, key)
+        if value is not _MISSING:
+            with self._lock:
+                self.hits += 1
+            return value
+        with self._lock:
+            self.misses += 1
+        invalidations = await self._acall(self.backend.counter, self.INVALIDATIONS_KEY)
+        value = await loader()
+        if await self._acall(self.backend.counter, self.INVALIDATIONS_KEY) == invalidations:
+            await self._acall(self.backend.set, key, value)
+        return value
+
+    def product_key(self, product_id: int) -> str:
+        return f"products:{product_id}"
+
+    def _list_key(self, generation: int, params: dict) -> str:
+        parts = "&".join(f"{name}={params[name]}" for name in sorted(params))
+        return f"products:list:{generation}:{parts}"
+
+    def product_list_key(self, **params) -> str:
+        return self._list_key(self.backend.counter(self.LIST_GENERATION_KEY), params)
+
+    async def aproduct_list_key(self, **params) -> str:
+        return self._list_key(await self._acall(self.backend.counter, self.LIST_GENERATION_KEY), params)
+
+    def invalidate_product(self, product_id: int) -> None:
+        self.backend.incr(self.INVALIDATIONS_KEY)
+        self.backend.delete(self.product_key(product_id))
+        self.backend.incr(self.LIST_GENERATION_KEY)
+
+    def invalidate_products(self, product_ids: Iterable[int]) -> None:
+        # One generation bump for the whole batch instead of one per product.
+        self.backend.incr(self.INVALIDATIONS_KEY)
+        for product_id in product_ids:
+            self.backend.delete(self.product_key(product_id))
+        self.backend.incr(self.LIST_GENERATION_KEY)
+
+    def invalidate_categories(self, affects_products: bool = False) -> None:
+        self.backend.incr(self.INVALIDATIONS_KEY)
+        self.backend.delete(self.CATEGORIES_KEY)
+        self.backend.delete(self.CATEGORY_TREE_KEY)
+        if affects_products:
+            self.backend.incr(self.LIST_GENERATION_KEY)
+
+    def clear(self) -> None:
+        self.backend.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "backend": type(self.backend).__name__,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.backend.evictions,
+            "size": self.backend.size(),
+        }
+
+
+def _build_catalog_cache() -> CatalogCache:
+    if settings.CATALOG_CACHE_URL:
+        backend = RedisBackend(settings.CATALOG_CACHE_URL, ttl=settings.CATALOG_CACHE_TTL)
+    else:
+        backend = MemoryBackend(
+            maxsize=settings.CATALOG_CACHE_MAXSIZE,
+            ttl=settings.CATALOG_CACHE_TTL,
+        )
+    return CatalogCache(backend, enabled=settings.CATALOG_CACHE_TTL > 0)
+
+
+catalog_cache = _build_catalog_cache()
@@ -0,0 +1,57 @@
+from typing import Dict, List, Optional
+from sqlalchemy import bindparam, select, update
+from models.category import Category, PATH_SEPARATOR
+
+categories = Category.__table__
+
+
+def compute_paths(rows) -> Dict[int, str]:
+    """Materialized paths from (id, parent_id) pairs; rows caught in a cycle get none."""
+    children: Dict[Optional[int], List[int]] = {}
+    for category_id, parent_id in rows:
+        children.setdefault(parent_id, []).append(category_id)
+    known = {category_id for category_id, _ in rows}
+    # Categories whose parent is gone are treated as roots, as the API shows them.
+    roots = [category_id for category_id, parent_id in rows if parent_id is None or parent_id not in known]
+    paths = {}
+    stack = [(category_id, "") for category_id in roots]
+    while stack:
+        category_id, parent_path = stack.pop()
+        paths[category_id] = f"{parent_path}{category_id}{PATH_SEPARATOR}"
+        stack.extend((child, paths[category_id]) for child in children.get(category_id, ()))
+    return paths
+
+
+def rebuild_paths(connection) -> None:
+    """Recompute every category path from parent_id, rewriting only rows that differ."""
+    rows = connection.execute(select(categories.c.id, categories.c.parent_id, categories.c.path)).all()
+    paths = compute_paths([(row.id, row.parent_id) for row in rows])
+    changed = [
+        {"b_id": row.id, "b_path": paths.get(row.id)}
+        for row in rows
+        if paths.get(row.id) != row.path
+    ]
+    if changed:
+        connection.execute(
+            update(categories).where(categories.c.id == bindparam("b_id")).values(path=bindparam("b_path")),
+            changed,
+        )
+
+
+def build_tree(rows) -> dict:
+    """Nested category dicts from rows ordered by id, plus each category's path.
+
+    The result is JSON-compatible (string keys) so the catalog cache can hold it.
+    """
+    nodes = {
+        row.id: {"id": row.id, "name": row.name, "parent_id": row.parent_id, "children": []}
+        for row in rows
+    }
+    roots = []
+    for row in rows:
+        parent = nodes.get(row.parent_id)
+        (parent["children"] if parent is not None else roots).append(nodes[row.id])
+    return {
+        "roots": roots,
+        "paths": {str(row.id): row.path for row in rows if row.path},
+    }
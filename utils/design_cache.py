@@ -0,0 +1,122 @@
+import hashlib
+import json
+import threading
+from typing import List
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from config import settings
+from database import seconds_ago
+from models.design import UserGeneratedDesign, DesignGenerationStatus
+
+# Bump when construct_prompt changes so old images stop matching new prompts.
+PROMPT_VERSION = 1
+
+DESIGN_OPTION_FIELDS = ("type", "color", "shape", "material", "karat", "gemstone_type", "gemstone_color")
+
+
+def normalize_options(options: dict) -> dict:
+    normalized = {}
+    for field in DESIGN_OPTION_FIELDS:
+        value = options.get(field)
+        normalized[field] = " ".join(str(value).split()).casefold() if value is not None else None
+    if normalized["gemstone_type"] in (None, "", "none"):
+        normalized["gemstone_type"] = "none"
+        normalized["gemstone_color"] = None
+    return normalized
+
+
+def options_hash(options: dict) -> str:
+    """Content address of a design request: equal for requests that yield the same prompt."""
+    payload = json.dumps(
+        {"v": PROMPT_VERSION, "options": normalize_options(options)},
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def image_variant_id(image_url: str) -> str:
+    """Opaque handle for a stored image, so variants can be offered without naming their owner's design."""
+    return hashlib.sha256(image_url.encode("utf-8")).hexdigest()[:16]
+
+
+def _variants_query(key: str):
+    # Only filters what is offered for reuse: the designs and their images stay,
+    # since every row is also someone's design history.
+    cutoff = seconds_ago(settings.AI_DESIGN_REUSE_MAX_AGE_DAYS * 86400)
+    return (
+        select(UserGeneratedDesign)
+        .where(
+            UserGeneratedDesign.options_hash == key,
+            UserGeneratedDesign.status == DesignGenerationStatus.COMPLETED,
+            UserGeneratedDesign.created_at >= cutoff,
+        )
+        .order_by(UserGeneratedDesign.created_at.desc(), UserGeneratedDesign.id.desc())
+        .limit(settings.AI_DESIGN_REUSE_MAX_VARIANTS * 4)
+    )
+
+
+def find_variants(db: Session, key: str) -> List[UserGeneratedDesign]:
+    """Distinct completed images for this key, newest first, within the configured age and count."""
+    return _distinct_images(db.scalars(_variants_query(key)).all())
+
+
+async def afind_variants(db: AsyncSession, key: str) -> List[UserGeneratedDesign]:
+    return _distinct_images((await db.scalars(_variants_query(key))).all())
+
+
+def _distinct_images(designs) -> List[UserGeneratedDesign]:
+    variants, seen = [], set()
+    for design in designs:
+        if design.generated_image_url and design.generated_image_url not in seen:
+            seen.add(design.generated_image_url)
+            variants.append(design)
+        if len(variants) >= settings.AI_DESIGN_REUSE_MAX_VARIANTS:
+            break
+    return variants
+
+
+class DesignCacheStats:
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.forced = 0
+        self.generations = 0
+        self.generation_time_total = 0.0
+        self.saved_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def record_generation(self, seconds: float) -> None:
+        with self._lock:
+            self.generations += 1
+            self.generation_time_total += seconds
+
+    def record_hit(self) -> None:
+        with self._lock:
+            self.hits += 1
+            if self.generations:
+                self.saved_seconds += self.generation_time_total / self.generations
+
+    def record_miss(self, forced: bool = False) -> None:
+        with self._lock:
+            self.misses += 1
+            if forced:
+                self.forced += 1
+
+    def as_dict(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": settings.AI_DESIGN_CACHE_ENABLED,
+            "hits": self.hits,
+            "misses": self.misses,
+            "forced_fresh": self.forced,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "avg_generation_seconds": (
+                self.generation_time_total / self.generations if self.generations else 0.0
+            ),
+            "saved_seconds": round(self.saved_seconds, 3),
+        }
+
+
+design_cache_stats = DesignCacheStats()
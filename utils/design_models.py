@@ -0,0 +1,72 @@
+import asyncio
+import base64
+import hashlib
+import io
+import random
+from config import settings
+
+
+class DesignGenerationError(Exception):
+    pass
+
+
+class GeminiDesignModel:
+    model_name = "gemini-3-pro-image-preview"
+
+    def __init__(self, api_key: str):
+        import google.generativeai as genai
+
+        self._genai = genai
+        if api_key:
+            genai.configure(api_key=api_key)
+        self.configured = bool(api_key)
+
+    async def generate(self, prompt: str) -> bytes:
+        model = self._genai.GenerativeModel(self.model_name)
+        response = await model.generate_content_async(
+            prompt,
+            generation_config={
+                "response_modalities": ["image", "text"],
+            }
+        )
+
+        image_data = None
+        for part in response.parts:
+            if hasattr(part, "inline_data"):
+                image_data = part.inline_data.data
+                break
+
+        if not image_data:
+            text_response = response.text if hasattr(response, "text") else "No image generated"
+            raise DesignGenerationError(f"Failed to generate image. Response: {text_response}")
+
+        if isinstance(image_data, str):
+            return base64.b64decode(image_data)
+        return image_data
+
+
+class FakeDesignModel:
+    """Offline stand-in for load testing: sleeps like the real model, returns a PNG."""
+
+    configured = True
+
+    def __init__(self, latency: float = 2.0, jitter: float = 0.5, size: int = 512):
+        self.latency = latency
+        self.jitter = jitter
+        self.size = size
+
+    async def generate(self, prompt: str) -> bytes:
+        from PIL import Image
+
+        await asyncio.sleep(max(0.0, self.latency + random.uniform(-self.jitter, self.jitter)))
+        digest = hashlib.sha256(prompt.encode("utf-8")).digest()
+        image = Image.new("RGB", (self.size, self.size), tuple(digest[:3]))
+        buffer = io.BytesIO()
+        image.save(buffer, format="PNG")
+        return buffer.getvalue()
+
+
+def build_design_model():
+    if settings.AI_MODEL_BACKEND == "fake":
+        return FakeDesignModel(latency=settings.AI_FAKE_LATENCY)
+    return GeminiDesignModel(settings.GEMINI_API_KEY)
@@ -0,0 +1,100 @@
+import csv
+import io
+import json
+from datetime import date, datetime
+from enum import Enum
+from typing import Callable, Iterable, Iterator, Optional, Sequence
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from database import SessionLocal
+
+EXPORT_FORMATS = {
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "csv": ("text/csv; charset=utf-8", "csv"),
+}
+# Rows fetched per round trip; also bounds how many rows are held in memory.
+EXPORT_BATCH_SIZE = 1000
+EXPORT_CHUNK_SIZE = 64 * 1024
+
+
+def _plain(value):
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def stream_rows(db: Session, statement) -> Iterator:
+    """Yield result rows from a server-side cursor, EXPORT_BATCH_SIZE at a time."""
+    result = db.execute(statement.execution_options(stream_results=True, yield_per=EXPORT_BATCH_SIZE))
+    try:
+        yield from result
+    finally:
+        result.close()
+
+
+def _json_default(value):
+    plain = _plain(value)
+    if plain is value:
+        raise TypeError(f"{type(value).__name__} is not JSON serializable")
+    return plain
+
+
+def _drain(buffer: io.StringIO) -> str:
+    chunk = buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+    return chunk
+
+
+# Both writers send ~EXPORT_CHUNK_SIZE chunks rather than one tiny chunk per row.
+def iter_ndjson(records: Iterable[dict]) -> Iterator[str]:
+    buffer = io.StringIO()
+    for record in records:
+        buffer.write(json.dumps(record, default=_json_default, separators=(",", ":")) + "\n")
+        if buffer.tell() >= EXPORT_CHUNK_SIZE:
+            yield _drain(buffer)
+    yield buffer.getvalue()
+
+
+def iter_csv(columns: Sequence[str], records: Iterable[dict]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for record in records:
+        writer.writerow([_plain(record.get(column)) for column in columns])
+        if buffer.tell() >= EXPORT_CHUNK_SIZE:
+            yield _drain(buffer)
+    yield buffer.getvalue()
+
+
+def export_response(
+    export_format: str,
+    filename: str,
+    build_records: Callable[[Session], Iterable[dict]],
+    columns: Optional[Sequence[str]] = None,
+) -> StreamingResponse:
+    """Stream records as NDJSON or CSV.
+
+    The export opens its own session: request-scoped dependencies are torn down
+    before a streaming body finishes.
+    """
+    media_type, extension = EXPORT_FORMATS[export_format]
+
+    def body():
+        db = SessionLocal()
+        try:
+            records = build_records(db)
+            if export_format == "csv":
+                yield from iter_csv(columns, records)
+            else:
+                yield from iter_ndjson(records)
+        finally:
+            db.close()
+
+    return StreamingResponse(
+        body(),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{extension}"'},
+    )
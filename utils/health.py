@@ -0,0 +1,95 @@
+import asyncio
+import time
+from sqlalchemy import text
+from config import settings
+from database import async_engine, pool_stats
+from utils.storage import check_writable
+
+STATIC_PROBE_DIR = "static/generated_designs"
+
+
+async def _timed(check) -> dict:
+    """Run one check; it returns extra details or raises to fail."""
+    started = time.perf_counter()
+    try:
+        details = await check()
+        result = {"ok": True, **(details or {})}
+    except Exception as exc:
+        result = {"ok": False, "error": str(exc) or type(exc).__name__}
+    result["latency_ms"] = round((time.perf_counter() - started) * 1000, 2)
+    return result
+
+
+async def check_database() -> dict:
+    async def ping():
+        async with async_engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+
+    try:
+        await asyncio.wait_for(ping(), settings.READINESS_DB_TIMEOUT)
+    except asyncio.TimeoutError:
+        raise TimeoutError(f"no reply within {settings.READINESS_DB_TIMEOUT} s")
+
+
+async def check_pools() -> dict:
+    # Every connection checked out means new requests queue for pool_timeout seconds.
+    pools = pool_stats()
+    details = {}
+    for name in ("sync", "async"):
+        pool = pools[name]
+        if pool["max_overflow"] < 0:
+            # SQLAlchemy's "no overflow limit": the pool opens connections on demand.
+            details[name] = {"checked_out": pool["checked_out"], "capacity": None}
+            continue
+        capacity = pool["pool_size"] + pool["max_overflow"]
+        details[name] = {"checked_out": pool["checked_out"], "capacity": capacity}
+        if pool["checked_out"] >= capacity:
+            raise RuntimeError(f"{name} pool saturated: {pool['checked_out']}/{capacity} connections in use")
+    return details
+
+
+async def check_static_dir() -> dict:
+    await check_writable(STATIC_PROBE_DIR)
+
+
+def queue_check(queue):
+    async def check() -> dict:
+        stats = queue.stats()
+        if stats["depth"] >= stats["max_size"]:
+            raise RuntimeError(f"{stats['name']} queue full: {stats['depth']}/{stats['max_size']}")
+        return {"depth": stats["depth"], "max_size": stats["max_size"]}
+
+    return check
+
+
+class ReadinessProbe:
+    """Runs the readiness checks concurrently and reuses the result for `ttl` seconds.
+
+    Concurrent probes inside the window share one run, so a load balancer polling
+    every worker often still costs at most one database round trip per window.
+    """
+
+    def __init__(self, checks: dict, ttl: float):
+        self.checks = checks
+        self.ttl = ttl
+        self._result = None
+        self._checked_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def run(self) -> dict:
+        names = list(self.checks)
+        results = await asyncio.gather(*(_timed(self.checks[name]) for name in names))
+        checks = dict(zip(names, results))
+        return {
+            "status": "ready" if all(check["ok"] for check in results) else "not_ready",
+            "checks": checks,
+        }
+
+    async def status(self) -> dict:
+        async with self._lock:
+            age = time.monotonic() - self._checked_at
+            if self._result is None or age >= self.ttl:
+                self._result = await self.run()
+                self._checked_at = time.monotonic()
+                age = 0.0
+            return {**self._result, "cached": age > 0, "age_seconds": round(age, 3)}
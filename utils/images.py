@@ -0,0 +1,117 @@
+import asyncio
+import io
+import os
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+from config import settings
+from utils.storage import ensure_dir, write_file_atomic
+
+logger = logging.getLogger(__name__)
+
+# Pillow releases the GIL while resizing and encoding, so renders get their own
+# pool sized to the cores; a burst of /media misses then can't occupy the
+# threadpool that serves sync endpoints.
+_render_executor = ThreadPoolExecutor(
+    max_workers=settings.IMAGE_RENDER_WORKERS,
+    thread_name_prefix="image-render",
+)
+
+STATIC_DIR = "static"
+VARIANTS_DIR = os.path.join(STATIC_DIR, "variants")
+VARIANT_WIDTHS = (200, 400, 800)
+THUMBNAIL_WIDTH = 200
+VARIANT_FORMATS = {
+    "webp": ("WEBP", {"quality": 80, "method": 4}),
+    "jpg": ("JPEG", {"quality": 82, "optimize": True, "progressive": True}),
+}
+SOURCE_EXTENSIONS = {".png", ".jpg", ".jpeg", ".webp"}
+
+
+def _static_relative(image_path: Optional[str]) -> Optional[str]:
+    """Path under static/ for a locally served image URL, or None for anything else."""
+    if not image_path or not image_path.startswith("/static/"):
+        return None
+    relative = image_path[len("/static/"):]
+    if relative.startswith("variants/") or os.path.splitext(relative)[1].lower() not in SOURCE_EXTENSIONS:
+        return None
+    return relative
+
+
+def variant_url(image_path: str, width: int, fmt: str) -> Optional[str]:
+    relative = _static_relative(image_path)
+    if relative is None:
+        return None
+    return f"/media/{width}/{relative}.{fmt}"
+
+
+def image_variants(image_path: Optional[str]) -> Optional[dict]:
+    """Resized copies of a static image for API responses; computed without touching disk."""
+    if _static_relative(image_path) is None:
+        return None
+    return {
+        "thumbnail": variant_url(image_path, THUMBNAIL_WIDTH, "webp"),
+        "webp": {width: variant_url(image_path, width, "webp") for width in VARIANT_WIDTHS},
+        "jpeg": {width: variant_url(image_path, width, "jpg") for width in VARIANT_WIDTHS},
+    }
+
+
+def resolve_variant(width: int, path: str):
+    """Map a /media/<width>/<path> request to (source file, cached variant file, format).
+
+    Returns None for anything that isn't a variant of an image inside static/.
+    """
+    if width not in VARIANT_WIDTHS:
+        return None
+    relative, ext = os.path.splitext(path)
+    fmt = ext.lstrip(".").lower()
+    if fmt not in VARIANT_FORMATS or _static_relative(f"/static/{relative}") is None:
+        return None
+    static_root = os.path.realpath(STATIC_DIR)
+    source = os.path.realpath(os.path.join(static_root, relative))
+    if not source.startswith(static_root + os.sep):
+        return None
+    target = os.path.join(VARIANTS_DIR, str(width), f"{os.path.relpath(source, static_root)}.{fmt}")
+    return source, target, fmt
+
+
+def render_variant(source: str, width: int, fmt: str) -> bytes:
+    from PIL import Image
+
+    format_name, options = VARIANT_FORMATS[fmt]
+    with Image.open(source) as image:
+        image.draft("RGB", (width, width))
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA")
+        if image.width > width:
+            image = image.resize((width, round(image.height * width / image.width)), Image.LANCZOS)
+        if format_name == "JPEG" and image.mode != "RGB":
+            background = Image.new("RGB", image.size, (255, 255, 255))
+            converted = image.convert("RGBA")
+            background.paste(converted, mask=converted.split()[-1])
+            image = background
+        buffer = io.BytesIO()
+        image.save(buffer, format=format_name, **options)
+        return buffer.getvalue()
+
+
+async def build_variant(source: str, target: str, width: int, fmt: str) -> None:
+    loop = asyncio.get_running_loop()
+    data = await loop.run_in_executor(_render_executor, render_variant, source, width, fmt)
+    await ensure_dir(os.path.dirname(target))
+    await write_file_atomic(target, data)
+
+
+async def build_all_variants(image_path: str) -> None:
+    """Pre-render every variant of a freshly written image so first views are cache hits."""
+    relative = _static_relative(image_path)
+    if relative is None:
+        return
+    for width in VARIANT_WIDTHS:
+        for fmt in VARIANT_FORMATS:
+            source, target, _ = resolve_variant(width, f"{relative}.{fmt}")
+            try:
+                await build_variant(source, target, width, fmt)
+            except Exception:
+                # The /media route renders missing variants on demand.
+                logger.exception("Could not pre-render %s", target)
@@ -0,0 +1,131 @@
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class QueueFullError(Exception):
+    pass
+
+
+class JobQueue:
+    """Bounded in-process queue drained by a fixed number of asyncio workers.
+
+    Job state itself is persisted by the submitter; the queue only schedules the
+    work, caps concurrency and lets same-process listeners wait for updates.
+    Jobs still queued at stop() are handed to on_abandoned so the submitter can
+    record them as failed; running jobs see a CancelledError.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        concurrency: int,
+        max_size: int,
+        on_abandoned: Optional[Callable[[List[int]], Awaitable[None]]] = None,
+    ):
+        self.name = name
+        self.concurrency = concurrency
+        self.max_size = max_size
+        self.on_abandoned = on_abandoned
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: list = []
+        self._changed: Dict[int, asyncio.Event] = {}
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.running = 0
+        self.wait_time_total = 0.0
+        self.run_time_total = 0.0
+
+    async def start(self) -> None:
+        self._queue = asyncio.Queue(maxsize=self.max_size)
+        self._workers = [
+            asyncio.create_task(self._worker(), name=f"{self.name}-worker-{i}")
+            for i in range(self.concurrency)
+        ]
+
+    async def stop(self) -> None:
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+        abandoned = []
+        while self._queue is not None and not self._queue.empty():
+            job_id, _, _ = self._queue.get_nowait()
+            abandoned.append(job_id)
+        self._queue = None
+        if abandoned:
+            logger.warning("%s queue stopped with %d job(s) still queued", self.name, len(abandoned))
+            if self.on_abandoned is not None:
+                await self.on_abandoned(abandoned)
+            for job_id in abandoned:
+                self.notify(job_id)
+
+    def submit(self, job_id: int, run: Callable[[], Awaitable[None]]) -> None:
+        if self._queue is None:
+            raise RuntimeError(f"{self.name} queue is not running")
+        try:
+            self._queue.put_nowait((job_id, run, time.perf_counter()))
+        except asyncio.QueueFull:
+            self.rejected += 1
+            raise QueueFullError(f"{self.name} queue is full")
+        self.submitted += 1
+
+    def notify(self, job_id: int) -> None:
+        event = self._changed.pop(job_id, None)
+        if event is not None:
+            event.set()
+
+    async def wait_for_update(self, job_id: int, timeout: float) -> None:
+        """Return when notify(job_id) is called here, or after timeout (the job may run elsewhere)."""
+        event = self._changed.setdefault(job_id, asyncio.Event())
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+        except asyncio.TimeoutError:
+            # Don't keep events around for jobs that finish on another worker.
+            if self._changed.get(job_id) is event:
+                del self._changed[job_id]
+
+    def depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def _worker(self) -> None:
+        while True:
+            job_id, run, enqueued_at = await self._queue.get()
+            started_at = time.perf_counter()
+            self.wait_time_total += started_at - enqueued_at
+            self.running += 1
+            try:
+                await run()
+                self.completed += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self.failed += 1
+                logger.exception("%s job %s failed", self.name, job_id)
+            finally:
+                self.running -= 1
+                self.run_time_total += time.perf_counter() - started_at
+                self._queue.task_done()
+                self.notify(job_id)
+
+    def stats(self) -> dict:
+        finished = self.completed + self.failed
+        return {
+            "name": self.name,
+            "concurrency": self.concurrency,
+            "max_size": self.max_size,
+            "depth": self.depth(),
+            "running": self.running,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "wait_time_avg": self.wait_time_total / finished if finished else 0.0,
+            "run_time_avg": self.run_time_total / finished if finished else 0.0,
+        }
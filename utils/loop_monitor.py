@@ -0,0 +1,112 @@
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from typing import Optional
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class EventLoopMonitor:
+    """Measures how late the event loop wakes a sleeping task.
+
+    A task sleeps `interval` seconds and records how much later than that it
+    resumed; anything over `threshold` means some callback held the loop. A block
+    that ends before the next wake-up is due goes unseen, so stalls are only
+    guaranteed to be caught above threshold + interval. A watchdog thread notices
+    the missed wake-up while the loop is still stuck and captures the loop
+    thread's stack, so the warning names the blocking call.
+    """
+
+    def __init__(self, interval: float = 0.05, threshold: float = 0.1):
+        self.interval = interval
+        self.threshold = threshold
+        self.samples = 0
+        self.lag_total = 0.0
+        self.lag_max = 0.0
+        self.stalls = 0
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._stopped = threading.Event()
+        self._loop_thread_id = None
+        self._beat = 0.0
+        self._blocked_stack: Optional[str] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.threshold > 0
+
+    async def start(self) -> None:
+        if not self.enabled or self._task is not None:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._beat = time.monotonic()
+        # A fresh event per start, so a watchdog left from a previous run cannot revive.
+        self._stopped = threading.Event()
+        self._task = asyncio.create_task(self._run())
+        threading.Thread(
+            target=self._watch, args=(self._stopped,), name="event-loop-watchdog", daemon=True
+        ).start()
+
+    async def stop(self) -> None:
+        self._stopped.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            lag = max(0.0, now - self._beat - self.interval)
+            self._beat = now
+            with self._lock:
+                self.samples += 1
+                self.lag_total += lag
+                self.lag_max = max(self.lag_max, lag)
+                stack, self._blocked_stack = self._blocked_stack, None
+                if lag > self.threshold:
+                    self.stalls += 1
+            if lag > self.threshold:
+                logger.warning(
+                    "Event loop blocked for %.0f ms%s",
+                    lag * 1000,
+                    f"; stack while blocked:\n{stack}" if stack else "",
+                )
+
+    def _watch(self, stopped: threading.Event) -> None:
+        reported_beat = None
+        while not stopped.wait(self.threshold / 2):
+            beat = self._beat
+            if beat == reported_beat or time.monotonic() - beat - self.interval <= self.threshold:
+                continue
+            reported_beat = beat
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is not None:
+                with self._lock:
+                    self._blocked_stack = "".join(traceback.format_stack(frame))
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "interval": self.interval,
+                "threshold": self.threshold,
+                "samples": self.samples,
+                "lag_avg": self.lag_total / self.samples if self.samples else 0.0,
+                "lag_max": self.lag_max,
+                "stalls": self.stalls,
+            }
+
+
+loop_monitor = EventLoopMonitor(
+    interval=settings.EVENT_LOOP_MONITOR_INTERVAL,
+    threshold=settings.EVENT_LOOP_LAG_THRESHOLD,
+)
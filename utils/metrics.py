@@ -0,0 +1,184 @@
+import bisect
+import threading
+import time
+from typing import Dict, Tuple
+from starlette.datastructures import MutableHeaders
+from starlette.routing import Match
+from config import settings
+from database import count_queries, current_route
+
+# Upper bounds in seconds, as in the Prometheus client defaults.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+UNMATCHED_ROUTE = "unmatched"
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class _Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels) -> str:
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+class RequestMetrics:
+    """Per-route request counters for this worker process, rendered in Prometheus text format.
+
+    Routes are labelled by their template ("/api/products/{product_id}"), so label
+    cardinality stays bounded however many ids are requested.
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._latency: Dict[Tuple[str, str], _Histogram] = {}
+        self._responses: Dict[Tuple[str, str, int], int] = {}
+        self._in_flight: Dict[Tuple[str, str], int] = {}
+        self._db_statements: Dict[Tuple[str, str], int] = {}
+        self._db_seconds: Dict[Tuple[str, str], float] = {}
+
+    def started(self, method: str, route: str) -> None:
+        with self._lock:
+            key = (method, route)
+            self._in_flight[key] = self._in_flight.get(key, 0) + 1
+
+    def finished(
+        self, method: str, route: str, status: int, seconds: float, statements: int, db_seconds: float
+    ) -> None:
+        key = (method, route)
+        with self._lock:
+            self._in_flight[key] -= 1
+            histogram = self._latency.get(key)
+            if histogram is None:
+                histogram = self._latency[key] = _Histogram(self.buckets)
+            histogram.observe(seconds)
+            self._responses[key + (status,)] = self._responses.get(key + (status,), 0) + 1
+            self._db_statements[key] = self._db_statements.get(key, 0) + statements
+            self._db_seconds[key] = self._db_seconds.get(key, 0.0) + db_seconds
+
+    def render(self) -> str:
+        lines = []
+        with self._lock:
+            lines.append("# HELP http_request_duration_seconds Request latency by route template.")
+            lines.append("# TYPE http_request_duration_seconds histogram")
+            for (method, route), histogram in sorted(self._latency.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float("inf"),), histogram.counts):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(
+                        f"http_request_duration_seconds_bucket{_labels(method=method, route=route, le=le)} {cumulative}"
+                    )
+                labels = _labels(method=method, route=route)
+                lines.append(f"http_request_duration_seconds_sum{labels} {histogram.sum}")
+                lines.append(f"http_request_duration_seconds_count{labels} {cumulative}")
+
+            lines.append("# HELP http_responses_total Responses by route template and status code.")
+            lines.append("# TYPE http_responses_total counter")
+            for (method, route, status), count in sorted(self._responses.items()):
+                lines.append(f"http_responses_total{_labels(method=method, route=route, status=status)} {count}")
+
+            lines.append("# HELP http_requests_in_flight Requests currently being served.")
+            lines.append("# TYPE http_requests_in_flight gauge")
+            for (method, route), count in sorted(self._in_flight.items()):
+                lines.append(f"http_requests_in_flight{_labels(method=method, route=route)} {count}")
+
+            lines.append("# HELP http_request_db_statements_total SQL statements issued while serving requests.")
+            lines.append("# TYPE http_request_db_statements_total counter")
+            for (method, route), count in sorted(self._db_statements.items()):
+                lines.append(f"http_request_db_statements_total{_labels(method=method, route=route)} {count}")
+
+            lines.append("# HELP http_request_db_seconds_total Time spent executing SQL while serving requests.")
+            lines.append("# TYPE http_request_db_seconds_total counter")
+            for (method, route), seconds in sorted(self._db_seconds.items()):
+                lines.append(f"http_request_db_seconds_total{_labels(method=method, route=route)} {seconds}")
+        return "\n".join(lines) + "\n"
+
+
+request_metrics = RequestMetrics()
+
+
+def route_template(app, scope) -> str:
+    """The path template of the route that will serve this request, as the router would pick it."""
+    partial = None
+    for route in app.router.routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route.path
+        if match == Match.PARTIAL and partial is None:
+            partial = route.path
+    return partial or UNMATCHED_ROUTE
+
+
+def _server_timing(app_seconds: float, statements: int, db_seconds: float) -> str:
+    return (
+        f"app;dur={app_seconds * 1000:.1f}, "
+        f'db;desc="{statements} queries";dur={db_seconds * 1000:.1f}'
+    )
+
+
+class MetricsMiddleware:
+    """Records latency, status, in-flight requests and SQL work per route template.
+
+    With SERVER_TIMING_HEADER, responses carry a Server-Timing header (time to
+    first byte and database time) that browser dev tools show per request; the
+    QUERY_COUNT_HEADER count comes from the same counter.
+    """
+
+    def __init__(self, app, metrics: RequestMetrics = request_metrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        route = route_template(scope["app"], scope)
+        status_code = 500
+        started = time.perf_counter()
+        self.metrics.started(method, route)
+        route_token = current_route.set(f"{method} {route}")
+
+        with count_queries() as queries:
+            async def send_wrapper(message):
+                nonlocal status_code
+                if message["type"] == "http.response.start":
+                    status_code = message["status"]
+                    if settings.SERVER_TIMING_HEADER or settings.QUERY_COUNT_HEADER:
+                        headers = MutableHeaders(scope=message)
+                        if settings.SERVER_TIMING_HEADER:
+                            headers.append(
+                                "Server-Timing",
+                                _server_timing(time.perf_counter() - started, queries.count, queries.duration),
+                            )
+                            # Without it browsers hide the timings of cross-origin API calls.
+                            headers["Timing-Allow-Origin"] = "*"
+                        if settings.QUERY_COUNT_HEADER:
+                            headers["X-Query-Count"] = str(queries.count)
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                self.metrics.finished(
+                    method,
+                    route,
+                    status_code,
+                    time.perf_counter() - started,
+                    queries.count,
+                    queries.duration,
+                )
+                current_route.reset(route_token)
@@ -0,0 +1,60 @@
+import base64
+import json
+import math
+from typing import Any, Optional, Tuple
+from fastapi import HTTPException, status
+
+
+def encode_cursor(sort: str, value: Any, row_id: int) -> str:
+    raw = json.dumps([sort, value, row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("utf-8").rstrip("=")
+
+
+def _is_integer(value: Any) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _valid_sort_value(sort: str, value: Any) -> bool:
+    # Every sort key is a numeric column; on id sorts the value repeats the id.
+    if sort.lstrip("-") == "id":
+        return value is None or _is_integer(value)
+    return (_is_integer(value) or isinstance(value, float)) and math.isfinite(value)
+
+
+def decode_cursor(cursor: str, sort: str) -> Tuple[Any, int]:
+    """Return the (sort value, id) a page ends at; a cursor that was not issued for this sort is a 400."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_sort, value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode("utf-8")))
+        if cursor_sort != sort or not _is_integer(row_id):
+            raise ValueError("cursor does not match sort order")
+        if not _valid_sort_value(sort, value):
+            raise ValueError("cursor value does not fit the sort column")
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor",
+        )
+    return value, row_id
+
+
+def keyset_filter(sort_column, id_column, value: Any, row_id: int, descending: bool = False):
+    """Build the "rows after (value, id)" predicate for keyset pagination.
+
+    Expanded into OR/AND form rather than a row-value comparison so MySQL can
+    range-scan a (sort_column, id) index.
+    """
+    if sort_column is id_column:
+        return id_column < row_id if descending else id_column > row_id
+    if descending:
+        return (sort_column < value) | ((sort_column == value) & (id_column < row_id))
+    return (sort_column > value) | ((sort_column == value) & (id_column > row_id))
+
+
+def split_page(rows: list, limit: int, sort: str, sort_attr: str) -> Tuple[list, Optional[str]]:
+    """Trim a ``limit + 1`` fetch to one page and derive the cursor for the next."""
+    if len(rows) <= limit:
+        return rows, None
+    page = rows[:limit]
+    last = page[-1]
+    return page, encode_cursor(sort, getattr(last, sort_attr), last.id)
@@ -0,0 +1,257 @@
+import csv
+import io
+import json
+import time
+from typing import Dict, Iterator, List, Tuple
+from pydantic import ValidationError
+from sqlalchemy import delete, insert, select, tuple_, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from config import settings
+from models.category import Category
+from models.jeweler import Jeweler
+from models.product import Product, product_categories
+from schemas.product import ProductImportRow
+from utils.cache import catalog_cache
+
+IMPORT_KEY = ("jeweler_id", "sku")
+REQUIRED_CSV_COLUMNS = {"jeweler_id", "sku"}
+REQUIRED_FOR_NEW = ("name", "price")
+# A CSV cell lists several category ids separated by this character.
+CATEGORY_SEPARATOR = "|"
+
+products = Product.__table__
+
+
+class ImportFileError(ValueError):
+    """The upload as a whole is unreadable, as opposed to a bad row."""
+
+
+def iter_csv_records(stream) -> Iterator[Tuple[int, object]]:
+    reader = csv.DictReader(io.TextIOWrapper(stream, encoding="utf-8-sig", newline=""))
+    missing = REQUIRED_CSV_COLUMNS - set(reader.fieldnames or ())
+    if missing:
+        raise ImportFileError(f"CSV header is missing columns: {', '.join(sorted(missing))}")
+    for number, row in enumerate(reader, start=1):
+        # Empty cells leave the column untouched; surplus cells land under the None key.
+        record = {key: value for key, value in row.items() if key is not None and value not in ("", None)}
+        if "category_ids" in record:
+            record["category_ids"] = [
+                part.strip() for part in record["category_ids"].split(CATEGORY_SEPARATOR) if part.strip()
+            ]
+        yield number, record
+
+
+def iter_ndjson_records(stream) -> Iterator[Tuple[int, object]]:
+    for number, line in enumerate(io.TextIOWrapper(stream, encoding="utf-8"), start=1):
+        if not line.strip():
+            continue
+        try:
+            yield number, json.loads(line)
+        except ValueError as exc:
+            yield number, exc
+
+
+class ImportReport:
+    def __init__(self):
+        self.rows = 0
+        self.created = 0
+        self.updated = 0
+        self.merged = 0
+        self.failed = 0
+        self.errors = []
+        self.started = time.perf_counter()
+
+    def fail(self, number: int, sku, messages: List[str]) -> None:
+        self.failed += 1
+        if len(self.errors) < settings.PRODUCT_IMPORT_MAX_ERRORS:
+            self.errors.append({"row": number, "sku": sku, "errors": messages})
+
+    def as_dict(self) -> dict:
+        return {
+            "rows": self.rows,
+            "created": self.created,
+            "updated": self.updated,
+            "merged": self.merged,
+            "failed": self.failed,
+            "errors": self.errors,
+            "errors_truncated": self.failed > len(self.errors),
+            "seconds": round(time.perf_counter() - self.started, 3),
+        }
+
+
+def _validate(record) -> Tuple[ProductImportRow, List[str]]:
+    if isinstance(record, Exception):
+        return None, [f"invalid JSON: {record}"]
+    if not isinstance(record, dict):
+        return None, ["row must be a JSON object"]
+    try:
+        return ProductImportRow.model_validate(record), []
+    except ValidationError as exc:
+        return None, [
+            f"{'.'.join(str(part) for part in error['loc']) or 'row'}: {error['msg']}"
+            for error in exc.errors()
+        ]
+
+
+def _merge(earlier: ProductImportRow, later: ProductImportRow) -> ProductImportRow:
+    """One row with the effect of applying earlier and then later to the same product."""
+    return ProductImportRow.model_validate(
+        {**earlier.model_dump(exclude_unset=True), **later.model_dump(exclude_unset=True)}
+    )
+
+
+def _upsert_statement(db: Session, columns) -> object:
+    """INSERT that updates the given columns of a product whose key already exists.
+
+    Executed with a list of rows: the compiled statement is cached, and pymysql
+    sends the executemany as multi-row INSERTs. Other dialects get a plain INSERT;
+    the rows were just checked to be new, so only a concurrent import creating
+    the same SKU makes the batch fail, and it is then reported as rolled back.
+    """
+    update_columns = [column for column in columns if column not in IMPORT_KEY]
+    dialect = db.get_bind().dialect.name
+    if dialect == "mysql":
+        from sqlalchemy.dialects.mysql import insert as upsert
+
+        statement = upsert(products)
+        return statement.on_duplicate_key_update({column: statement.inserted[column] for column in update_columns})
+    if dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as upsert
+
+        statement = upsert(products)
+        return statement.on_conflict_do_update(
+            index_elements=list(IMPORT_KEY),
+            set_={column: statement.excluded[column] for column in update_columns},
+        )
+    return insert(products)
+
+
+def _product_ids(db: Session, keys) -> Dict[tuple, int]:
+    rows = db.execute(
+        select(Product.jeweler_id, Product.sku, Product.id).where(
+            tuple_(Product.jeweler_id, Product.sku).in_(list(keys))
+        )
+    )
+    return {(jeweler_id, sku): product_id for jeweler_id, sku, product_id in rows}
+
+
+def _check_references(db: Session, rows: Dict[tuple, tuple], report: ImportReport) -> None:
+    """Drop rows naming a jeweler or category that does not exist; two queries per batch."""
+    jeweler_ids = {row.jeweler_id for _, row in rows.values()}
+    category_ids = {category_id for _, row in rows.values() for category_id in row.category_ids or ()}
+    known_jewelers = set(db.scalars(select(Jeweler.id).where(Jeweler.id.in_(jeweler_ids))))
+    known_categories = set(
+        db.scalars(select(Category.id).where(Category.id.in_(category_ids))) if category_ids else ()
+    )
+    for key, (number, row) in list(rows.items()):
+        errors = []
+        if row.jeweler_id not in known_jewelers:
+            errors.append(f"jeweler_id: jeweler {row.jeweler_id} not found")
+        missing = sorted(set(row.category_ids or ()) - known_categories)
+        if missing:
+            errors.append(f"category_ids: categories not found: {missing}")
+        if errors:
+            report.fail(number, row.sku, errors)
+            del rows[key]
+
+
+def _write_batch(db: Session, rows: Dict[tuple, tuple], existing: Dict[tuple, int]) -> Dict[tuple, int]:
+    updates, inserts = [], {}
+    for key, (_, row) in rows.items():
+        values = row.model_dump(exclude_unset=True, exclude={"category_ids"})
+        if key in existing:
+            updates.append({**values, "id": existing[key]})
+        else:
+            # Rows from one file normally share their columns, so this is usually one statement.
+            inserts.setdefault(tuple(sorted(values)), []).append(values)
+    if updates:
+        # Existing products get a partial UPDATE by primary key: an upsert would trip
+        # over NOT NULL columns the row leaves out before reaching its update clause.
+        db.execute(update(Product), updates)
+    for columns, values in inserts.items():
+        # Still an upsert, in case a concurrent import created the product meanwhile.
+        db.execute(_upsert_statement(db, columns), values)
+
+    ids = _product_ids(db, rows)
+    relinked = [key for key, (_, row) in rows.items() if row.category_ids is not None]
+    if relinked:
+        db.execute(
+            delete(product_categories).where(
+                product_categories.c.product_id.in_([ids[key] for key in relinked])
+            )
+        )
+        links = [
+            {"product_id": ids[key], "category_id": category_id}
+            for key in relinked
+            for category_id in dict.fromkeys(rows[key][1].category_ids)
+        ]
+        if links:
+            db.execute(insert(product_categories), links)
+    return ids
+
+
+def import_batch(db: Session, batch: List[tuple], report: ImportReport) -> None:
+    """Validate and upsert one batch of (row number, record) pairs in a single transaction."""
+    report.rows += len(batch)
+    rows = {}
+    for number, record in batch:
+        row, errors = _validate(record)
+        if errors:
+            report.fail(number, record.get("sku") if isinstance(record, dict) else None, errors)
+            continue
+        key = (row.jeweler_id, row.sku)
+        if key in rows:
+            # A batch writes each product once, so repeats are folded in file order.
+            row = _merge(rows[key][1], row)
+            report.merged += 1
+        rows[key] = (number, row)
+    if not rows:
+        return
+
+    _check_references(db, rows, report)
+    if not rows:
+        return
+    existing = _product_ids(db, rows)
+    for key, (number, row) in list(rows.items()):
+        absent = [field for field in REQUIRED_FOR_NEW if getattr(row, field) is None]
+        if key not in existing and absent:
+            report.fail(number, row.sku, [f"{field}: required for new products" for field in absent])
+            del rows[key]
+    if not rows:
+        return
+
+    try:
+        ids = _write_batch(db, rows, existing)
+        db.commit()
+    except SQLAlchemyError as exc:
+        db.rollback()
+        for number, row in rows.values():
+            report.fail(number, row.sku, [f"batch rolled back: {exc.__class__.__name__}"])
+        return
+
+    report.created += len(rows) - len(existing)
+    report.updated += len(existing)
+    catalog_cache.invalidate_products(ids.values())
+
+
+def import_products(db: Session, stream, import_format: str) -> dict:
+    """Upsert products from a binary CSV or NDJSON stream, committing every
+    PRODUCT_IMPORT_BATCH_SIZE rows, and return the import report.
+
+    Batches committed before an ImportFileError stay committed.
+    """
+    records = iter_csv_records(stream) if import_format == "csv" else iter_ndjson_records(stream)
+    report = ImportReport()
+    batch = []
+    try:
+        for number, record in records:
+            batch.append((number, record))
+            if len(batch) >= settings.PRODUCT_IMPORT_BATCH_SIZE:
+                import_batch(db, batch, report)
+                batch = []
+    except UnicodeDecodeError:
+        raise ImportFileError(f"File is not valid UTF-8 after row {report.rows + len(batch)}")
+    if batch:
+        import_batch(db, batch, report)
+    return report.as_dict()
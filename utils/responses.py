@@ -0,0 +1,36 @@
+import json
+from functools import lru_cache
+from typing import Any, Iterable, List
+from pydantic import TypeAdapter
+from starlette.responses import Response
+
+try:
+    import orjson
+except ImportError:  # optional: FastJSONResponse falls back to the stdlib encoder
+    orjson = None
+
+
+class FastJSONResponse(Response):
+    """JSON response for content that is already JSON-ready (dicts from model_dump
+    or bytes from serialize_list), skipping FastAPI's response_model re-validation
+    and jsonable_encoder pass."""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        if orjson is not None:
+            return orjson.dumps(content)
+        return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+@lru_cache(maxsize=None)
+def _list_adapter(model) -> TypeAdapter:
+    return TypeAdapter(List[model])
+
+
+def serialize_list(model, items: Iterable) -> bytes:
+    """ORM rows to JSON bytes through the response schema, in one pydantic-core pass."""
+    adapter = _list_adapter(model)
+    return adapter.dump_json(adapter.validate_python(list(items), from_attributes=True))
@@ -0,0 +1,49 @@
+import re
+from sqlalchemy import case, literal
+from sqlalchemy.dialects.mysql import match
+from models.product import Product
+
+# Matches InnoDB's default innodb_ft_min_token_size; shorter words are not indexed.
+MIN_TERM_LENGTH = 3
+MAX_TERMS = 8
+
+FULLTEXT_INDEX_NAME = "ft_products_name_description"
+
+
+def tokenize(query: str) -> list:
+    """Split free text into lowercase search terms, dropping boolean-mode operators."""
+    terms = []
+    for term in re.findall(r"\w+", query.lower()):
+        if term not in terms:
+            terms.append(term)
+    return terms[:MAX_TERMS]
+
+
+def _name_prefix(term: str):
+    # \w terms hold no "%" or "/", but "_" is a LIKE wildcard.
+    return Product.name.like(term.replace("_", "/_") + "%", escape="/")
+
+
+def search_clauses(dialect_name: str, terms: list):
+    """Return (where clause, relevance expression) for matching products against terms.
+
+    On MySQL this uses the FULLTEXT index in boolean mode with a prefix wildcard
+    per term, ranked by MATCH() relevance. Words shorter than MIN_TERM_LENGTH are
+    not in that index: they are left out of a query that has longer words, and a
+    query of only short words matches name prefixes instead, which
+    ix_products_name serves as a range scan. Other dialects (SQLite in
+    development) always use the name prefix match, ranked by terms matched.
+    """
+    indexed = [term for term in terms if len(term) >= MIN_TERM_LENGTH]
+    if dialect_name == "mysql" and indexed:
+        against = " ".join(f"{term}*" for term in indexed)
+        relevance = match(Product.name, Product.description, against=against).in_boolean_mode()
+        return relevance, relevance
+
+    relevance = literal(0)
+    matched = None
+    for term in terms:
+        clause = _name_prefix(term)
+        relevance = relevance + case((clause, 1), else_=0)
+        matched = clause if matched is None else matched | clause
+    return matched, relevance
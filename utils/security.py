@@ -1,21 +1,124 @@
+import asyncio
 import hashlib
 import secrets
 import base64
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from fastapi import HTTPException, status
+from config import settings
+
+# Hashes written before iterations became configurable have no iteration field.
+LEGACY_ITERATIONS = 100000
+
+# PBKDF2 releases the GIL inside OpenSSL, so a dedicated pool scales with cores
+# without occupying the threadpool that serves ordinary sync endpoints.
+_hash_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    thread_name_prefix="password-hash",
+)
+_stats_lock = threading.Lock()
+_stats = {
+    "submitted": 0,
+    "completed": 0,
+    "rejected": 0,
+    "pending": 0,
+    "queue_time_total": 0.0,
+    "queue_time_max": 0.0,
+    "hash_time_total": 0.0,
+}
+
+
+def _pbkdf2(password: str, salt: str, iterations: int) -> bytes:
+    return hashlib.pbkdf2_hmac('sha256', password.encode('utf-8'), salt.encode('utf-8'), iterations)
+
+
+def _parse_hash(hashed_password: str):
+    parts = hashed_password.split('$')
+    if len(parts) == 3:
+        algorithm, salt, hash_b64 = parts
+        iterations = LEGACY_ITERATIONS
+    else:
+        algorithm, iterations, salt, hash_b64 = parts
+        iterations = int(iterations)
+    if algorithm != 'pbkdf2_sha256':
+        raise ValueError("unsupported hash algorithm")
+    return iterations, salt, base64.b64decode(hash_b64)
 
 
 def get_password_hash(password: str) -> str:
+    iterations = settings.PASSWORD_HASH_ITERATIONS
     salt = secrets.token_hex(16)
-    hashed = hashlib.pbkdf2_hmac('sha256', password.encode('utf-8'), salt.encode('utf-8'), 100000)
-    return f"pbkdf2_sha256${salt}${base64.b64encode(hashed).decode('utf-8')}"
+    hashed = _pbkdf2(password, salt, iterations)
+    return f"pbkdf2_sha256${iterations}${salt}${base64.b64encode(hashed).decode('utf-8')}"
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     try:
-        algorithm, salt, hash_b64 = hashed_password.split('$')
-        if algorithm != 'pbkdf2_sha256':
-            return False
-        stored_hash = base64.b64decode(hash_b64)
-        computed_hash = hashlib.pbkdf2_hmac('sha256', plain_password.encode('utf-8'), salt.encode('utf-8'), 100000)
+        iterations, salt, stored_hash = _parse_hash(hashed_password)
+        computed_hash = _pbkdf2(plain_password, salt, iterations)
         return secrets.compare_digest(stored_hash, computed_hash)
     except Exception:
         return False
+
+
+def needs_rehash(hashed_password: str) -> bool:
+    try:
+        iterations, _, _ = _parse_hash(hashed_password)
+    except Exception:
+        return False
+    return iterations != settings.PASSWORD_HASH_ITERATIONS
+
+
+async def _run_in_hash_executor(func, *args):
+    with _stats_lock:
+        if _stats["pending"] >= settings.PASSWORD_HASH_MAX_PENDING:
+            _stats["rejected"] += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many concurrent authentication requests, please retry",
+                headers={"Retry-After": "1"},
+            )
+        _stats["submitted"] += 1
+        _stats["pending"] += 1
+
+    submitted_at = time.perf_counter()
+
+    def timed():
+        started_at = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            finished_at = time.perf_counter()
+            queue_time = started_at - submitted_at
+            with _stats_lock:
+                _stats["completed"] += 1
+                _stats["queue_time_total"] += queue_time
+                _stats["queue_time_max"] = max(_stats["queue_time_max"], queue_time)
+                _stats["hash_time_total"] += finished_at - started_at
+
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(_hash_executor, timed)
+    finally:
+        with _stats_lock:
+            _stats["pending"] -= 1
+
+
+async def get_password_hash_async(password: str) -> str:
+    return await _run_in_hash_executor(get_password_hash, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await _run_in_hash_executor(verify_password, plain_password, hashed_password)
+
+
+def hashing_stats() -> dict:
+    with _stats_lock:
+        stats = dict(_stats)
+    completed = stats["completed"]
+    stats["workers"] = settings.PASSWORD_HASH_WORKERS
+    stats["iterations"] = settings.PASSWORD_HASH_ITERATIONS
+    stats["queue_time_avg"] = stats["queue_time_total"] / completed if completed else 0.0
+    stats["hash_time_avg"] = stats["hash_time_total"] / completed if completed else 0.0
+    return stats
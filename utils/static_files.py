@@ -0,0 +1,178 @@
+import os
+import re
+import stat
+from email.utils import formatdate
+from mimetypes import guess_type
+from typing import Optional
+import aiofiles
+from fastapi import HTTPException
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response, StreamingResponse
+from starlette.staticfiles import StaticFiles
+from config import settings
+
+# Files named "<stem>.<16 hex chars>.<ext>" (or variants of them) embed a hash of
+# their content, so a URL can never change meaning and may be cached forever.
+HASHED_NAME = re.compile(r"\.([0-9a-f]{16})\.")
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# Precompressed siblings ("logo.svg.br", "logo.svg.gz") preferred in this order.
+PRECOMPRESSED = (("br", ".br"), ("gzip", ".gz"))
+RANGE_CHUNK_SIZE = 64 * 1024
+
+
+def content_hash_of(path: str) -> Optional[str]:
+    match = HASHED_NAME.search(os.path.basename(path))
+    return match.group(1) if match else None
+
+
+def _etag_candidates(header: str) -> list:
+    return [tag.strip() for tag in header.split(",")]
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    # Weak comparison, as RFC 9110 requires for If-None-Match.
+    candidates = _etag_candidates(if_none_match)
+    return "*" in candidates or etag in [tag.removeprefix("W/") for tag in candidates]
+
+
+def _cache_control(path: str) -> str:
+    if content_hash_of(path):
+        return IMMUTABLE_CACHE_CONTROL
+    return f"public, max-age={settings.STATIC_CACHE_MAX_AGE}, must-revalidate"
+
+
+def _not_modified(etag: str, cache_control: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
+
+
+def immutable_not_modified(path: str, request_headers: Headers) -> Optional[Response]:
+    """304 for a revalidation of a content-hashed URL, decided without any filesystem access."""
+    digest = content_hash_of(path)
+    if_none_match = request_headers.get("if-none-match")
+    if not digest or not if_none_match:
+        return None
+    for tag in _etag_candidates(if_none_match):
+        tag = tag.removeprefix("W/")
+        if tag.startswith(f'"{digest}'):
+            return _not_modified(tag, IMMUTABLE_CACHE_CONTROL)
+    return None
+
+
+def _parse_range(header: str, size: int):
+    """(start, end) inclusive for a single byte range, None to ignore it, or "invalid"."""
+    units, _, spec = header.partition("=")
+    if units.strip() != "bytes" or "," in spec:
+        return None
+    start, _, end = spec.strip().partition("-")
+    try:
+        if start:
+            first, last = int(start), int(end) if end else size - 1
+        else:
+            first, last = size - int(end), size - 1
+    except ValueError:
+        return None
+    first = max(first, 0)
+    last = min(last, size - 1)
+    if first > last:
+        return "invalid"
+    return first, last
+
+
+async def _iter_file_range(path: str, start: int, end: int):
+    async with aiofiles.open(path, "rb") as f:
+        await f.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = await f.read(min(RANGE_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def cached_file_response(
+    full_path: str, stat_result: os.stat_result, request_headers: Headers, status_code: int = 200
+) -> Response:
+    """FileResponse with a strong ETag, cache headers, precompressed siblings and byte ranges."""
+    media_type = guess_type(full_path)[0] or "text/plain"
+    headers = {"Cache-Control": _cache_control(full_path)}
+    digest = content_hash_of(full_path)
+
+    served_path, served_stat, encoding = full_path, stat_result, None
+    accept_encoding = request_headers.get("accept-encoding", "")
+    for candidate_encoding, suffix in PRECOMPRESSED:
+        if candidate_encoding not in accept_encoding:
+            continue
+        try:
+            candidate_stat = os.stat(full_path + suffix)
+        except OSError:
+            continue
+        if stat.S_ISREG(candidate_stat.st_mode):
+            served_path, served_stat, encoding = full_path + suffix, candidate_stat, candidate_encoding
+            headers["Content-Encoding"] = encoding
+            headers["Vary"] = "Accept-Encoding"
+            break
+
+    # Strong validators: the content hash when the name carries one, otherwise
+    # mtime and size, which change whenever a file is replaced.
+    if digest:
+        etag = f'"{digest}-{encoding}"' if encoding else f'"{digest}"'
+    else:
+        etag = f'"{served_stat.st_mtime_ns:x}-{served_stat.st_size:x}"'
+    headers["ETag"] = etag
+    headers["Last-Modified"] = formatdate(served_stat.st_mtime, usegmt=True)
+    headers["Accept-Ranges"] = "bytes"
+
+    if_none_match = request_headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, etag):
+        return _not_modified(etag, headers["Cache-Control"])
+
+    range_header = request_headers.get("range")
+    if_range = request_headers.get("if-range")
+    if range_header and status_code == 200 and (not if_range or if_range == etag):
+        size = served_stat.st_size
+        byte_range = _parse_range(range_header, size)
+        if byte_range == "invalid":
+            return Response(status_code=416, headers={"Content-Range": f"bytes */{size}"})
+        if byte_range is not None:
+            start, end = byte_range
+            headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+            headers["Content-Length"] = str(end - start + 1)
+            return StreamingResponse(
+                _iter_file_range(served_path, start, end),
+                status_code=206,
+                media_type=media_type,
+                headers=headers,
+            )
+
+    return FileResponse(
+        served_path,
+        status_code=status_code,
+        media_type=media_type,
+        headers=headers,
+        stat_result=served_stat,
+    )
+
+
+class CachedStaticFiles(StaticFiles):
+    """StaticFiles with long-lived caching for content-hashed names, strong ETags,
+    precompressed siblings and single byte ranges."""
+
+    async def get_response(self, path: str, scope) -> Response:
+        if scope["method"] in ("GET", "HEAD"):
+            not_modified = immutable_not_modified(path, Headers(scope=scope))
+            if not_modified is not None:
+                return not_modified
+        return await super().get_response(path, scope)
+
+    def file_response(self, full_path, stat_result, scope, status_code: int = 200) -> Response:
+        return cached_file_response(str(full_path), stat_result, Headers(scope=scope), status_code)
+
+
+def serve_file(full_path: str, request_headers: Headers) -> Response:
+    try:
+        stat_result = os.stat(full_path)
+    except OSError:
+        raise HTTPException(status_code=404, detail="Not Found")
+    return cached_file_response(full_path, stat_result, request_headers)
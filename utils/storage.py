@@ -0,0 +1,99 @@
+import asyncio
+import hashlib
+import os
+import secrets
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import aiofiles
+import aiofiles.os
+from config import settings
+
+# File writes go through their own small pool so a burst of large images can't
+# starve the default executor that also runs sync endpoints and DB calls.
+_io_executor = ThreadPoolExecutor(
+    max_workers=settings.IMAGE_IO_WORKERS,
+    thread_name_prefix="image-io",
+)
+_stats_lock = threading.Lock()
+_stats = {
+    "writes": 0,
+    "failures": 0,
+    "in_flight": 0,
+    "bytes_written": 0,
+    "write_time_total": 0.0,
+    "write_time_max": 0.0,
+}
+
+
+async def write_file_atomic(path: str, data: bytes) -> None:
+    """Write data to path so readers only ever see the old file or the complete new one."""
+    directory, filename = os.path.split(path)
+    # Same directory as the target so the final rename never crosses filesystems.
+    temp_path = os.path.join(directory, f".{filename}.{secrets.token_hex(4)}.tmp")
+
+    with _stats_lock:
+        _stats["in_flight"] += 1
+    started_at = time.perf_counter()
+    try:
+        async with aiofiles.open(temp_path, "wb", executor=_io_executor) as f:
+            await f.write(data)
+            await f.flush()
+        await aiofiles.os.replace(temp_path, path, executor=_io_executor)
+    except Exception:
+        with _stats_lock:
+            _stats["failures"] += 1
+        try:
+            await aiofiles.os.remove(temp_path, executor=_io_executor)
+        except OSError:
+            pass
+        raise
+    else:
+        elapsed = time.perf_counter() - started_at
+        with _stats_lock:
+            _stats["writes"] += 1
+            _stats["bytes_written"] += len(data)
+            _stats["write_time_total"] += elapsed
+            _stats["write_time_max"] = max(_stats["write_time_max"], elapsed)
+    finally:
+        with _stats_lock:
+            _stats["in_flight"] -= 1
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()[:16]
+
+
+async def write_content_addressed(directory: str, stem: str, extension: str, data: bytes) -> str:
+    """Write data as "<stem>.<content hash><extension>" and return that file name.
+
+    The name changes whenever the bytes do, so the URL can be cached as immutable.
+    """
+    loop = asyncio.get_running_loop()
+    digest = await loop.run_in_executor(_io_executor, content_hash, data)
+    filename = f"{stem}.{digest}{extension}"
+    path = os.path.join(directory, filename)
+    if not await aiofiles.os.path.exists(path, executor=_io_executor):
+        await write_file_atomic(path, data)
+    return filename
+
+
+async def ensure_dir(path: str) -> None:
+    await aiofiles.os.makedirs(path, exist_ok=True, executor=_io_executor)
+
+
+async def check_writable(directory: str) -> None:
+    """Create and delete a tiny file in directory; raises OSError on a read-only or full disk."""
+    path = os.path.join(directory, f".probe.{secrets.token_hex(4)}")
+    async with aiofiles.open(path, "wb", executor=_io_executor) as f:
+        await f.write(b"ok")
+    await aiofiles.os.remove(path, executor=_io_executor)
+
+
+def storage_stats() -> dict:
+    with _stats_lock:
+        stats = dict(_stats)
+    writes = stats["writes"]
+    stats["workers"] = settings.IMAGE_IO_WORKERS
+    stats["write_time_avg"] = stats["write_time_total"] / writes if writes else 0.0
+    return stats